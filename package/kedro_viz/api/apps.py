@@ -29,36 +29,65 @@
 This data could either come from a real Kedro project or a file.
 """
 import json
+import mimetypes
+import os
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from jinja2 import Environment, FileSystemLoader
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
 
 from kedro_viz import __version__
+from kedro_viz.data_access import DataAccessManager
 from kedro_viz.integrations.kedro import telemetry as kedro_telemetry
+from kedro_viz.services import GraphUpdates, StartupProfiler, StartupStatus
 
+from .responses import accepts_gzip
 from .router import router
 
 _HTML_DIR = Path(__file__).parent.parent.absolute() / "html"
 
+# the bundled assets have content-hashed filenames, so they never change under a URL
+_STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-def _create_base_api_app() -> FastAPI:
-    return FastAPI(
-        title="Kedro-Viz API", description="REST API for Kedro Viz", version=__version__
-    )
 
+class _IndexPage:
+    """The index page of the app. It is rendered once and only rendered again when
+    the project's `.telemetry` file changes, since it decides whether the page
+    loads telemetry.
+    """
 
-def create_api_app_from_project(project_path: Path) -> FastAPI:
-    """Create an API from a real Kedro project by adding the router to the FastAPI app."""
-    app = _create_base_api_app()
-    app.include_router(router)
-    app.mount("/static", StaticFiles(directory=_HTML_DIR / "static"), name="static")
+    def __init__(self, project_path: Path):
+        self._project_path = project_path
+        self._telemetry_file_stat: Optional[Tuple[int, int]] = None
+        self._html_content: Optional[str] = None
 
-    @app.get("/")
-    async def index():
-        heap_app_id = kedro_telemetry.get_heap_app_id(project_path)
+    def _get_telemetry_file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat_result = (self._project_path / ".telemetry").stat()
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def render(self) -> str:
+        """Return the HTML of the index page, rendering it if it isn't up to date."""
+        telemetry_file_stat = self._get_telemetry_file_stat()
+        if (
+            self._html_content is None
+            or telemetry_file_stat != self._telemetry_file_stat
+        ):
+            self._html_content = self._render()
+            self._telemetry_file_stat = telemetry_file_stat
+        return self._html_content
+
+    def _render(self) -> str:
+        heap_app_id = kedro_telemetry.get_heap_app_id(self._project_path)
         heap_user_identity = kedro_telemetry.get_heap_identity()
         should_add_telemetry = bool(heap_app_id) and bool(heap_user_identity)
         html_content = (_HTML_DIR / "index.html").read_text(encoding="utf-8")
@@ -68,7 +97,98 @@ def create_api_app_from_project(project_path: Path) -> FastAPI:
                 heap_app_id=heap_app_id, heap_user_identity=heap_user_identity
             )
             html_content = html_content.replace("</head>", telemetry_content)
-        return HTMLResponse(html_content)
+        return html_content
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Static files served with long-lived caching, from their gzipped `.gz` sibling
+    created when the app is built, if any, to the clients that accept it.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Return the response serving the file at the given path,
+        or its gzipped sibling if the client accepts it.
+        """
+        request_headers = Headers(scope=scope)
+        gzip_path = f"{full_path}.gz"
+        has_gzip = os.path.isfile(gzip_path)
+        if not (has_gzip and accepts_gzip(request_headers)):
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers["Cache-Control"] = _STATIC_CACHE_CONTROL
+            if has_gzip:
+                response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        response = FileResponse(
+            gzip_path,
+            status_code=status_code,
+            headers={
+                "Cache-Control": _STATIC_CACHE_CONTROL,
+                "Content-Encoding": "gzip",
+                "Vary": "Accept-Encoding",
+            },
+            media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+            stat_result=os.stat(gzip_path),
+            method=scope["method"],
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _create_base_api_app() -> FastAPI:
+    return FastAPI(
+        title="Kedro-Viz API", description="REST API for Kedro Viz", version=__version__
+    )
+
+
+def create_api_app_from_project(
+    project_path: Path,
+    startup_status: Optional[StartupStatus] = None,
+    data_access_manager: Optional[DataAccessManager] = None,
+    env_data_access_managers: Optional[Dict[str, DataAccessManager]] = None,
+    graph_updates: Optional[GraphUpdates] = None,
+    startup_profiler: Optional[StartupProfiler] = None,
+) -> FastAPI:
+    """Create an API from a real Kedro project by adding the router to the FastAPI app.
+    If the project is being loaded in the background, its startup status should be given,
+    so that the graph is only served once the project has been loaded.
+    The project's data is read from the given DataAccessManager, or the global one.
+    If several Kedro environments are served, their DataAccessManagers can be given
+    by environment name, so that they can be selected with `?env=`.
+    If the project is watched, its graph updates are streamed on `/api/events`.
+    If its startup is profiled, the profiler's report is served on `/api/debug/startup`.
+    """
+    app = _create_base_api_app()
+    if startup_status is not None:
+        app.state.startup_status = startup_status
+    if data_access_manager is not None:
+        app.state.data_access_manager = data_access_manager
+    if env_data_access_managers is not None:
+        app.state.env_data_access_managers = env_data_access_managers
+    if graph_updates is not None:
+        app.state.graph_updates = graph_updates
+    if startup_profiler is not None:
+        app.state.startup_profiler = startup_profiler
+    app.include_router(router)
+    app.mount(
+        "/static",
+        PrecompressedStaticFiles(directory=_HTML_DIR / "static"),
+        name="static",
+    )
+
+    index_page = _IndexPage(project_path)
+    app.add_event_handler("startup", index_page.render)
+
+    @app.get("/")
+    async def index():
+        return HTMLResponse(index_page.render())
 
     return app
 
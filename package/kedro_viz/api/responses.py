@@ -28,11 +28,29 @@
 """`kedro_viz.api.responses` defines API response types"""
 # pylint: disable=missing-class-docstring,too-few-public-methods
 import abc
-from typing import Dict, List, Optional, Union
-
-from pydantic import BaseModel
-
-from kedro_viz.data_access import data_access_manager
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, cast
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel, validator
+from starlette.datastructures import Headers
+
+from kedro_viz.data_access import DataAccessManager, data_access_manager
+from kedro_viz.models.graph import (
+    DataNode,
+    DataNodeMetadata,
+    GraphNode,
+    ParametersNode,
+    ParametersNodeMetadata,
+    TaskNode,
+    TaskNodeMetadata,
+)
+
+from . import serializers
 
 
 class APIErrorMessage(BaseModel):
@@ -53,6 +71,13 @@ class BaseGraphNodeAPIResponse(BaseAPIResponse):
     modular_pipelines: List[str]
     type: str
 
+    @validator("tags", pre=True)
+    def sort_tags(cls, tags):  # pylint: disable=no-self-argument,no-self-use
+        """Sort the tags of a node, which are a set whose order varies between
+        processes, so that its response doesn't.
+        """
+        return sorted(tags)
+
 
 class TaskNodeAPIResponse(BaseGraphNodeAPIResponse):
     parameters: Dict
@@ -199,14 +224,599 @@ class GraphAPIResponse(BaseAPIResponse):
     selected_pipeline: str
 
 
-def get_default_response() -> GraphAPIResponse:
+class CompactNodesAPIResponse(BaseAPIResponse):
+    id: List[int]
+    name: List[int]
+    full_name: List[int]
+    tags: List[List[int]]
+    pipelines: List[List[int]]
+    modular_pipelines: List[List[int]]
+    type: List[int]
+    parameters: List[Optional[Dict]]
+    layer: List[Optional[int]]
+    dataset_type: List[Optional[int]]
+
+
+class CompactGraphAPIResponse(BaseAPIResponse):
+    """Model the compact graph format of `/api/v2/main`, in which strings are indices
+    in the `strings` table and edges refer to nodes by their index in `nodes`.
+    """
+
+    version: int
+    strings: List[str]
+    nodes: CompactNodesAPIResponse
+    edges: List[Tuple[int, int]]
+    layers: List[int]
+    tags: List[Tuple[int, int]]
+    pipelines: List[Tuple[int, int]]
+    modular_pipelines: List[Tuple[int, int]]
+    selected_pipeline: int
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "version": 2,
+                "strings": [
+                    "d7b83b05",
+                    "Master Table",
+                    "master_table",
+                    "__default__",
+                    "data",
+                    "primary",
+                    "kedro.extras.datasets.pandas.csv_dataset.CSVDataSet",
+                    "Default",
+                ],
+                "nodes": {
+                    "id": [0],
+                    "name": [1],
+                    "full_name": [2],
+                    "tags": [[]],
+                    "pipelines": [[3]],
+                    "modular_pipelines": [[]],
+                    "type": [4],
+                    "parameters": [None],
+                    "layer": [5],
+                    "dataset_type": [6],
+                },
+                "edges": [],
+                "layers": [5],
+                "tags": [],
+                "pipelines": [[3, 7]],
+                "modular_pipelines": [],
+                "selected_pipeline": 3,
+            }
+        }
+
+
+class StartupPhaseAPIResponse(BaseAPIResponse):
+    name: str
+    status: str
+    duration: Optional[float]
+
+
+class StartupStatusAPIResponse(BaseAPIResponse):
+    status: str
+    phases: List[StartupPhaseAPIResponse]
+    error: Optional[str]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "status": "loading",
+                "phases": [
+                    {"name": "load_project", "status": "done", "duration": 12.3},
+                    {"name": "add_catalog", "status": "done", "duration": 0.1},
+                    {"name": "add_pipelines", "status": "running", "duration": 1.2},
+                    {"name": "sort_layers", "status": "pending", "duration": None},
+                ],
+                "error": None,
+            }
+        }
+
+
+class NodesMetadataAPIRequest(BaseModel):
+    ids: List[str]
+
+
+class NodesMetadataAPIResponse(BaseAPIResponse):
+    # the metadata of each node, as returned by `/api/nodes/{node_id}`
+    nodes: Dict[str, Dict[str, Any]]
+    # the error message of each node whose metadata couldn't be computed
+    errors: Dict[str, str]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "nodes": {
+                    "d7b83b05": {
+                        "filepath": "/my-kedro-project/data/03_primary/master_table.csv",
+                        "type": "kedro.extras.datasets.pandas.csv_dataset.CSVDataSet",
+                        "run_command": 'kedro run --to-outputs="master_table"',
+                    },
+                },
+                "errors": {"a1b2c3d4": "Invalid node ID"},
+            }
+        }
+
+
+def _get_manager(manager: Optional[DataAccessManager]) -> DataAccessManager:
+    # respond for the given manager, e.g. of a project hosted by the daemon,
+    # or for the global one by default
+    return data_access_manager if manager is None else manager
+
+
+def _get_default_graph(manager: Optional[DataAccessManager] = None) -> Dict[str, Any]:
+    manager = _get_manager(manager)
+    # copied, as the graph may be serialised while the repositories change
+    return dict(
+        nodes=list(manager.nodes.as_list()),
+        edges=list(manager.edges.as_list()),
+        tags=manager.tags.as_list(),
+        layers=list(manager.layers.as_list()),
+        pipelines=manager.registered_pipelines.as_list(),
+        modular_pipelines=manager.modular_pipelines.as_list(),
+        selected_pipeline=manager.get_default_selected_pipeline().id,
+    )
+
+
+def _get_pipeline_graph(
+    pipeline_id: str, manager: Optional[DataAccessManager] = None
+) -> Dict[str, Any]:
+    manager = _get_manager(manager)
+    node_ids = manager.registered_pipelines.get_node_ids_by_pipeline_id(pipeline_id)
+    mask = manager.nodes.get_mask(pipeline_id=pipeline_id)
+    modular_pipelines = manager.modular_pipelines.from_ids(
+        manager.nodes.get_modular_pipelines_by_mask(mask)
+    )
+
+    return dict(
+        nodes=manager.nodes.get_nodes_by_mask(mask),
+        edges=manager.edges.get_edges_by_node_ids(node_ids),
+        tags=manager.tags.as_list(),
+        layers=list(manager.layers.as_list()),
+        pipelines=manager.registered_pipelines.as_list(),
+        selected_pipeline=pipeline_id,
+        modular_pipelines=modular_pipelines.as_list(),
+    )
+
+
+def _get_graph(
+    pipeline_id: Optional[str] = None, manager: Optional[DataAccessManager] = None
+) -> Dict[str, Any]:
+    if pipeline_id is None:
+        return _get_default_graph(manager)
+    return _get_pipeline_graph(pipeline_id, manager)
+
+
+def get_default_response(
+    manager: Optional[DataAccessManager] = None,
+) -> GraphAPIResponse:
     """Default response for `/api/main`."""
-    return GraphAPIResponse(
-        nodes=data_access_manager.nodes.as_list(),
-        edges=data_access_manager.edges.as_list(),
-        tags=data_access_manager.tags.as_list(),
-        layers=data_access_manager.layers.as_list(),
-        pipelines=data_access_manager.registered_pipelines.as_list(),
-        modular_pipelines=data_access_manager.modular_pipelines.as_list(),
-        selected_pipeline=data_access_manager.get_default_selected_pipeline().id,
+    with _get_manager(manager).lock:
+        return GraphAPIResponse(**_get_default_graph(manager))
+
+
+def get_pipeline_response(
+    pipeline_id: str, manager: Optional[DataAccessManager] = None
+) -> GraphAPIResponse:
+    """Response for `/api/pipelines/{pipeline_id}`."""
+    with _get_manager(manager).lock:
+        return GraphAPIResponse(**_get_pipeline_graph(pipeline_id, manager))
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """An API response serialised to JSON once and kept both raw and gzip-compressed,
+    so it can be sent as is for every subsequent request.
+    """
+
+    content: bytes
+    gzipped_content: bytes
+
+    # a hash of the content, used to build the response's ETag
+    digest: str
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "EncodedResponse":
+        """Compress and hash the given JSON content."""
+        return cls(
+            content=content,
+            gzipped_content=gzip.compress(content),
+            digest=hashlib.sha256(content).hexdigest()[:16],
+        )
+
+
+def accepts_gzip(request_headers: Headers) -> bool:
+    """Check whether a client accepts gzip-compressed content, unless with `q=0`."""
+    for coding in request_headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class ResponseCache:
+    """Cache encoded responses for each DataAccessManager. All entries of a manager
+    are dropped as soon as its repositories change, i.e. its revision is bumped.
+    """
+
+    def __init__(self):
+        # map each manager to its revision and its encoded responses at that revision
+        self._entries: WeakKeyDictionary = WeakKeyDictionary()
+
+    def get(
+        self,
+        manager: DataAccessManager,
+        key: str,
+        build: Callable[[Any], bytes],
+        collect: Callable[[], Any] = lambda: None,
+    ) -> EncodedResponse:
+        """Return the encoded response stored under `key` for the given manager,
+        building it if it isn't cached yet: `collect` gathers what the response is
+        made of, e.g. the nodes and edges of the graph, holding the manager's lock,
+        and `build` serialises that into JSON content once the lock is released.
+        """
+        empty_entries: Dict[str, EncodedResponse] = {}
+        # the pending pipelines may be populated in the meantime, bumping the revision
+        with manager.lock:
+            revision, entries = self._entries.get(manager, (None, empty_entries))
+            if revision != manager.revision:
+                revision, entries = manager.revision, empty_entries
+                self._entries[manager] = (revision, entries)
+            if key in entries:
+                return entries[key]
+            collected = collect()
+
+        # the nodes are replaced rather than changed in place, so they are serialised
+        # as collected, but only cached if the repositories didn't change meanwhile
+        encoded = EncodedResponse.from_content(build(collected))
+        with manager.lock:
+            if manager.revision == revision:
+                encoded = entries.setdefault(key, encoded)
+        return encoded
+
+
+response_cache = ResponseCache()
+
+
+def _make_cache_key(path: str, fields: serializers.Fields) -> str:
+    # each projection of a response is cached separately
+    return path if fields is None else f"{path}?fields={','.join(fields)}"
+
+
+def get_node_metadata(
+    node: GraphNode, manager: Optional[DataAccessManager] = None
+) -> Dict[str, Any]:
+    """Compute the metadata of a node as the same record as `/api/nodes/{node_id}`,
+    or an empty record if the node has no metadata. The metadata of nodes restored
+    from a snapshot is the one precomputed when the snapshot was created, if any,
+    or the one of their live counterparts otherwise.
+    """
+    manager = _get_manager(manager)
+    if node.id in manager.node_metadata:
+        return manager.node_metadata[node.id]
+
+    node = manager.get_live_node(node)
+    if not node.has_metadata():
+        return {}
+
+    metadata: BaseAPIResponse
+    if isinstance(node, TaskNode):
+        metadata = TaskNodeMetadataAPIResponse.from_orm(TaskNodeMetadata(node))
+    elif isinstance(node, DataNode):
+        metadata = DataNodeMetadataAPIResponse.from_orm(DataNodeMetadata(node))
+    else:
+        metadata = ParametersNodeMetadataAPIResponse.from_orm(
+            ParametersNodeMetadata(cast(ParametersNode, node))
+        )
+    return metadata.dict(exclude_none=True)
+
+
+def get_encoded_default_response(
+    fields: serializers.Fields = None, manager: Optional[DataAccessManager] = None
+) -> EncodedResponse:
+    """Cached, encoded version of the default response for `/api/main`.
+    The content is serialised with the fast path in `kedro_viz.api.serializers`,
+    which produces the same document as `get_default_response().json()`,
+    or a projection of it if fields are given.
+    """
+    manager = _get_manager(manager)
+    return response_cache.get(
+        manager,
+        _make_cache_key("main", fields),
+        lambda graph: serializers.serialize_graph(**graph, fields=fields),
+        lambda: _get_default_graph(manager),
+    )
+
+
+def add_graph_version(
+    manager: Optional[DataAccessManager] = None,
+) -> EncodedResponse:
+    """Retain the current version of the default response for `/api/main`,
+    so that clients holding it can later fetch only what changed since.
+    This is only done once a project is loaded or reloaded, and once its pending
+    pipelines are populated, rather than on every revision of the DataAccessManager,
+    so that the revisions in between don't evict the versions held by clients.
+    """
+    manager = _get_manager(manager)
+    encoded = get_encoded_default_response(manager=manager)
+    if not manager.graph_versions.has_version(encoded.digest):
+        manager.graph_versions.add_version(
+            encoded.digest, _summarise_graph(json.loads(encoded.content))
+        )
+    return encoded
+
+
+# the fields of `GraphAPIResponse` other than nodes and edges, which are small,
+# so they are sent whole in a patch if they changed at all
+_PATCHED_FIELDS = (
+    "layers",
+    "tags",
+    "pipelines",
+    "modular_pipelines",
+    "selected_pipeline",
+)
+
+
+def _hash_node(node: Dict[str, Any]) -> bytes:
+    return hashlib.blake2b(
+        json.dumps(node, sort_keys=True).encode("utf-8"), digest_size=8
+    ).digest()
+
+
+def _summarise_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarise a `GraphAPIResponse` document into what `_diff_graphs` needs of it:
+    a hash of each node, the ends of each edge and the other fields as they are.
+    """
+    summary = {field: graph[field] for field in _PATCHED_FIELDS}
+    summary["nodes"] = {node["id"]: _hash_node(node) for node in graph["nodes"]}
+    summary["edges"] = [(edge["source"], edge["target"]) for edge in graph["edges"]]
+    return summary
+
+
+def _diff_graphs(base: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the changes between the summary of a `GraphAPIResponse` document,
+    as made by `_summarise_graph`, and a current document. Nodes are joined
+    on their IDs and edges on their source and target, through hash tables,
+    so the diff is linear in the size of the graphs.
+    """
+    base_nodes = base["nodes"]
+    current_node_ids = {node["id"] for node in current["nodes"]}
+    base_edges = set(base["edges"])
+    current_edges = {(edge["source"], edge["target"]) for edge in current["edges"]}
+
+    patch: Dict[str, Any] = {
+        "nodes": {
+            "added": [
+                node for node in current["nodes"] if node["id"] not in base_nodes
+            ],
+            "changed": [
+                node
+                for node in current["nodes"]
+                if node["id"] in base_nodes
+                and base_nodes[node["id"]] != _hash_node(node)
+            ],
+            "removed": [
+                node_id for node_id in base_nodes if node_id not in current_node_ids
+            ],
+        },
+        "edges": {
+            "added": [
+                edge
+                for edge in current["edges"]
+                if (edge["source"], edge["target"]) not in base_edges
+            ],
+            "removed": [
+                {"source": source, "target": target}
+                for source, target in base["edges"]
+                if (source, target) not in current_edges
+            ],
+        },
+    }
+    for field in _PATCHED_FIELDS:
+        if base[field] != current[field]:
+            patch[field] = current[field]
+    return patch
+
+
+def get_encoded_patch_response(
+    since: str, manager: Optional[DataAccessManager] = None
+) -> Optional[EncodedResponse]:
+    """Cached, encoded changes of the response for `/api/main` since the given version,
+    i.e. the digest of an earlier default response. Return None if that version
+    is no longer retained by the DataAccessManager.
+    """
+    manager = _get_manager(manager)
+    base = manager.graph_versions.get_version(since)
+    if base is None:
+        return None
+
+    current = get_encoded_default_response(manager=manager)
+
+    def build_patch(_) -> bytes:
+        patch = {"base_version": since, "version": current.digest}
+        patch.update(_diff_graphs(base, json.loads(current.content)))
+        return serializers.dumps(patch)
+
+    return response_cache.get(manager, f"main?since={since}", build_patch)
+
+
+def get_encoded_compact_response(
+    manager: Optional[DataAccessManager] = None,
+) -> EncodedResponse:
+    """Cached, encoded version of the compact response for `/api/v2/main`,
+    which carries the same graph as `/api/main`.
+    """
+    manager = _get_manager(manager)
+    return response_cache.get(
+        manager,
+        "v2/main",
+        lambda graph: serializers.dumps(serializers.graph_to_compact_dict(**graph)),
+        lambda: _get_default_graph(manager),
+    )
+
+
+def get_manager_fingerprint(
+    manager: Optional[DataAccessManager] = None,
+) -> str:
+    """A fingerprint of the populated DataAccessManager.
+    Since the default response contains the whole graph, its digest changes
+    whenever anything in the graph changes.
+    """
+    return get_encoded_default_response(manager=manager).digest
+
+
+def get_encoded_pipeline_response(
+    pipeline_id: str,
+    fields: serializers.Fields = None,
+    manager: Optional[DataAccessManager] = None,
+) -> EncodedResponse:
+    """Cached, encoded version of the response for `/api/pipelines/{pipeline_id}`,
+    or a projection of it if fields are given.
+    """
+    manager = _get_manager(manager)
+    return response_cache.get(
+        manager,
+        _make_cache_key(f"pipelines/{pipeline_id}", fields),
+        lambda graph: serializers.serialize_graph(**graph, fields=fields),
+        lambda: _get_pipeline_graph(pipeline_id, manager),
+    )
+
+
+def iter_ndjson_response(
+    pipeline_id: Optional[str] = None,
+    fields: serializers.Fields = None,
+    manager: Optional[DataAccessManager] = None,
+) -> Iterator[bytes]:
+    """Stream the graph for `/api/main`, or `/api/pipelines/{pipeline_id}` if a
+    pipeline ID is given, as newline-delimited JSON.
+    """
+    with _get_manager(manager).lock:
+        # the nodes and edges are streamed as they are when requested
+        graph = _get_graph(pipeline_id, manager)
+        graph["nodes"] = list(graph["nodes"])
+        graph["edges"] = list(graph["edges"])
+    return serializers.iter_graph_ndjson(**graph, fields=fields)
+
+
+class GraphPages:
+    """Pin the revisions of each DataAccessManager that pages of its graph are walked at.
+    As nodes and edges are only ever appended to the GraphNodesRepository and
+    GraphEdgesRepository, the graph at a revision is made of the nodes and edges
+    they held then, so only their numbers are retained for each revision.
+    The cursors of a walk therefore stay valid while pending pipelines are populated.
+    Only the most recently pinned revisions of each manager are retained.
+    """
+
+    def __init__(self, max_revisions: int = 16):
+        self.max_revisions = max_revisions
+        # map each manager to its pinned revisions, from the least to the most
+        # recently pinned, each one with the numbers of nodes and edges at that revision
+        self._revisions: WeakKeyDictionary = WeakKeyDictionary()
+
+    def pin(self, manager: DataAccessManager) -> int:
+        """Pin the current revision of the given manager and return it."""
+        revisions = self._revisions.setdefault(manager, OrderedDict())
+        revisions[manager.revision] = (
+            len(manager.nodes.as_list()),
+            len(manager.edges.as_list()),
+        )
+        revisions.move_to_end(manager.revision)
+        while len(revisions) > self.max_revisions:
+            revisions.popitem(last=False)
+        return manager.revision
+
+    def get_sizes(
+        self, manager: DataAccessManager, revision: int
+    ) -> Optional[Tuple[int, int]]:
+        """Return the numbers of nodes and edges of the given manager at a pinned
+        revision, or None if that revision isn't pinned.
+        """
+        empty_revisions: Dict[int, Tuple[int, int]] = {}
+        return self._revisions.get(manager, empty_revisions).get(revision)
+
+
+graph_pages = GraphPages()
+
+
+def _get_pinned_graph(
+    pipeline_id: Optional[str],
+    manager: DataAccessManager,
+    nodes_count: int,
+    edges_count: int,
+) -> Dict[str, Any]:
+    """Return the graph of the given pipeline, or the default graph, made of
+    the first `nodes_count` nodes and `edges_count` edges of the repositories.
+    The nodes and edges aren't converted, only referenced.
+    """
+    graph = _get_default_graph(manager)
+    edges = manager.edges.as_list()[:edges_count]
+    if pipeline_id is None:
+        graph.update(nodes=manager.nodes.as_list()[:nodes_count], edges=edges)
+        return graph
+
+    node_ids = manager.registered_pipelines.get_node_ids_by_pipeline_id(pipeline_id)
+    mask = manager.nodes.get_mask(pipeline_id=pipeline_id) & ((1 << nodes_count) - 1)
+    graph.update(
+        nodes=manager.nodes.get_nodes_by_mask(mask),
+        edges=[
+            edge
+            for edge in edges
+            if edge.source in node_ids and edge.target in node_ids
+        ],
+        modular_pipelines=manager.modular_pipelines.from_ids(
+            manager.nodes.get_modular_pipelines_by_mask(mask)
+        ).as_list(),
+        selected_pipeline=pipeline_id,
+    )
+    return graph
+
+
+def get_graph_page(
+    limit: int,
+    cursor: Optional[str] = None,
+    pipeline_id: Optional[str] = None,
+    fields: serializers.Fields = None,
+    manager: Optional[DataAccessManager] = None,
+) -> bytes:
+    """Return a page of the graph for `/api/main`, or `/api/pipelines/{pipeline_id}`
+    if a pipeline ID is given. Nodes and then edges are paginated as one sequence,
+    in the order they are kept in the GraphNodesRepository and GraphEdgesRepository
+    at the revision the first page is requested at, even if pending pipelines
+    are populated in the meantime, though the nodes carry their current fields.
+    Only the nodes and edges of a page are converted.
+    Every page also carries the remaining fields of `GraphAPIResponse` and
+    a `next_cursor` to request the next page, or null on the last page.
+
+    Returns:
+        The page, encoded to JSON.
+
+    Raises:
+        ValueError: When the cursor is invalid, or refers to a revision
+            that is no longer pinned.
+    """
+    manager = _get_manager(manager)
+    with manager.lock:
+        if cursor is None:
+            revision, offset = str(graph_pages.pin(manager)), "0"
+        else:
+            revision, _, offset = cursor.partition(":")
+        sizes = (
+            graph_pages.get_sizes(manager, int(revision))
+            if revision.isdigit()
+            else None
+        )
+        if sizes is None or not offset.isdigit():
+            raise ValueError("Invalid or expired cursor")
+        graph = _get_pinned_graph(pipeline_id, manager, *sizes)
+
+    # nodes and then edges are sliced as one sequence
+    nodes, edges = graph["nodes"], graph["edges"]
+    start, end = int(offset), int(offset) + limit
+    graph.update(
+        nodes=nodes[start:end],
+        edges=edges[max(start - len(nodes), 0) : max(end - len(nodes), 0)],
     )
+    page = serializers.graph_to_dict(**graph, fields=fields)
+    page["next_cursor"] = f"{revision}:{end}" if end < len(nodes) + len(edges) else None
+    return serializers.dumps(page)
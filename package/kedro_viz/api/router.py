@@ -27,10 +27,15 @@
 # limitations under the License.
 """`kedro_viz.api.router` defines routes and handling logic for the API."""
 # pylint: disable=missing-function-docstring
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
 
-from kedro_viz.data_access import data_access_manager
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from kedro_viz.data_access import DataAccessManager, data_access_manager
 from kedro_viz.models.graph import (
     DataNode,
     DataNodeMetadata,
@@ -39,11 +44,25 @@ from kedro_viz.models.graph import (
     TaskNodeMetadata,
 )
 
+from . import serializers
 from .responses import (
     APIErrorMessage,
+    CompactGraphAPIResponse,
+    EncodedResponse,
     GraphAPIResponse,
     NodeMetadataAPIResponse,
-    get_default_response,
+    NodesMetadataAPIRequest,
+    NodesMetadataAPIResponse,
+    StartupStatusAPIResponse,
+    accepts_gzip,
+    get_encoded_compact_response,
+    get_encoded_default_response,
+    get_encoded_patch_response,
+    get_encoded_pipeline_response,
+    get_graph_page,
+    get_manager_fingerprint,
+    get_node_metadata,
+    iter_ndjson_response,
 )
 
 router = APIRouter(
@@ -52,29 +71,394 @@ router = APIRouter(
 )
 
 
-@router.get("/main", response_model=GraphAPIResponse)
-async def main():
-    return get_default_response()
+# how long clients should wait before retrying while the project is loading
+_RETRY_AFTER_SECONDS = 1
+
+
+def _ensure_project_loaded(request: Request):
+    """Refuse to serve the graph until the Kedro project has been loaded in the background.
+    Apps created without a startup status, e.g. in tests, are always considered loaded.
+    """
+    startup_status = getattr(request.app.state, "startup_status", None)
+    if startup_status is None or startup_status.is_ready:
+        return
+    if startup_status.has_failed:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load the Kedro project: {startup_status.error}",
+        )
+    raise HTTPException(
+        status_code=503,
+        detail="The Kedro project is still loading",
+        headers={"Retry-After": str(_RETRY_AFTER_SECONDS)},
+    )
+
+
+# the graph endpoints can only be served once the project has been loaded
+_GRAPH_DEPENDENCIES = [Depends(_ensure_project_loaded)]
+
+
+_ENV_QUERY = Query(
+    None,
+    description="The Kedro environment to read the catalog from, "
+    "when the server was started with several environments.",
+)
+
+
+def get_data_access_manager(
+    request: Request, env: Optional[str] = _ENV_QUERY
+) -> DataAccessManager:
+    """The DataAccessManager of the project served by the app. It is the global one,
+    unless the app serves one of the projects hosted by the daemon, or another
+    Kedro environment is requested with `?env=`.
+    """
+    manager = getattr(request.app.state, "data_access_manager", data_access_manager)
+    if env is None:
+        return manager
+    env_managers = getattr(request.app.state, "env_data_access_managers", {})
+    if env not in env_managers:
+        raise HTTPException(status_code=404, detail="Invalid environment")
+    return env_managers[env]
+
+
+_MANAGER = Depends(get_data_access_manager)
+
+
+@router.get("/status", response_model=StartupStatusAPIResponse)
+async def get_status(request: Request):
+    startup_status = getattr(request.app.state, "startup_status", None)
+    if startup_status is None:
+        return {"status": "ready", "phases": [], "error": None}
+    return startup_status.as_dict()
+
+
+# how often to send a comment on the events stream when nothing happens,
+# so that proxies don't close the idle connection
+_EVENTS_KEEPALIVE_SECONDS = 15
+
+
+@router.get("/events")
+async def get_events(request: Request):
+    """Stream the graph updates as Server-Sent Events, e.g. `graph-updated`
+    when the Kedro project was reloaded in watch mode.
+    """
+    graph_updates = getattr(request.app.state, "graph_updates", None)
+    if graph_updates is None:
+        raise HTTPException(status_code=404, detail="The project is not watched")
+    queue = graph_updates.subscribe()
+
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=_EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                data = serializers.dumps(event).decode("utf-8")
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            graph_updates.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/debug/startup")
+async def get_startup_profile(request: Request):
+    """Report the time and memory taken by each phase of loading the Kedro project,
+    and its slowest pipelines and datasets, when started with `--profile-startup`.
+    """
+    startup_profiler = getattr(request.app.state, "startup_profiler", None)
+    if startup_profiler is None:
+        raise HTTPException(status_code=404, detail="The startup is not profiled")
+    return startup_profiler.report()
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the representation with the given ETag,
+    using the weak comparison that RFC 7232 requires for If-None-Match.
+    The ETag is given as an opaque tag, i.e. a quoted string without the weak prefix.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    client_etags = {
+        tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")
+    }
+    return etag in client_etags
+
+
+def _make_encoded_response(request: Request, encoded: EncodedResponse) -> Response:
+    """Send a pre-encoded response, compressed if the client accepts gzip,
+    or a 304 Not Modified if the client already has it.
+    """
+    is_gzipped = accepts_gzip(request.headers)
+    # each encoding is a representation of its own, hence has its own strong ETag,
+    # whose tag is the digest of the content, e.g. the version of the graph
+    etag = f'"{encoded.digest}-gz"' if is_gzipped else f'"{encoded.digest}"'
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache", "ETag": etag}
+    if _is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    if is_gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            encoded.gzipped_content, media_type="application/json", headers=headers
+        )
+    return Response(encoded.content, media_type="application/json", headers=headers)
+
+
+_DEFAULT_PAGE_SIZE = 1000
+
+# Query parameters shared by the graph endpoints to stream or paginate the graph
+# instead of sending it as a single JSON document.
+_FORMAT_QUERY = Query(
+    None,
+    alias="format",
+    regex="^(json|ndjson)$",
+    description="Use `ndjson` to stream nodes, then edges, then the other fields "
+    "as newline-delimited JSON.",
+)
+_LIMIT_QUERY = Query(
+    None, gt=0, description="Paginate nodes and then edges with this page size."
+)
+_CURSOR_QUERY = Query(
+    None, description="The `next_cursor` returned by the previous page."
+)
+_SINCE_QUERY = Query(
+    None,
+    description="Only return the changes since this version of the graph, "
+    "as given by the `X-Graph-Version` header of a previous response.",
+)
+_FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated list of the node and edge fields to return, "
+    "e.g. `id,name,type`.",
+)
+
+
+def _make_graph_response(
+    request: Request,
+    pipeline_id: Optional[str],
+    output_format: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+    manager: DataAccessManager,
+) -> Response:
+    try:
+        projection = serializers.parse_fields(fields)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"message": str(exc)})
+
+    is_paginated = limit is not None or cursor is not None
+    if output_format == "ndjson":
+        if is_paginated:
+            return JSONResponse(
+                status_code=400,
+                content={"message": "NDJSON output cannot be paginated"},
+            )
+        return StreamingResponse(
+            iter_ndjson_response(pipeline_id, projection, manager),
+            media_type="application/x-ndjson",
+        )
+
+    if is_paginated:
+        try:
+            page = get_graph_page(
+                limit or _DEFAULT_PAGE_SIZE, cursor, pipeline_id, projection, manager
+            )
+        except ValueError as exc:
+            return JSONResponse(status_code=400, content={"message": str(exc)})
+        return Response(page, media_type="application/json")
+
+    encoded = (
+        get_encoded_default_response(projection, manager)
+        if pipeline_id is None
+        else get_encoded_pipeline_response(pipeline_id, projection, manager)
+    )
+    return _make_encoded_response(request, encoded)
+
+
+def _make_main_response(
+    request: Request,
+    output_format: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+    since: Optional[str],
+    manager: DataAccessManager,
+) -> Response:
+    response: Optional[Response] = None
+    if since is not None:
+        if any(param is not None for param in (output_format, limit, cursor, fields)):
+            return JSONResponse(
+                status_code=400,
+                content={"message": "since cannot be combined with other parameters"},
+            )
+        encoded = get_encoded_patch_response(since, manager)
+        # if the version is no longer retained, fall back to the full graph
+        if encoded is not None:
+            response = _make_encoded_response(request, encoded)
+
+    if response is None:
+        response = _make_graph_response(
+            request, None, output_format, limit, cursor, fields, manager
+        )
+    response.headers["X-Graph-Version"] = get_manager_fingerprint(manager)
+    return response
+
+
+@router.get("/main", response_model=GraphAPIResponse, dependencies=_GRAPH_DEPENDENCIES)
+async def main(
+    request: Request,
+    output_format: Optional[str] = _FORMAT_QUERY,
+    limit: Optional[int] = _LIMIT_QUERY,
+    cursor: Optional[str] = _CURSOR_QUERY,
+    fields: Optional[str] = _FIELDS_QUERY,
+    since: Optional[str] = _SINCE_QUERY,
+    manager: DataAccessManager = _MANAGER,
+):
+    # the graph is serialised and compressed the first time, which blocks
+    return await run_in_threadpool(
+        _make_main_response,
+        request,
+        output_format,
+        limit,
+        cursor,
+        fields,
+        since,
+        manager,
+    )
+
+
+@router.get(
+    "/v2/main",
+    response_model=CompactGraphAPIResponse,
+    dependencies=_GRAPH_DEPENDENCIES,
+)
+async def main_v2(request: Request, manager: DataAccessManager = _MANAGER):
+    encoded = await run_in_threadpool(get_encoded_compact_response, manager)
+    return _make_encoded_response(request, encoded)
+
+
+def _compute_node_metadata(
+    manager: DataAccessManager, node_id: str
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Compute the metadata of a node, returning either the metadata
+    or an error message if it couldn't be computed.
+    """
+    node = manager.nodes.get_node_by_id(node_id)
+    if not node:
+        return None, "Invalid node ID"
+    try:
+        return get_node_metadata(node, manager), ""
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+async def _make_nodes_metadata_response(
+    manager: DataAccessManager, node_ids: List[str]
+) -> Response:
+    # remove duplicates while keeping the order in which the nodes were requested
+    node_ids = list(dict.fromkeys(node_ids))
+    # node metadata may read source code or plot data from disk,
+    # so it is computed in the threadpool, concurrently for all nodes
+    results = await asyncio.gather(
+        *(
+            run_in_threadpool(_compute_node_metadata, manager, node_id)
+            for node_id in node_ids
+        )
+    )
+    batch: Dict[str, Dict[str, Any]] = {"nodes": {}, "errors": {}}
+    for node_id, (metadata, error) in zip(node_ids, results):
+        if metadata is None:
+            batch["errors"][node_id] = error
+        else:
+            batch["nodes"][node_id] = serializers.user_value(metadata)
+    return Response(serializers.dumps(batch), media_type="application/json")
+
+
+@router.get(
+    "/nodes",
+    response_model=NodesMetadataAPIResponse,
+    dependencies=_GRAPH_DEPENDENCIES,
+)
+async def get_nodes_metadata(
+    ids: str = Query(..., description="Comma-separated list of node IDs."),
+    manager: DataAccessManager = _MANAGER,
+):
+    return await _make_nodes_metadata_response(
+        manager, [node_id.strip() for node_id in ids.split(",") if node_id.strip()]
+    )
+
+
+@router.post(
+    "/nodes",
+    response_model=NodesMetadataAPIResponse,
+    dependencies=_GRAPH_DEPENDENCIES,
+)
+async def post_nodes_metadata(
+    nodes_request: NodesMetadataAPIRequest, manager: DataAccessManager = _MANAGER
+):
+    return await _make_nodes_metadata_response(manager, nodes_request.ids)
 
 
 @router.get(
     "/nodes/{node_id}",
     response_model=NodeMetadataAPIResponse,  # type: ignore
     response_model_exclude_none=True,
+    dependencies=_GRAPH_DEPENDENCIES,
 )
-async def get_single_node_metadata(node_id: str):
-    node = data_access_manager.nodes.get_node_by_id(node_id)
+async def get_single_node_metadata(  # pylint: disable=too-many-return-statements
+    request: Request,
+    response: Response,
+    node_id: str,
+    manager: DataAccessManager = _MANAGER,
+):
+    node = manager.nodes.get_node_by_id(node_id)
     if not node:
         return JSONResponse(status_code=404, content={"message": "Invalid node ID"})
 
+    # A node's metadata is derived from the graph, so it is current for as long as
+    # the graph fingerprint doesn't change. The only exception is plot data,
+    # which is read from the dataset on every request.
+    if not (isinstance(node, DataNode) and node.is_plot_node()):
+        fingerprint = await run_in_threadpool(get_manager_fingerprint, manager)
+        node_key = f"{fingerprint}:{node_id}".encode("utf-8")
+        digest = hashlib.sha256(node_key).hexdigest()[:16]
+        response.headers["ETag"] = f'"{digest}"'
+        response.headers["Cache-Control"] = "no-cache"
+        if _is_not_modified(request, response.headers["ETag"]):
+            return Response(status_code=304, headers=dict(response.headers))
+
+    # the nodes restored from a snapshot have their metadata precomputed
+    if node_id in manager.node_metadata:
+        return JSONResponse(
+            content=manager.node_metadata[node_id], headers=dict(response.headers)
+        )
+
+    # while the others need their Kedro objects, which loads the project the first time
+    if manager.live_loader is not None:
+        node = await run_in_threadpool(manager.get_live_node, node)
+
     if not node.has_metadata():
-        return JSONResponse(content={})
+        return JSONResponse(content={}, headers=dict(response.headers))
 
     if isinstance(node, TaskNode):
         return TaskNodeMetadata(node)
 
     if isinstance(node, DataNode):
-        return DataNodeMetadata(node)
+        # reading the dataset, and creating it if it's lazily created, may block
+        return await run_in_threadpool(DataNodeMetadata, node)
 
     return ParametersNodeMetadata(node)
 
@@ -82,24 +466,30 @@ async def get_single_node_metadata(node_id: str):
 @router.get(
     "/pipelines/{pipeline_id}",
     response_model=GraphAPIResponse,
+    dependencies=_GRAPH_DEPENDENCIES,
 )
-async def get_single_pipeline_data(pipeline_id: str):
-    if not data_access_manager.registered_pipelines.has_pipeline(pipeline_id):
+async def get_single_pipeline_data(
+    request: Request,
+    pipeline_id: str,
+    output_format: Optional[str] = _FORMAT_QUERY,
+    limit: Optional[int] = _LIMIT_QUERY,
+    cursor: Optional[str] = _CURSOR_QUERY,
+    fields: Optional[str] = _FIELDS_QUERY,
+    manager: DataAccessManager = _MANAGER,
+):
+    if not manager.registered_pipelines.has_pipeline(pipeline_id):
         return JSONResponse(status_code=404, content={"message": "Invalid pipeline ID"})
 
-    node_ids = data_access_manager.registered_pipelines.get_node_ids_by_pipeline_id(
-        pipeline_id
-    )
-    nodes = data_access_manager.nodes.get_nodes_by_ids(node_ids)
-
-    return GraphAPIResponse(
-        nodes=nodes,
-        edges=data_access_manager.edges.get_edges_by_node_ids(node_ids),
-        tags=data_access_manager.tags.as_list(),
-        layers=data_access_manager.layers.as_list(),
-        pipelines=data_access_manager.registered_pipelines.as_list(),
-        selected_pipeline=pipeline_id,
-        modular_pipelines=data_access_manager.modular_pipelines.from_nodes(
-            nodes
-        ).as_list(),
+    if pipeline_id in manager.pending_pipelines:
+        # the pipeline is populated on its first request
+        await run_in_threadpool(manager.populate_pipeline, pipeline_id)
+    return await run_in_threadpool(
+        _make_graph_response,
+        request,
+        pipeline_id,
+        output_format,
+        limit,
+        cursor,
+        fields,
+        manager,
     )
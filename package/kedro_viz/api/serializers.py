@@ -0,0 +1,418 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.api.serializers` writes the internal graph objects straight to JSON.
+It produces exactly the same documents as the pydantic models in
+`kedro_viz.api.responses`, without validating every graph node on every request.
+If `orjson` is installed, it is used for encoding; otherwise the stdlib `json` is used.
+As orjson encodes some values differently, e.g. non-finite floats or floats written
+with an exponent, or can't encode them at all, e.g. integers wider than 64 bits,
+the documents holding such values are encoded with the stdlib `json` instead.
+"""
+import json
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic.json import pydantic_encoder
+
+from kedro_viz.models.graph import (
+    GraphEdge,
+    GraphNode,
+    ModularPipeline,
+    RegisteredPipeline,
+    Tag,
+    TaskNode,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+# The fields of the node and edge records, in the order they are serialised.
+# Their names don't overlap, so a single list of fields can project both.
+NODE_FIELDS = (
+    "id",
+    "name",
+    "full_name",
+    "tags",
+    "pipelines",
+    "modular_pipelines",
+    "type",
+    "parameters",
+    "layer",
+    "dataset_type",
+)
+EDGE_FIELDS = ("source", "target")
+
+# A projection of the node and edge records, as returned by `parse_fields`.
+Fields = Optional[Tuple[str, ...]]
+
+_MIN_ORJSON_INT = -(2 ** 63)
+_MAX_ORJSON_INT = 2 ** 64 - 1
+
+
+class _UserValue:  # pylint: disable=too-few-public-methods
+    """Wrap an arbitrary value that orjson would not encode as the stdlib `json` does."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _is_encoded_alike(value: Any) -> bool:
+    """Check whether orjson encodes a value to the same bytes as the stdlib `json`."""
+    if value is None or isinstance(value, (str, bool)):
+        return True
+    if isinstance(value, int):
+        return _MIN_ORJSON_INT <= value <= _MAX_ORJSON_INT
+    if isinstance(value, float):
+        return math.isfinite(value) and "e" not in repr(value)
+    if isinstance(value, (list, tuple)):
+        return all(_is_encoded_alike(item) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and _is_encoded_alike(item)
+            for key, item in value.items()
+        )
+    # e.g. a path or a datetime, which orjson may encode natively
+    return False
+
+
+def user_value(value: Any) -> Any:
+    """Mark an arbitrary value held by a document, e.g. the parameters or the metadata
+    of a node, so that the document is encoded with the stdlib `json` by `dumps`
+    if orjson would encode the value differently.
+
+    Returns:
+        The value itself if orjson encodes it as the stdlib `json` does,
+        otherwise the marked value.
+    """
+    if orjson is None or _is_encoded_alike(value):
+        return value
+    return _UserValue(value)
+
+
+def parse_fields(fields: Optional[str]) -> Fields:
+    """Parse a comma-separated list of node and edge fields into a projection,
+    in canonical order so that equivalent lists share the same projection.
+    Nodes always keep their `id`. Edges are only projected if one of their fields
+    is requested, as an edge without both ends is of no use otherwise.
+
+    Returns:
+        The projection, or None if no fields are requested.
+
+    Raises:
+        ValueError: When one of the fields is unknown.
+    """
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(NODE_FIELDS, EDGE_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Valid fields are: {', '.join(NODE_FIELDS + EDGE_FIELDS)}."
+        )
+    requested.add("id")
+    if requested.isdisjoint(EDGE_FIELDS):
+        requested.update(EDGE_FIELDS)
+    return tuple(field for field in NODE_FIELDS + EDGE_FIELDS if field in requested)
+
+
+def _project(record: Dict[str, Any], fields: Fields) -> Dict[str, Any]:
+    if fields is None:
+        return record
+    return {key: value for key, value in record.items() if key in fields}
+
+
+def serialize_node(node: GraphNode) -> Dict[str, Any]:
+    """Serialise a graph node into the same record as `NodeAPIResponse`."""
+    data = {
+        "id": node.id,
+        "name": node.name,
+        "full_name": node.full_name,
+        # sorted, as the order of a set varies between processes, and so would the ETag
+        "tags": sorted(node.tags),
+        "pipelines": list(node.pipelines),
+        "modular_pipelines": list(node.modular_pipelines),
+        "type": node.type,  # type: ignore
+    }
+    if isinstance(node, TaskNode):
+        data["parameters"] = user_value(node.parameters)
+    else:
+        # parameters nodes are serialised as data nodes without a dataset type
+        data["layer"] = node.layer  # type: ignore
+        data["dataset_type"] = getattr(node, "dataset_type", None)
+    return data
+
+
+def serialize_edge(edge: GraphEdge) -> Dict[str, str]:
+    """Serialise a graph edge into the same record as `GraphEdgeAPIResponse`."""
+    return {"source": edge.source, "target": edge.target}
+
+
+def serialize_named_entity(
+    entity: Union[RegisteredPipeline, ModularPipeline, Tag]
+) -> Dict[str, str]:
+    """Serialise a pipeline, modular pipeline or tag
+    into the same record as `NamedEntityAPIResponse`.
+    """
+    return {"id": entity.id, "name": entity.name}
+
+
+# pylint: disable=too-many-arguments
+def graph_to_dict(
+    nodes: Iterable[GraphNode],
+    edges: Iterable[GraphEdge],
+    layers: List[str],
+    tags: Iterable[Tag],
+    pipelines: Iterable[RegisteredPipeline],
+    modular_pipelines: Iterable[ModularPipeline],
+    selected_pipeline: str,
+    fields: Fields = None,
+) -> Dict[str, Any]:
+    """Convert a graph into the same document as `GraphAPIResponse`,
+    keeping only the given fields of its nodes and edges if any.
+    """
+    return {
+        "nodes": [_project(serialize_node(node), fields) for node in nodes],
+        "edges": [_project(serialize_edge(edge), fields) for edge in edges],
+        "layers": list(layers),
+        "tags": [serialize_named_entity(tag) for tag in tags],
+        "pipelines": [serialize_named_entity(p) for p in pipelines],
+        "modular_pipelines": [serialize_named_entity(p) for p in modular_pipelines],
+        "selected_pipeline": selected_pipeline,
+    }
+
+
+# pylint: disable=too-many-arguments
+def serialize_graph(
+    nodes: Iterable[GraphNode],
+    edges: Iterable[GraphEdge],
+    layers: List[str],
+    tags: Iterable[Tag],
+    pipelines: Iterable[RegisteredPipeline],
+    modular_pipelines: Iterable[ModularPipeline],
+    selected_pipeline: str,
+    fields: Fields = None,
+) -> bytes:
+    """Serialise a graph into the same JSON document as `GraphAPIResponse`,
+    keeping only the given fields of its nodes and edges if any.
+    """
+    return dumps(
+        graph_to_dict(
+            nodes,
+            edges,
+            layers,
+            tags,
+            pipelines,
+            modular_pipelines,
+            selected_pipeline,
+            fields,
+        )
+    )
+
+
+class _StringTable:
+    """Dictionary-encode strings: each distinct string is stored once
+    and referred to by its index in the table.
+    """
+
+    def __init__(self):
+        # dicts keep insertion order, so a string's index is its position in the dict
+        self._indices: Dict[str, int] = {}
+
+    def index(self, value: Optional[str]) -> Optional[int]:
+        """The index of a string in the table, which is added if missing."""
+        if value is None:
+            return None
+        return self._indices.setdefault(value, len(self._indices))
+
+    def indices(self, values: Iterable[str]) -> List[int]:
+        """The indices of several strings in the table."""
+        return [self._indices.setdefault(value, len(self._indices)) for value in values]
+
+    def entities(
+        self, entities: Iterable[Union[RegisteredPipeline, ModularPipeline, Tag]]
+    ) -> List[List[int]]:
+        """The indices of the ID and name of several pipelines, modular pipelines
+        or tags in the table.
+        """
+        return [self.indices((entity.id, entity.name)) for entity in entities]
+
+    def as_list(self) -> List[str]:
+        """The strings of the table, in the order of their indices."""
+        return list(self._indices)
+
+
+# pylint: disable=too-many-arguments
+def graph_to_compact_dict(
+    nodes: Iterable[GraphNode],
+    edges: Iterable[GraphEdge],
+    layers: List[str],
+    tags: Iterable[Tag],
+    pipelines: Iterable[RegisteredPipeline],
+    modular_pipelines: Iterable[ModularPipeline],
+    selected_pipeline: str,
+) -> Dict[str, Any]:
+    """Convert a graph into the compact document served by `/api/v2/main`.
+    It carries the same information as `GraphAPIResponse`, encoded as follows:
+
+    * every string is stored once in the `strings` table and referred to by its index
+      everywhere else, including in the memberships of nodes and in `layers`;
+    * nodes are stored column by column in `nodes`, with one list per field,
+      so the n-th node is made of the n-th item of every column;
+    * edges are `[source, target]` pairs of indices in the node columns;
+    * tags, pipelines and modular pipelines are `[id, name]` pairs.
+
+    Task nodes have null `layer` and `dataset_type`; data and parameters nodes
+    have null `parameters`.
+    """
+    strings = _StringTable()
+    columns: Dict[str, List[Any]] = {field: [] for field in NODE_FIELDS}
+    node_indices: Dict[str, int] = {}
+    for node in nodes:
+        node_indices[node.id] = len(node_indices)
+        columns["id"].append(strings.index(node.id))
+        columns["name"].append(strings.index(node.name))
+        columns["full_name"].append(strings.index(node.full_name))
+        columns["tags"].append(strings.indices(sorted(node.tags)))
+        columns["pipelines"].append(strings.indices(node.pipelines))
+        columns["modular_pipelines"].append(strings.indices(node.modular_pipelines))
+        columns["type"].append(strings.index(node.type))  # type: ignore
+        if isinstance(node, TaskNode):
+            columns["parameters"].append(user_value(node.parameters))
+            columns["layer"].append(None)
+            columns["dataset_type"].append(None)
+        else:
+            columns["parameters"].append(None)
+            columns["layer"].append(strings.index(node.layer))  # type: ignore
+            columns["dataset_type"].append(
+                strings.index(getattr(node, "dataset_type", None))
+            )
+
+    compact_edges = [
+        [node_indices[edge.source], node_indices[edge.target]] for edge in edges
+    ]
+    compact_layers = strings.indices(layers)
+    entities = {
+        "tags": strings.entities(tags),
+        "pipelines": strings.entities(pipelines),
+        "modular_pipelines": strings.entities(modular_pipelines),
+    }
+    compact_selected_pipeline = strings.index(selected_pipeline)
+    return {
+        "version": 2,
+        "strings": strings.as_list(),
+        "nodes": columns,
+        "edges": compact_edges,
+        "layers": compact_layers,
+        **entities,
+        "selected_pipeline": compact_selected_pipeline,
+    }
+
+
+# pylint: disable=too-many-arguments
+def iter_graph_ndjson(
+    nodes: Iterable[GraphNode],
+    edges: Iterable[GraphEdge],
+    layers: List[str],
+    tags: Iterable[Tag],
+    pipelines: Iterable[RegisteredPipeline],
+    modular_pipelines: Iterable[ModularPipeline],
+    selected_pipeline: str,
+    fields: Fields = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Serialise a graph as newline-delimited JSON with one record per line:
+    every node as `{"node": ...}`, then every edge as `{"edge": ...}`,
+    then one line for each of the remaining fields of `GraphAPIResponse`,
+    e.g. `{"layers": [...]}`. Lines are buffered into chunks of roughly `chunk_size`
+    bytes, so memory stays flat however large the graph is. If fields are given,
+    only those fields of the nodes and edges are kept.
+    """
+
+    def iter_lines() -> Iterator[bytes]:
+        for node in nodes:
+            yield dumps({"node": _project(serialize_node(node), fields)})
+        for edge in edges:
+            yield dumps({"edge": _project(serialize_edge(edge), fields)})
+        yield dumps({"layers": list(layers)})
+        yield dumps({"tags": [serialize_named_entity(tag) for tag in tags]})
+        yield dumps({"pipelines": [serialize_named_entity(p) for p in pipelines]})
+        yield dumps(
+            {
+                "modular_pipelines": [
+                    serialize_named_entity(p) for p in modular_pipelines
+                ]
+            }
+        )
+        yield dumps({"selected_pipeline": selected_pipeline})
+
+    chunk = bytearray()
+    for line in iter_lines():
+        chunk += line + b"\n"
+        if len(chunk) >= chunk_size:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, _UserValue):
+        # aborts the encoding, so that the stdlib encoder is used instead
+        raise TypeError("The value must be encoded by the stdlib encoder.")
+    return pydantic_encoder(value)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, _UserValue):
+        return value.value
+    return pydantic_encoder(value)
+
+
+def dumps(data: Any) -> bytes:
+    """Encode data to compact UTF-8 JSON, the same way FastAPI's JSONResponse would.
+    Values that aren't natively serialisable, e.g. parameters of arbitrary types,
+    are encoded with pydantic's encoder. The values marked with `user_value` that
+    orjson would encode differently, and the ones it can't encode, make the data
+    encoded with the stdlib encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(
+        data, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
@@ -0,0 +1,438 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.daemon` runs a long-lived server that hosts the pipelines of several
+Kedro projects, so that `kedro viz` doesn't have to load a project from scratch
+every time it's run.
+"""
+import hashlib
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib import request as urllib_request
+from urllib.error import URLError
+
+import uvicorn
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, RedirectResponse
+from pydantic import BaseModel
+
+from kedro_viz import __version__
+from kedro_viz.api import apps, responses
+from kedro_viz.data_access import DataAccessManager
+from kedro_viz.server import load_project
+from kedro_viz.services import StartupStatus
+
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_PORT = 4141
+_DEFAULT_MEMORY_BUDGET_MB = 2048
+
+# the file through which `kedro viz` finds the running daemon, holding the token
+# that its API requires, so it is only readable by the user running the daemon
+_DAEMON_STATE_FILE = Path.home() / ".kedro-viz" / "daemon.json"
+_TOKEN_HEADER = "X-Kedro-Viz-Token"
+
+# the URL prefix under which each project is served, followed by its key
+_PROJECTS_PREFIX = "/projects/"
+
+# A rough ratio between the memory taken by a populated DataAccessManager
+# and the size of its graph as JSON, used to estimate the memory of each project.
+# It's a heuristic rather than a measure: the projects share the daemon's process,
+# and its memory isn't returned to the system once freed, so the resident memory
+# gained while loading a project doesn't tell how much evicting it would free.
+_MEMORY_PER_JSON_BYTE = 10
+
+# Kedro configures the project it loads globally, e.g. its settings and pipelines,
+# so the daemon loads one project at a time.
+_LOAD_LOCK = threading.Lock()
+
+
+def get_project_key(
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+) -> str:
+    """A key identifying a project with the environment and pipeline to visualise,
+    and how it's loaded, made of the project's directory name to be readable in URLs.
+    """
+    project_path = project_path.resolve()
+    options = (project_path, env, pipeline_name, lazy_catalog, static_pipelines)
+    digest = hashlib.sha256(":".join(map(str, options)).encode("utf-8")).hexdigest()[:8]
+    name = re.sub(r"[^\w.-]", "-", project_path.name)
+    return f"{name}-{digest}"
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class HostedProject:
+    """Represent a Kedro project hosted by the daemon"""
+
+    key: str
+    project_path: Path
+    env: Optional[str]
+    pipeline_name: Optional[str]
+    data_access_manager: DataAccessManager
+    startup_status: StartupStatus
+    app: FastAPI
+
+    # how the project is loaded, as with the options of `kedro viz`
+    lazy_catalog: bool = False
+    static_pipelines: bool = False
+
+    # the managers of the other Kedro environments, if several are hosted
+    env_data_access_managers: Dict[str, DataAccessManager] = field(default_factory=dict)
+
+    # the memory taken by the project once it's loaded, in bytes,
+    # estimated from the size of its graph
+    size: int = 0
+
+    # the names of the project's own modules, imported while loading it
+    modules: Set[str] = field(default_factory=set)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The description of the hosted project returned by the daemon's API."""
+        return {
+            "key": self.key,
+            "project_path": str(self.project_path),
+            "env": self.env,
+            "pipeline_name": self.pipeline_name,
+            "status": self.startup_status.as_dict()["status"],
+            "size": self.size,
+            "url": f"{_PROJECTS_PREFIX}{self.key}/",
+        }
+
+
+def _load_isolated(project: HostedProject):
+    """Load a project without leaving its modules or source directory behind,
+    so that another project with a package of the same name can be loaded later.
+    The project's objects keep references to the modules they need.
+    """
+    project_dir = f"{project.project_path.resolve()}{os.sep}"
+    with _LOAD_LOCK:
+        sys_path = list(sys.path)
+        modules = set(sys.modules)
+        try:
+            load_project(
+                project.data_access_manager,
+                project.startup_status,
+                project.project_path,
+                project.env,
+                project.pipeline_name,
+                env_data_access_managers=project.env_data_access_managers,
+                lazy_catalog=project.lazy_catalog,
+                static_pipelines=project.static_pipelines,
+            )
+        finally:
+            sys.path[:] = sys_path
+            for name in set(sys.modules) - modules:
+                module_file = getattr(sys.modules[name], "__file__", None) or ""
+                if module_file.startswith(project_dir):
+                    project.modules.add(name)
+                    del sys.modules[name]
+
+
+class ProjectRegistry:
+    """Keep the projects hosted by the daemon, from least to most recently used.
+    Once the estimated memory of the loaded projects exceeds the budget,
+    the least recently used ones are evicted.
+    """
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self._lock = threading.Lock()
+        self._projects: "OrderedDict[str, HostedProject]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[HostedProject]:
+        """Get a hosted project, marking it as the most recently used."""
+        with self._lock:
+            project = self._projects.get(key)
+            if project is not None:
+                self._projects.move_to_end(key)
+            return project
+
+    def add(
+        self,
+        project_path: Path,
+        env: Optional[str] = None,
+        pipeline_name: Optional[str] = None,
+        lazy_catalog: bool = False,
+        static_pipelines: bool = False,
+    ) -> HostedProject:
+        """Host a project, loading it in the background, unless it's already hosted."""
+        key = get_project_key(
+            project_path, env, pipeline_name, lazy_catalog, static_pipelines
+        )
+        with self._lock:
+            project = self._projects.get(key)
+            if project is not None and not project.startup_status.has_failed:
+                self._projects.move_to_end(key)
+                return project
+
+            manager = DataAccessManager()
+            startup_status = StartupStatus()
+            env_managers: Dict[str, DataAccessManager] = {}
+            project = HostedProject(
+                key=key,
+                project_path=project_path,
+                env=env,
+                pipeline_name=pipeline_name,
+                data_access_manager=manager,
+                startup_status=startup_status,
+                app=apps.create_api_app_from_project(
+                    project_path, startup_status, manager, env_managers
+                ),
+                env_data_access_managers=env_managers,
+                lazy_catalog=lazy_catalog,
+                static_pipelines=static_pipelines,
+            )
+            self._projects[key] = project
+
+        threading.Thread(
+            target=self._load,
+            args=(project,),
+            name=f"kedro-viz-load-{key}",
+            daemon=True,
+        ).start()
+        return project
+
+    def _load(self, project: HostedProject):
+        _load_isolated(project)
+        project.size = _MEMORY_PER_JSON_BYTE * len(
+            responses.get_encoded_default_response(
+                manager=project.data_access_manager
+            ).content
+        )
+        self.evict()
+
+    def remove(self, key: str) -> bool:
+        """Stop hosting a project, returning whether it was hosted."""
+        with self._lock:
+            return self._projects.pop(key, None) is not None
+
+    def evict(self) -> List[str]:
+        """Evict the least recently used projects until the loaded ones fit
+        in the memory budget. The most recently used project is never evicted,
+        nor are the projects still loading.
+        Return the keys of the evicted projects.
+        """
+        evicted = []
+        with self._lock:
+            total_size = sum(project.size for project in self._projects.values())
+            for key, project in list(self._projects.items())[:-1]:
+                if total_size <= self.memory_budget:
+                    break
+                if not project.startup_status.is_ready:
+                    continue
+                total_size -= self._projects.pop(key).size
+                evicted.append(key)
+        return evicted
+
+    def as_list(self) -> List[HostedProject]:
+        """The hosted projects, from the least to the most recently used."""
+        with self._lock:
+            return list(self._projects.values())
+
+
+class DaemonApp:
+    """An ASGI app routing `/projects/<key>/...` to the app of the hosted project
+    with that key, and everything else to the daemon's own API.
+    """
+
+    def __init__(self, registry: ProjectRegistry, token: str):
+        self.registry = registry
+        self.api = _create_daemon_api(registry, token)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(_PROJECTS_PREFIX):
+            key, slash, path = scope["path"][len(_PROJECTS_PREFIX) :].partition("/")
+            project = self.registry.get(key)
+            if project is not None:
+                if not slash:
+                    # the web app requests the API and static files relative to its URL
+                    response = RedirectResponse(f"{_PROJECTS_PREFIX}{key}/")
+                    await response(scope, receive, send)
+                    return
+                scope = dict(
+                    scope,
+                    path=f"/{path}",
+                    root_path=f"{scope.get('root_path', '')}{_PROJECTS_PREFIX}{key}",
+                )
+                await project.app(scope, receive, send)
+                return
+        await self.api(scope, receive, send)
+
+
+class ProjectAPIRequest(BaseModel):
+    """The project to host, as posted to `/daemon/projects`"""
+
+    project_path: str
+    env: Optional[str] = None
+    pipeline_name: Optional[str] = None
+    lazy_catalog: bool = False
+    static_pipelines: bool = False
+
+
+def _create_daemon_api(registry: ProjectRegistry, token: str) -> FastAPI:
+    def check_token(x_kedro_viz_token: str = Header("")):
+        # any local process could otherwise make the daemon import and run
+        # the code of an arbitrary project
+        if not secrets.compare_digest(x_kedro_viz_token, token):
+            raise HTTPException(status_code=403, detail="Invalid token")
+
+    api = FastAPI(
+        title="Kedro-Viz daemon",
+        description="Host the pipelines of several Kedro projects",
+        version=__version__,
+        dependencies=[Depends(check_token)],
+    )
+
+    @api.get("/daemon/projects")
+    async def list_projects():
+        return [project.as_dict() for project in registry.as_list()]
+
+    @api.post("/daemon/projects")
+    async def add_project(project_request: ProjectAPIRequest):
+        project = registry.add(
+            Path(project_request.project_path),
+            project_request.env,
+            project_request.pipeline_name,
+            project_request.lazy_catalog,
+            project_request.static_pipelines,
+        )
+        return project.as_dict()
+
+    @api.delete("/daemon/projects/{key}")
+    async def remove_project(key: str):
+        if not registry.remove(key):
+            return JSONResponse(status_code=404, content={"message": "Invalid key"})
+        return {"key": key}
+
+    return api
+
+
+def run_daemon(
+    host: str = _DEFAULT_HOST,
+    port: int = _DEFAULT_PORT,
+    memory_budget: int = _DEFAULT_MEMORY_BUDGET_MB,
+):
+    """Run the daemon until it's stopped, advertising its address and the token
+    required by its API, so that subsequent `kedro viz` calls attach to it.
+
+    Args:
+        host: the host to launch the daemon
+        port: the port to launch the daemon
+        memory_budget: the memory budget for the hosted projects, in MB
+    """
+    registry = ProjectRegistry(memory_budget * 1024 * 1024)
+    token = secrets.token_urlsafe(32)
+    _DAEMON_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _DAEMON_STATE_FILE.touch(mode=0o600)
+    _DAEMON_STATE_FILE.chmod(0o600)
+    _DAEMON_STATE_FILE.write_text(
+        json.dumps({"host": host, "port": port, "pid": os.getpid(), "token": token})
+    )
+    try:
+        uvicorn.run(DaemonApp(registry, token), host=host, port=port)
+    finally:
+        if _DAEMON_STATE_FILE.exists():
+            _DAEMON_STATE_FILE.unlink()
+
+
+def _read_daemon_state() -> Optional[Tuple[str, str]]:
+    """The URL and the API token of the daemon, as advertised in its state file,
+    or None if no daemon has advertised itself.
+    """
+    try:
+        state = json.loads(_DAEMON_STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    host = "127.0.0.1" if state["host"] == "0.0.0.0" else state["host"]
+    return f"http://{host}:{state['port']}", state.get("token", "")
+
+
+def _request_daemon(
+    daemon_url: str, token: str, data: Optional[Dict[str, Any]] = None
+) -> Optional[Any]:
+    """Request the projects of the daemon, posting one if given.
+    Return the response, or None if the daemon isn't running anymore.
+    """
+    project_request = urllib_request.Request(
+        f"{daemon_url}/daemon/projects",
+        data=None if data is None else json.dumps(data).encode("utf-8"),
+        headers={"Content-Type": "application/json", _TOKEN_HEADER: token},
+        method="GET" if data is None else "POST",
+    )
+    try:
+        with urllib_request.urlopen(project_request, timeout=5) as response:
+            return json.load(response)
+    except (URLError, OSError, ValueError):
+        return None
+
+
+def find_daemon() -> Optional[str]:
+    """Return the URL of the running daemon, or None if no daemon is running."""
+    state = _read_daemon_state()
+    if state is None or _request_daemon(*state) is None:
+        return None
+    return state[0]
+
+
+def attach(
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+) -> Optional[str]:
+    """Ask the running daemon to host a project.
+    Return the URL where the project is served, or None if no daemon is running.
+    """
+    state = _read_daemon_state()
+    if state is None:
+        return None
+    daemon_url, token = state
+    project = _request_daemon(
+        daemon_url,
+        token,
+        {
+            "project_path": str(project_path.resolve()),
+            "env": env,
+            "pipeline_name": pipeline_name,
+            "lazy_catalog": lazy_catalog,
+            "static_pipelines": static_pipelines,
+        },
+    )
+    return None if project is None else f"{daemon_url}{project['url']}"
@@ -26,10 +26,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """`kedro_viz.data_access.managers` defines data access managers."""
-from collections import defaultdict
-from typing import Dict, List, Union
+import copy
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Union, cast
 
-from kedro.io import DataCatalog
+from kedro.io import AbstractDataSet, DataCatalog
 from kedro.pipeline import Pipeline as KedroPipeline
 from kedro.pipeline.node import Node as KedroNode
 
@@ -37,15 +40,20 @@ from kedro_viz.models.graph import (
     DataNode,
     GraphEdge,
     GraphNode,
+    GraphNodeType,
     ParametersNode,
     RegisteredPipeline,
     TaskNode,
+    is_lazy_dataset,
 )
+from kedro_viz.services import layers_services
+from kedro_viz.services.profiler import startup_profiler
 
 from .repositories import (
     CatalogRepository,
     GraphEdgesRepository,
     GraphNodesRepository,
+    GraphVersionsRepository,
     LayersRepository,
     ModularPipelinesRepository,
     RegisteredPipelinesRepository,
@@ -53,6 +61,23 @@ from .repositories import (
 )
 
 
+def _describe_dataset(dataset: Optional[AbstractDataSet]) -> Any:
+    """Describe a dataset, to tell whether it's configured the same in two catalogs.
+    A dataset of a lazy catalog is described by its configuration,
+    so that it isn't instantiated.
+    """
+    if dataset is None:
+        return None
+    if is_lazy_dataset(dataset):
+        return cast(Any, dataset).config
+    return type(dataset), dataset._describe()  # pylint: disable=protected-access
+
+
+def _load_parameters(dataset: Optional[AbstractDataSet]) -> Any:
+    # parameters datasets only describe the type of their value
+    return None if dataset is None else dataset.load()
+
+
 # pylint: disable=too-many-instance-attributes,missing-function-docstring
 class DataAccessManager:
     """Centralised interface for the rest of the application to interact with data repositories."""
@@ -67,20 +92,292 @@ class DataAccessManager:
         self.node_dependencies = defaultdict(set)
         self.layers = LayersRepository()
 
+        # a counter bumped whenever the repositories change,
+        # so that derived data such as cached API responses can be invalidated.
+        self.revision = 0
+
+        # the most recent versions of the serialised graph,
+        # kept across revisions so that clients can fetch what changed since theirs.
+        self.graph_versions = GraphVersionsRepository()
+
+        # the precomputed metadata of the nodes restored from a snapshot,
+        # whose underlying Kedro objects only exist in the process that loaded them.
+        self.node_metadata: Dict[str, Dict[str, Any]] = {}
+
+        # loads the project into a new manager, so that the metadata of the nodes
+        # restored from a snapshot without it can be computed from their Kedro objects.
+        self.live_loader: Optional[Callable[[], "DataAccessManager"]] = None
+        self._live_manager: Optional["DataAccessManager"] = None
+        self._live_lock = threading.Lock()
+
+        # the registered pipelines whose nodes aren't added yet, which are populated
+        # on their first request or in the background, while the API reads the
+        # repositories. They are only changed, and read meanwhile, holding the lock.
+        self.pending_pipelines: Dict[str, KedroPipeline] = OrderedDict()
+        self.lock = threading.RLock()
+
     def add_catalog(self, catalog: DataCatalog):
         self.catalog.set_catalog(catalog)
+        self.revision += 1
+
+    def for_catalog(self, catalog: DataCatalog) -> "DataAccessManager":
+        """Create a manager for the same pipelines read with another catalog,
+        e.g. the one of another Kedro environment. The edges, registered pipelines,
+        tags and modular pipelines don't depend on the catalog, so they are shared
+        with the new manager, as are the nodes. Only the data and parameters nodes
+        configured differently in the new catalog are rebuilt, along with the task
+        nodes taking these parameters. As the repositories are shared, the pipelines
+        still pending are populated first. The layers must be set on the new manager
+        afterwards.
+        """
+        with self.lock:
+            self.populate_pending_pipelines()
+            return self._for_catalog(catalog)
+
+    def _for_catalog(self, catalog: DataCatalog) -> "DataAccessManager":
+        manager = DataAccessManager()
+        manager.add_catalog(catalog)
+        manager.edges = self.edges
+        manager.node_dependencies = self.node_dependencies
+        manager.registered_pipelines = self.registered_pipelines
+        manager.tags = self.tags
+        manager.modular_pipelines = self.modular_pipelines
+        manager.lock = self.lock
+
+        rebuilt_nodes: Dict[str, GraphNode] = {}
+        parameters_nodes: Dict[str, ParametersNode] = {}
+        for node in self.nodes.as_list():
+            if isinstance(node, TaskNode):
+                continue
+            dataset = manager.catalog.get_dataset(node.full_name)
+            layer = manager.catalog.get_layer_for_dataset(node.full_name)
+            if isinstance(node, ParametersNode):
+                parameters_node = node
+                if (layer, _load_parameters(dataset)) != (
+                    node.layer,
+                    _load_parameters(cast(AbstractDataSet, node.kedro_obj)),
+                ):
+                    parameters_node = GraphNode.create_parameters_node(
+                        full_name=node.full_name,
+                        layer=layer,
+                        tags=node.tags,
+                        parameters=dataset,
+                    )
+                    rebuilt_nodes[node.id] = parameters_node
+                parameters_nodes[node.full_name] = parameters_node
+            elif (layer, _describe_dataset(dataset)) != (
+                node.layer,
+                _describe_dataset(node.kedro_obj),
+            ):
+                rebuilt_nodes[node.id] = GraphNode.create_data_node(
+                    full_name=node.full_name,
+                    layer=layer,
+                    tags=node.tags,
+                    dataset=dataset,
+                    is_free_input=cast(DataNode, node).is_free_input,
+                )
+
+        # the parameters are added in the order of the task inputs,
+        # as they are when the pipelines are first added
+        task_mask = self.nodes.get_mask(node_type=GraphNodeType.TASK.value)
+        for node in self.nodes.get_nodes_by_mask(task_mask):
+            inputs = cast(KedroNode, node.kedro_obj).inputs
+            if not any(
+                parameters_nodes[input_].id in rebuilt_nodes
+                for input_ in inputs
+                if input_ in parameters_nodes
+            ):
+                continue
+            task_node = copy.copy(cast(TaskNode, node))
+            task_node.parameters = {}
+            for input_ in inputs:
+                if input_ in parameters_nodes:
+                    self.add_parameters_to_task_node(
+                        parameters_node=parameters_nodes[input_],
+                        task_node=task_node,
+                    )
+            rebuilt_nodes[node.id] = task_node
+
+        for node_id, graph_node in rebuilt_nodes.items():
+            node = cast(GraphNode, self.nodes.get_node_by_id(node_id))
+            graph_node.pipelines = node.pipelines
+            graph_node.modular_pipelines = node.modular_pipelines
+        manager.nodes = self.nodes.with_nodes(rebuilt_nodes.values())
+        return manager
+
+    def create_snapshot(
+        self, node_metadata: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Create a snapshot of the populated repositories made of plain JSON types,
+        from which `add_snapshot` can rebuild them in another process without importing
+        the Kedro project. As the snapshot holds no Kedro objects, the metadata
+        of the nodes must be computed beforehand and given by node ID.
+        """
+        nodes = []
+        for node in self.nodes.as_list():
+            record: Dict[str, Any] = {
+                "id": node.id,
+                "name": node.name,
+                "full_name": node.full_name,
+                "tags": sorted(node.tags),
+                "pipelines": list(node.pipelines),
+                "modular_pipelines": list(node.modular_pipelines),
+                "type": node.type,
+            }
+            if isinstance(node, TaskNode):
+                record["parameters"] = node.parameters
+            else:
+                record["layer"] = node.layer
+            if isinstance(node, DataNode):
+                record["dataset_type"] = node.dataset_type
+                record["is_free_input"] = node.is_free_input
+            nodes.append(record)
+
+        return {
+            "nodes": nodes,
+            "edges": [[edge.source, edge.target] for edge in self.edges.as_list()],
+            "registered_pipelines": [
+                [
+                    pipeline.id,
+                    sorted(
+                        self.registered_pipelines.get_node_ids_by_pipeline_id(
+                            pipeline.id
+                        )
+                    ),
+                ]
+                for pipeline in self.registered_pipelines.as_list()
+            ],
+            "tags": [tag.id for tag in self.tags.as_list()],
+            "modular_pipelines": [
+                pipeline.id for pipeline in self.modular_pipelines.as_list()
+            ],
+            "layers": self.layers.as_list(),
+            "node_metadata": node_metadata or {},
+        }
+
+    def get_live_node(self, node: GraphNode) -> GraphNode:
+        """Return the node with the same ID that holds its underlying Kedro object,
+        if the given one was restored from a snapshot and the manager has a live loader.
+        The project is only loaded by the first call. Otherwise, return the given node.
+        """
+        live_loader = self.live_loader
+        if live_loader is None or node.kedro_obj is not None:
+            return node
+        with self._live_lock:
+            if self._live_manager is None:
+                self._live_manager = live_loader()  # pylint: disable=not-callable
+        return self._live_manager.nodes.get_node_by_id(node.id) or node
+
+    def add_snapshot(self, snapshot: Dict[str, Any]):
+        """Populate the repositories from a snapshot created by `create_snapshot`."""
+        for record in snapshot["nodes"]:
+            self.nodes.add_node(self._restore_node(record))
+        for source, target in snapshot["edges"]:
+            self.edges.add_edge(GraphEdge(source=source, target=target))
+            self.node_dependencies[source].add(target)
+        for pipeline_id, node_ids in snapshot["registered_pipelines"]:
+            self.registered_pipelines.add_pipeline(pipeline_id)
+            for node_id in node_ids:
+                self.registered_pipelines.add_node(pipeline_id, node_id)
+        self.tags.add_tags(snapshot["tags"])
+        self.modular_pipelines.add_modular_pipeline(snapshot["modular_pipelines"])
+        self.layers.set_layers(snapshot["layers"])
+        self.node_metadata = snapshot["node_metadata"]
+        self.revision += 1
+
+    @staticmethod
+    def _restore_node(record: Dict[str, Any]) -> GraphNode:
+        graph_node: GraphNode
+        common: Dict[str, Any] = {
+            "id": record["id"],
+            "name": record["name"],
+            "full_name": record["full_name"],
+            "tags": record["tags"],
+            "pipelines": record["pipelines"],
+            "kedro_obj": None,
+        }
+        if record["type"] == GraphNodeType.TASK.value:
+            task_node = TaskNode(**common)
+            task_node.parameters = record["parameters"]
+            graph_node = task_node
+        elif record["type"] == GraphNodeType.DATA.value:
+            data_node = DataNode(
+                **common, layer=record["layer"], is_free_input=record["is_free_input"]
+            )
+            data_node.dataset_type = record["dataset_type"]
+            graph_node = data_node
+        else:
+            graph_node = ParametersNode(**common, layer=record["layer"])
+        graph_node.modular_pipelines = tuple(record["modular_pipelines"])
+        return graph_node
+
+    def add_pipelines(self, pipelines: Dict[str, KedroPipeline], lazy: bool = False):
+        """Add the registered pipelines to the repositories. If `lazy` is set, only the
+        default selected pipeline is populated: the others are registered, but their
+        nodes are only added by `populate_pipeline` or `populate_pending_pipelines`.
+        """
+        if lazy and pipelines:
+            for pipeline_key in pipelines:
+                self.registered_pipelines.add_pipeline(pipeline_key)
+            selected_pipeline_id = self.get_default_selected_pipeline().id
+            with self.lock:
+                self.pending_pipelines.update(
+                    (pipeline_key, pipeline)
+                    for pipeline_key, pipeline in pipelines.items()
+                    if pipeline_key != selected_pipeline_id
+                )
+            pipelines = {selected_pipeline_id: pipelines[selected_pipeline_id]}
 
-    def add_pipelines(self, pipelines: Dict[str, KedroPipeline]):
         for pipeline_key, pipeline in pipelines.items():
-            self.add_pipeline(pipeline_key, pipeline)
+            with startup_profiler.item("pipelines", pipeline_key):
+                self.add_pipeline(pipeline_key, pipeline)
 
         # After adding the pipelines, we will have to manually go through parameters nodes
         # to remove non-modular pipelines that we infer from the parameters' name.
         # The reason is because we only know the complete list of valid modular pipelines
         # after iterating through all task and data nodes.
         self._remove_non_modular_pipelines()
+        self.revision += 1
+
+    def populate_pipeline(self, pipeline_id: str, update_layers: bool = True):
+        """Add the nodes of a registered pipeline if it is still pending, e.g. on its
+        first request. The nodes shared with the populated pipelines are reused,
+        and the modular pipelines of the parameters and the layers are recomputed.
+        If `update_layers` is unset, the layers are only sorted again once the last
+        pending pipeline is populated, e.g. when populating them all in turn.
+        """
+        if pipeline_id not in self.pending_pipelines:
+            return
+        with self.lock:
+            pipeline = self.pending_pipelines.pop(pipeline_id, None)
+            if pipeline is None:
+                return
+            with startup_profiler.item("pipelines", pipeline_id):
+                self.add_pipeline(pipeline_id, pipeline)
+            self._remove_non_modular_pipelines()
+            if update_layers or not self.pending_pipelines:
+                self.set_layers(
+                    layers_services.sort_layers(
+                        self.nodes.as_dict(), self.node_dependencies
+                    )
+                )
+
+    def populate_pending_pipelines(self, interval: float = 0.0):
+        """Populate the pending pipelines one at a time, e.g. in a background thread.
+        The lock is released for the given interval after each one, so that the API
+        requests reading the repositories meanwhile wait for one pipeline at most.
+        """
+        while True:
+            with self.lock:
+                if not self.pending_pipelines:
+                    return
+                self.populate_pipeline(
+                    next(iter(self.pending_pipelines)), update_layers=False
+                )
+            time.sleep(interval)
 
     def add_pipeline(self, pipeline_key: str, pipeline: KedroPipeline):
+        self.revision += 1
         self.registered_pipelines.add_pipeline(pipeline_key)
         free_inputs = pipeline.inputs()
         for node in sorted(pipeline.nodes, key=lambda n: n.name):
@@ -100,7 +397,7 @@ class DataAccessManager:
 
     def add_node(self, pipeline_key: str, node: KedroNode) -> TaskNode:
         task_node: TaskNode = self.nodes.add_node(GraphNode.create_task_node(node))
-        task_node.add_pipeline(pipeline_key)
+        self.nodes.add_node_to_pipeline(task_node, pipeline_key)
         self.tags.add_tags(task_node.tags)
         self.modular_pipelines.add_modular_pipeline(task_node.modular_pipelines)
         return task_node
@@ -115,7 +412,7 @@ class DataAccessManager:
         graph_node = self.add_dataset(
             pipeline_key, input_dataset, is_free_input=is_free_input
         )
-        graph_node.tags.update(task_node.tags)
+        graph_node.add_tags(task_node.tags)
         self.edges.add_edge(GraphEdge(source=graph_node.id, target=task_node.id))
         self.node_dependencies[graph_node.id].add(task_node.id)
 
@@ -129,7 +426,7 @@ class DataAccessManager:
         self, pipeline_key: str, output_dataset: str, task_node: TaskNode
     ) -> Union[DataNode, ParametersNode]:
         graph_node = self.add_dataset(pipeline_key, output_dataset)
-        graph_node.tags.update(task_node.tags)
+        graph_node.add_tags(task_node.tags)
         self.edges.add_edge(GraphEdge(source=task_node.id, target=graph_node.id))
         self.node_dependencies[task_node.id].add(graph_node.id)
         return graph_node
@@ -144,20 +441,20 @@ class DataAccessManager:
             graph_node = GraphNode.create_parameters_node(
                 full_name=dataset_name,
                 layer=layer,
-                tags=set(),
+                tags=(),
                 parameters=obj,
             )
         else:
             graph_node = GraphNode.create_data_node(
                 full_name=dataset_name,
                 layer=layer,
-                tags=set(),
+                tags=(),
                 dataset=obj,
                 is_free_input=is_free_input,
             )
             self.modular_pipelines.add_modular_pipeline(graph_node.modular_pipelines)
         graph_node = self.nodes.add_node(graph_node)
-        graph_node.add_pipeline(pipeline_key)
+        self.nodes.add_node_to_pipeline(graph_node, pipeline_key)
         return graph_node
 
     @staticmethod
@@ -180,14 +477,18 @@ class DataAccessManager:
         )
 
     def _remove_non_modular_pipelines(self):
-        for node in self.nodes.nodes_list:
-            if isinstance(node, ParametersNode):
-                pipes = [
-                    pipe
-                    for pipe in node.modular_pipelines
-                    if self.modular_pipelines.has_modular_pipeline(pipe)
-                ]
-                node.modular_pipelines = sorted(pipes)
+        parameters_mask = self.nodes.get_mask(node_type=GraphNodeType.PARAMETERS.value)
+        for node in self.nodes.get_nodes_by_mask(parameters_mask):
+            node = cast(ParametersNode, node)
+            # inferred again, as the pipelines populated later may add
+            # the modular pipelines that were removed
+            pipes = [
+                pipe
+                for pipe in node.infer_modular_pipelines()
+                if self.modular_pipelines.has_modular_pipeline(pipe)
+            ]
+            self.nodes.set_modular_pipelines(node, sorted(pipes))
 
     def set_layers(self, layers: List[str]):
         self.layers.set_layers(layers)
+        self.revision += 1
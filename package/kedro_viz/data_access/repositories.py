@@ -28,7 +28,7 @@
 """`kedro_viz.data_access.repositories` defines repositories to save and load application data."""
 # pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
 from collections import OrderedDict, defaultdict
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Set
 
 import kedro
 from kedro.io import AbstractDataSet, DataCatalog, DataSetNotFoundError
@@ -45,20 +45,110 @@ from kedro_viz.models.graph import (
 _KEDRO_VERSION = VersionInfo.parse(kedro.__version__)
 
 
+def _set_bit(bitset: bytearray, index: int):
+    byte = index >> 3
+    if byte >= len(bitset):
+        bitset.extend(bytes(byte + 1 - len(bitset)))
+    bitset[byte] |= 1 << (index & 7)
+
+
+def _clear_bit(bitset: bytearray, index: int):
+    byte = index >> 3
+    if byte < len(bitset):
+        bitset[byte] &= ~(1 << (index & 7))
+
+
+def _to_mask(bitset: Optional[bytearray]) -> int:
+    return int.from_bytes(bitset, "little") if bitset else 0
+
+
+def _indices_of_mask(mask: int) -> List[int]:
+    """Return the indices of the bits set in a mask, in ascending order."""
+    # the binary representation is reversed so that the string index is the bit index
+    bits = bin(mask)[:1:-1]
+    indices = []
+    index = bits.find("1")
+    while index != -1:
+        indices.append(index)
+        index = bits.find("1", index + 1)
+    return indices
+
+
 class GraphNodesRepository:
+    """Store the graph nodes in insertion order, each one under a dense integer index,
+    i.e. its position in `nodes_list`. The registered pipelines, modular pipelines
+    and types are mapped to the bitset of the indices of their nodes, so that
+    filtering the nodes is a matter of combining masks. As the nodes' memberships
+    are indexed, they must be changed through the repository once a node is added.
+
+    The bitsets are kept as bytearrays, in which a bit is set in place as the nodes
+    are added, and only turned into integer masks, i.e. Python ints, when filtering.
+    """
+
     def __init__(self):
         self.nodes_dict: Dict[str, GraphNode] = {}
         self.nodes_list: List[GraphNode] = []
+        self.indices: Dict[str, int] = {}
+
+        # the bitsets of the nodes by membership, where bit i is set for the node at index i
+        self.pipelines_bitsets: DefaultDict[str, bytearray] = defaultdict(bytearray)
+        self.modular_pipelines_bitsets: DefaultDict[str, bytearray] = defaultdict(
+            bytearray
+        )
+        self.types_bitsets: DefaultDict[str, bytearray] = defaultdict(bytearray)
 
     def has_node(self, node: GraphNode) -> bool:
         return node.id in self.nodes_dict
 
     def add_node(self, node: GraphNode) -> GraphNode:
         if not self.has_node(node):
+            index = len(self.nodes_list)
             self.nodes_dict[node.id] = node
             self.nodes_list.append(node)
+            self.indices[node.id] = index
+            _set_bit(self.types_bitsets[node.type], index)  # type: ignore
+            for pipeline_id in node.pipelines:
+                _set_bit(self.pipelines_bitsets[pipeline_id], index)
+            for modular_pipeline_id in node.modular_pipelines:
+                _set_bit(self.modular_pipelines_bitsets[modular_pipeline_id], index)
         return self.nodes_dict[node.id]
 
+    def add_node_to_pipeline(self, node: GraphNode, pipeline_id: str):
+        node.add_pipeline(pipeline_id)
+        _set_bit(self.pipelines_bitsets[pipeline_id], self.indices[node.id])
+
+    def set_modular_pipelines(
+        self, node: GraphNode, modular_pipeline_ids: Iterable[str]
+    ):
+        index = self.indices[node.id]
+        for modular_pipeline_id in node.modular_pipelines:
+            _clear_bit(self.modular_pipelines_bitsets[modular_pipeline_id], index)
+        node.modular_pipelines = tuple(modular_pipeline_ids)
+        for modular_pipeline_id in node.modular_pipelines:
+            _set_bit(self.modular_pipelines_bitsets[modular_pipeline_id], index)
+
+    def with_nodes(self, nodes: Iterable[GraphNode]) -> "GraphNodesRepository":
+        """Create a repository of the same nodes, in the same order, except for
+        the given ones, which replace the nodes with their IDs and must have their
+        memberships. The other nodes are shared with this repository.
+        """
+        repository = GraphNodesRepository()
+        repository.nodes_dict = dict(self.nodes_dict)
+        repository.nodes_list = list(self.nodes_list)
+        repository.indices = dict(self.indices)
+        for bitsets, own_bitsets in (
+            (repository.pipelines_bitsets, self.pipelines_bitsets),
+            (repository.modular_pipelines_bitsets, self.modular_pipelines_bitsets),
+            (repository.types_bitsets, self.types_bitsets),
+        ):
+            bitsets.update(
+                (key, bytearray(bitset)) for key, bitset in own_bitsets.items()
+            )
+        for node in nodes:
+            repository.nodes_dict[node.id] = node
+            repository.nodes_list[self.indices[node.id]] = node
+        return repository
+
     def get_node_by_id(self, node_id: str) -> Optional[GraphNode]:
         return self.nodes_dict.get(node_id, None)
 
@@ -69,18 +159,51 @@ class GraphNodesRepository:
         return self.nodes_dict
 
     def get_nodes_by_ids(self, node_ids: Set[str]) -> List[GraphNode]:
-        return [n for n in self.nodes_list if n.id in node_ids]
+        indices = sorted(
+            self.indices[node_id] for node_id in node_ids if node_id in self.indices
+        )
+        return [self.nodes_list[index] for index in indices]
+
+    def get_mask(
+        self,
+        pipeline_id: Optional[str] = None,
+        node_type: Optional[str] = None,
+    ) -> int:
+        """Return the mask of the nodes matching all the given memberships."""
+        mask = (1 << len(self.nodes_list)) - 1
+        for bitsets, key in (
+            (self.pipelines_bitsets, pipeline_id),
+            (self.types_bitsets, node_type),
+        ):
+            if key is not None:
+                mask &= _to_mask(bitsets.get(key))
+        return mask
+
+    def get_nodes_by_mask(self, mask: int) -> List[GraphNode]:
+        return [self.nodes_list[index] for index in _indices_of_mask(mask)]
+
+    def get_modular_pipelines_by_mask(self, mask: int) -> List[str]:
+        """Return the modular pipelines that any of the nodes of a mask belongs to."""
+        return [
+            modular_pipeline_id
+            for modular_pipeline_id, bitset in self.modular_pipelines_bitsets.items()
+            if _to_mask(bitset) & mask
+        ]
 
 
 class GraphEdgesRepository:
     def __init__(self):
-        self.edges_list: Set[GraphEdge] = set()
+        # edges are kept in insertion order so they can be paginated consistently
+        self.edges_set: Set[GraphEdge] = set()
+        self.edges_list: List[GraphEdge] = []
 
     def add_edge(self, edge: GraphEdge):
-        self.edges_list.add(edge)
+        if edge not in self.edges_set:
+            self.edges_set.add(edge)
+            self.edges_list.append(edge)
 
     def as_list(self) -> List[GraphEdge]:
-        return list(self.edges_list)
+        return self.edges_list
 
     def get_edges_by_node_ids(self, node_ids: Set[str]) -> List[GraphEdge]:
         return [e for e in self.edges_list if {e.source, e.target}.issubset(node_ids)]
@@ -190,6 +313,14 @@ class ModularPipelinesRepository:
             repo.add_modular_pipeline(node.modular_pipelines)
         return repo
 
+    @classmethod
+    def from_ids(
+        cls, modular_pipeline_ids: Iterable[str]
+    ) -> "ModularPipelinesRepository":
+        repo = cls()
+        repo.add_modular_pipeline(modular_pipeline_ids)
+        return repo
+
 
 class LayersRepository:
     def __init__(self):
@@ -211,3 +342,23 @@ class TagsRepository:
 
     def as_list(self) -> List[Tag]:
         return list(sorted(self.tags_set, key=lambda t: t.id))
+
+
+class GraphVersionsRepository:
+    def __init__(self, max_versions: int = 10):
+        # a summary of the most recent versions of the serialised graph, oldest first,
+        # holding only what is needed to compute the changes since each of them
+        self.max_versions = max_versions
+        self.versions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def add_version(self, version: str, summary: Dict[str, Any]):
+        self.versions[version] = summary
+        self.versions.move_to_end(version)
+        while len(self.versions) > self.max_versions:
+            self.versions.popitem(last=False)
+
+    def has_version(self, version: str) -> bool:
+        return version in self.versions
+
+    def get_version(self, version: str) -> Optional[Dict[str, Any]]:
+        return self.versions.get(version)
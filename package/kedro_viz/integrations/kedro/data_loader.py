@@ -29,17 +29,52 @@
 load data from a Kedro project. It takes care of making sure viz can
 load data from projects created in a range of Kedro versions.
 """
-# pylint: disable=import-outside-toplevel
+# pylint: disable=import-outside-toplevel,protected-access
+import copy
+import importlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from functools import partial
 from pathlib import Path
-from typing import Dict, Tuple, cast
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, cast
 
 from kedro import __version__
 from kedro.io import DataCatalog
+from kedro.io.core import AbstractDataSet
 from kedro.pipeline import Pipeline
 from semver import VersionInfo
 
+from kedro_viz.services.profiler import startup_profiler
+
+from .cache import CACHE_DIR, get_cache_dir
+from .lazy_catalog import create_lazy_catalog
+from .static_pipelines import extract_pipelines
+
 KEDRO_VERSION = VersionInfo.parse(__version__)
 
+logger = logging.getLogger(__name__)
+
+# Kedro parses each configuration file with `_load_config_file`, a static method of
+# the config loaders up to 0.17.3, and a function of one of these modules afterwards.
+_CONFIG_MODULES = (
+    "kedro.config.common",
+    "kedro.config.config",
+    "kedro.config.templated_config",
+)
+_CONFIG_LOADERS = ("ConfigLoader", "TemplatedConfigLoader")
+
+# the pattern of the credentials files and directories of an environment
+_CREDENTIALS_PATTERN = "credentials*"
+
+# the cached content of the configuration files, in a format whose version
+# is bumped whenever it changes
+_CONFIG_CACHE_FILE = "config.json"
+_CONFIG_CACHE_VERSION = 1
+
 
 def _bootstrap(project_path: Path):
     """Bootstrap the integration by running various Kedro bootstrapping methods
@@ -61,56 +96,387 @@ def _bootstrap(project_path: Path):
         return
 
 
+def _load_context(project_path: Path, env: Optional[str] = None):
+    """Load the context of a Kedro project for the given environment,
+    which must be bootstrapped first.
+    """
+    # Kedro types `env` as a string, and picks its default environment without one
+    env_kwargs: Dict[str, Any] = {} if env is None else {"env": env}
+    if KEDRO_VERSION.match(">=0.17.1"):
+        from kedro.framework.session import KedroSession
+
+        with startup_profiler.phase("create_session"):
+            session = KedroSession.create(
+                project_path=project_path, save_on_close=False, **env_kwargs
+            )
+        with startup_profiler.phase("load_context"):
+            return session.load_context()
+
+    if KEDRO_VERSION.match("==0.17.0"):
+        from kedro.framework.session import KedroSession
+        from kedro.framework.startup import _get_project_metadata
+
+        metadata = _get_project_metadata(project_path)
+        with startup_profiler.phase("create_session"):
+            session = KedroSession.create(
+                package_name=metadata.package_name,
+                project_path=project_path,
+                save_on_close=False,
+                **env_kwargs,
+            )
+        with startup_profiler.phase("load_context"):
+            return session.load_context()
+
+    # pre-0.17 load_context version
+    from kedro.framework.context import load_context
+
+    with startup_profiler.phase("load_context"):
+        return load_context(project_path=project_path, **env_kwargs)
+
+
+@contextmanager
+def _profile_datasets() -> Iterator[None]:
+    """Time the creation of each dataset of the catalogs created within the context,
+    if the startup profiler is enabled. `DataCatalog.from_config` creates them one
+    by one with `AbstractDataSet.from_config`, which is wrapped in the meantime.
+    """
+    if not startup_profiler.enabled:
+        yield
+        return
+
+    from_config = AbstractDataSet.__dict__["from_config"]
+
+    def profiled_from_config(cls, name, *args, **kwargs):
+        with startup_profiler.item("datasets", name):
+            return from_config.__func__(cls, name, *args, **kwargs)
+
+    AbstractDataSet.from_config = classmethod(profiled_from_config)  # type: ignore
+    try:
+        yield
+    finally:
+        AbstractDataSet.from_config = from_config  # type: ignore
+
+
+def _create_lazy_catalog(context) -> DataCatalog:
+    """Create the catalog of a Kedro context from its configuration alone, whose
+    datasets are only instantiated when they're used, unlike with `context.catalog`.
+    The `after_catalog_created` hooks aren't run for it.
+    """
+    from kedro.framework.context import context as kedro_context
+
+    conf_catalog = context.config_loader.get("catalog*", "catalog*/**", "**/catalog*")
+    # the relative paths are made absolute by Kedro from 0.16.5
+    convert_paths = getattr(kedro_context, "_convert_paths_to_absolute_posix", None)
+    if convert_paths is not None:
+        conf_catalog = convert_paths(
+            project_path=context.project_path, conf_dictionary=conf_catalog
+        )
+    return create_lazy_catalog(
+        conf_catalog, context._get_config_credentials, context._get_feed_dict()
+    )
+
+
+def _is_json_content(content: Any) -> bool:
+    """Whether some content is the same once read back from JSON, unlike e.g. the
+    dates or non-string keys that YAML can hold.
+    """
+    try:
+        return json.loads(json.dumps(content)) == content
+    except (TypeError, ValueError):
+        return False
+
+
+class _ConfigFileCache:
+    """The content of the configuration files parsed by Kedro, keyed by their path
+    and reused for as long as their modification time and size don't change.
+    It's kept as JSON in the project's cache directory, along with the versions
+    of its format and of Kedro, and ignored if either of them changed.
+    Credentials are never cached, so that they aren't copied out of `conf/`,
+    nor is the content that JSON can't hold as it is.
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path
+        self.conf_path = (project_path / "conf").resolve()
+        self.entries: Dict[Tuple[str, str], Tuple[int, int, Any]] = {}
+        self.changed = False
+
+    @property
+    def cache_path(self) -> Path:
+        """The path of the cache file, whose directory may not exist yet."""
+        return self.project_path / CACHE_DIR / _CONFIG_CACHE_FILE
+
+    @staticmethod
+    def _get_versions() -> Dict[str, Any]:
+        return {"version": _CONFIG_CACHE_VERSION, "kedro": str(KEDRO_VERSION)}
+
+    def load(self):
+        """Read the cached entries, if any."""
+        try:
+            with self.cache_path.open(encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+            if {
+                key: cache[key] for key in self._get_versions()
+            } != self._get_versions():
+                return
+            self.entries = {
+                (path, parser): (mtime, size, content)
+                for path, parser, mtime, size, content in cache["entries"]
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning(
+                "Ignoring the invalid config cache %s: %s", self.cache_path, exc
+            )
+
+    def save(self):
+        """Write the entries if they changed, dropping the ones of deleted files."""
+        if not self.changed:
+            return
+        cache = self._get_versions()
+        cache["entries"] = [
+            [path, parser, *entry]
+            for (path, parser), entry in self.entries.items()
+            if Path(path).exists()
+        ]
+        # written to a temporary file first, so that no process reads it half-written
+        cache_path = get_cache_dir(self.project_path) / _CONFIG_CACHE_FILE
+        temporary_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(temporary_path, cache_path)
+        self.changed = False
+
+    def is_credentials(self, path: Path) -> bool:
+        """Whether a configuration file holds credentials, i.e. matches the patterns
+        `credentials*` or `credentials*/**` of an environment. A file outside
+        `conf/` is treated as credentials if any of its parents matches.
+        """
+        try:
+            parts = path.relative_to(self.conf_path).parts
+        except ValueError:
+            parts = path.parts
+        return any(fnmatch(part, _CREDENTIALS_PATTERN) for part in parts)
+
+    def wrap(self, load_config_file: Callable) -> Callable:
+        """Wrap Kedro's function parsing a configuration file, so that it only parses
+        the files that aren't cached or changed since they were.
+        """
+        # e.g. `TemplatedConfigLoader` parses the files as Jinja2 templates
+        parser_name = f"{load_config_file.__module__}.{load_config_file.__qualname__}"
+
+        def cached_load_config_file(config_file, *args, **kwargs):
+            path = Path(config_file).resolve()
+            if self.is_credentials(path):
+                return load_config_file(config_file, *args, **kwargs)
+
+            stat_result = path.stat()
+            # e.g. whether the file is a Jinja2 template in some Kedro versions
+            key = (str(path), repr((parser_name, args, sorted(kwargs.items()))))
+            entry = self.entries.get(key)
+            if entry is None or entry[:2] != (
+                stat_result.st_mtime_ns,
+                stat_result.st_size,
+            ):
+                content = load_config_file(config_file, *args, **kwargs)
+                entry = (stat_result.st_mtime_ns, stat_result.st_size, content)
+                if _is_json_content(content):
+                    self.entries[key] = entry
+                    self.changed = True
+            # copied, as Kedro is free to change the content it is given
+            return copy.deepcopy(entry[2])
+
+        return cached_load_config_file
+
+
+def _find_config_file_parsers() -> List[Tuple[Any, Any]]:
+    """Find the `_load_config_file` attributes Kedro parses the configuration files
+    with, along with the module or config loader class they're defined on.
+    """
+    owners: List[Any] = []
+    for module_name in _CONFIG_MODULES:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        owners.append(module)
+        owners.extend(
+            loader
+            for loader in (vars(module).get(name) for name in _CONFIG_LOADERS)
+            if isinstance(loader, type) and loader.__module__ == module_name
+        )
+    return [
+        (owner, vars(owner)["_load_config_file"])
+        for owner in owners
+        if "_load_config_file" in vars(owner)
+    ]
+
+
+@contextmanager
+def cache_config_files(project_path: Path) -> Iterator[None]:
+    """Cache the content of the configuration files parsed by Kedro within the context
+    in the project's cache directory, so that only the files changed since the last
+    time are parsed again.
+    """
+    config_cache = _ConfigFileCache(project_path)
+    config_cache.load()
+
+    originals = _find_config_file_parsers()
+    if not originals:  # pragma: no cover
+        logger.debug("The configuration files can't be cached with this Kedro version")
+    for owner, load_config_file in originals:
+        if isinstance(load_config_file, staticmethod):
+            wrapped: Any = staticmethod(config_cache.wrap(load_config_file.__func__))
+        else:
+            wrapped = config_cache.wrap(load_config_file)
+        setattr(owner, "_load_config_file", wrapped)
+    try:
+        yield
+    finally:
+        for owner, load_config_file in originals:
+            setattr(owner, "_load_config_file", load_config_file)
+
+    try:
+        config_cache.save()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("Failed to cache the configuration of the project: %s", exc)
+
+
+def _create_catalog(context, lazy_catalog: bool) -> DataCatalog:
+    """Create the catalog of a Kedro project, or only from its configuration
+    if `lazy_catalog` is set.
+    """
+    if lazy_catalog:
+        with startup_profiler.phase("create_lazy_catalog"):
+            return _create_lazy_catalog(context)
+    with startup_profiler.phase("create_catalog"), _profile_datasets():
+        return context.catalog
+
+
+def _import_pipelines(context) -> Dict[str, Pipeline]:
+    """Get the registered pipelines of a Kedro project, importing their modules."""
+    if KEDRO_VERSION.match(">=0.17.3"):
+        from kedro.framework.project import pipelines
+
+        # Kedro only registers them on first access otherwise
+        return dict(pipelines)
+
+    return context.pipelines
+
+
+def _get_package_name(context) -> str:
+    """Get the name of the Python package of a Kedro project."""
+    if KEDRO_VERSION.match(">=0.17.3"):
+        from kedro.framework import project
+
+        # set by `configure_project` when the project is bootstrapped
+        return cast(str, getattr(project, "PACKAGE_NAME"))
+
+    return context.package_name
+
+
+def _get_pipelines(context, static_pipelines: bool = False) -> Dict[str, Pipeline]:
+    """Get the registered pipelines of a Kedro project, either by importing them,
+    or by extracting them statically from the source of the project.
+    """
+    with startup_profiler.phase("get_pipelines"):
+        if static_pipelines:
+            return extract_pipelines(
+                _get_package_name(context), partial(_import_pipelines, context)
+            )
+        return _import_pipelines(context)
+
+
 def load_data(
-    project_path: Path, env: str = None
+    project_path: Path,
+    env: Optional[str] = None,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
 ) -> Tuple[DataCatalog, Dict[str, Pipeline]]:
     """Load data from a Kedro project.
     Args:
         project_path: the path whether the Kedro project is located.
         env: the Kedro environment to load the data. If not provided.
             it will use Kedro default, which is local.
+        lazy_catalog: whether to create the catalog from its configuration alone,
+            only instantiating its datasets when they're used.
+        static_pipelines: whether to extract the pipelines from the source of the
+            project rather than importing them, as long as it can be analysed.
     Returns:
         A tuple containing the data catalog and the pipeline dictionary.
     """
-    _bootstrap(project_path)
+    catalogs, pipelines = load_data_for_envs(
+        project_path, [env], lazy_catalog, static_pipelines
+    )
+    return catalogs[env], pipelines
 
-    if KEDRO_VERSION.match(">=0.17.3"):
-        from kedro.framework.project import pipelines
-        from kedro.framework.session import KedroSession
 
-        session = KedroSession.create(
-            project_path=project_path, env=env, save_on_close=False
-        )
-        context = session.load_context()
-        return context.catalog, cast(Dict, pipelines)
-
-    if KEDRO_VERSION.match(">=0.17.1"):
-        from kedro.framework.session import KedroSession
-
-        session = KedroSession.create(
-            project_path=project_path, env=env, save_on_close=False
-        )
-
-        context = session.load_context()
-        return context.catalog, context.pipelines
+def load_data_for_envs(
+    project_path: Path,
+    envs: List[Optional[str]],
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+) -> Tuple[Dict[Optional[str], DataCatalog], Dict[str, Pipeline]]:
+    """Load data from a Kedro project for several environments. The pipelines
+    don't depend on the environment, so they are only loaded once.
+    Args:
+        project_path: the path whether the Kedro project is located.
+        envs: the Kedro environments to load the catalogs of. `None` stands
+            for Kedro default, which is local.
+        lazy_catalog: whether to create the catalogs from their configuration alone,
+            only instantiating their datasets when they're used.
+        static_pipelines: whether to extract the pipelines from the source of the
+            project rather than importing them, as long as it can be analysed.
+    Returns:
+        A tuple containing the data catalog of each environment
+        and the pipeline dictionary.
+    """
+    with startup_profiler.phase("bootstrap_project"):
+        _bootstrap(project_path)
 
-    if KEDRO_VERSION.match("==0.17.0"):
-        from kedro.framework.session import KedroSession
-        from kedro.framework.startup import _get_project_metadata
+    contexts: Dict[Optional[str], Any] = {}
+    pipelines_context = None
+    if KEDRO_VERSION.match("<0.17.3"):
+        # The pipelines are registered by the context in older versions. Its
+        # properties create new objects on each access, so that it also creates
+        # the catalog of its environment while the pipelines are registered.
+        pipelines_context = contexts[envs[0]] = _load_context(project_path, envs[0])
 
-        metadata = _get_project_metadata(project_path)
-        session = KedroSession.create(
-            package_name=metadata.package_name,
-            project_path=project_path,
-            env=env,
-            save_on_close=False,
+    # The pipelines are registered in another thread, importing the modules of
+    # their nodes while the catalogs are created.
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="kedro_viz_pipelines"
+    ) as executor:
+        future_pipelines = executor.submit(
+            startup_profiler.bind(_get_pipelines), pipelines_context, static_pipelines
         )
+        catalogs = {}
+        for env in envs:
+            context = contexts.get(env) or _load_context(project_path, env)
+            catalogs[env] = _create_catalog(context, lazy_catalog)
+        pipelines = future_pipelines.result()
+    return catalogs, pipelines
 
-        context = session.load_context()
-        return context.catalog, context.pipelines
-
-    # pre-0.17 load_context version
-    from kedro.framework.context import load_context
 
-    context = load_context(project_path=project_path, env=env)
-    return context.catalog, context.pipelines
+def load_catalogs(
+    project_path: Path,
+    envs: List[Optional[str]],
+    lazy_catalog: bool = False,
+) -> Dict[Optional[str], DataCatalog]:
+    """Load the catalogs of a Kedro project for several environments, without loading
+    its pipelines, e.g. when only its configuration has changed.
+    Args:
+        project_path: the path whether the Kedro project is located.
+        envs: the Kedro environments to load the catalogs of. `None` stands
+            for Kedro default, which is local.
+        lazy_catalog: whether to create the catalogs from their configuration alone,
+            only instantiating their datasets when they're used.
+    Returns:
+        The data catalog of each environment.
+    """
+    with startup_profiler.phase("bootstrap_project"):
+        _bootstrap(project_path)
+    return {
+        env: _create_catalog(_load_context(project_path, env), lazy_catalog)
+        for env in envs
+    }
@@ -0,0 +1,192 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.integrations.kedro.lazy_catalog` creates the catalog of a Kedro project
+from its configuration alone, whose datasets are only instantiated when they're used,
+so that their dependencies, e.g. spark or tensorflow, aren't imported at startup.
+"""
+# pylint: disable=protected-access
+import ast
+import functools
+import sys
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+
+from kedro.io import DataCatalog
+from kedro.io.core import AbstractDataSet
+
+from .modules import find_module_file
+
+# the packages in which Kedro looks for the type of a dataset
+# that isn't given with its full path, in this order
+_DEFAULT_PACKAGES = ("kedro.io.", "kedro.extras.datasets.", "")
+
+
+def _find_class(class_path: str) -> Optional[str]:
+    """Find the full path of the class with the given path, following the imports
+    re-exporting it, e.g. from the `__init__` of a package, without importing
+    its module unless it's already imported. Return `None` if it isn't found.
+    """
+    module_name, _, class_name = class_path.rpartition(".")
+    if not module_name:
+        return None
+
+    module = sys.modules.get(module_name)
+    obj = getattr(module, class_name, None)
+    if isinstance(obj, type):
+        return f"{obj.__module__}.{obj.__qualname__}"
+
+    module_file = find_module_file(module_name)
+    if module_file is None:
+        return None
+
+    package = (
+        module_name
+        if module_file.name == "__init__.py"
+        else module_name.rpartition(".")[0]
+    )
+    tree = ast.parse(module_file.read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return class_path
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        for alias in node.names:
+            if (alias.asname or alias.name) != class_name:
+                continue
+            if node.level:
+                base = package.rsplit(".", node.level - 1)[0] if package else ""
+                source_module = ".".join(filter(None, [base, node.module]))
+            else:
+                source_module = node.module or ""
+            source_path = f"{source_module}.{alias.name}"
+            return _find_class(source_path) or source_path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_dataset_type(type_name: str) -> str:
+    """Get the full path of the class of a dataset from its `type` in the catalog
+    configuration, e.g. `kedro.extras.datasets.pandas.csv_dataset.CSVDataSet` for
+    `pandas.CSVDataSet`, as Kedro resolves it. If it can't be found, e.g. because
+    its package isn't installed, the type is returned as is.
+    """
+    for package in _DEFAULT_PACKAGES:
+        class_path = _find_class(f"{package}{type_name}")
+        if class_path is not None:
+            return class_path
+    return type_name
+
+
+class LazyDataSet(AbstractDataSet):
+    """A dataset of the catalog configuration, which is only instantiated
+    the first time it's loaded, saved or described, e.g. when the metadata
+    of its node is requested.
+    """
+
+    # marks the datasets that the graph nodes read from their configuration
+    is_lazy = True
+
+    def __init__(
+        self,
+        name: str,
+        config: Dict[str, Any],
+        get_credentials: Callable[[], Dict[str, Any]],
+    ):
+        self.name = name
+        self.config = config
+        self._get_credentials = get_credentials
+        self._dataset: Optional[AbstractDataSet] = None
+        self._lock = threading.Lock()
+
+    @property
+    def dataset_type(self) -> Optional[str]:
+        """The full path of the class of the dataset, without instantiating it."""
+        type_name = self.config.get("type")
+        if not isinstance(type_name, str):
+            return (
+                f"{type_name.__module__}.{type_name.__qualname__}"
+                if isinstance(type_name, type)
+                else None
+            )
+        return get_dataset_type(type_name)
+
+    @property
+    def layer(self) -> Optional[str]:
+        """The layer of the dataset in the catalog configuration."""
+        return self.config.get("layer")
+
+    @property
+    def filepath(self) -> Optional[str]:
+        """The filepath of the dataset in the catalog configuration."""
+        return self.config.get("filepath")
+
+    def get_dataset(self) -> AbstractDataSet:
+        """Instantiate the dataset the first time, as Kedro does from the catalog
+        configuration, with the credentials it refers to.
+        """
+        with self._lock:
+            if self._dataset is None:
+                catalog = DataCatalog.from_config(
+                    {self.name: self.config}, self._get_credentials()
+                )
+                self._dataset = catalog._data_sets[self.name]
+        return self._dataset
+
+    def _load(self) -> Any:
+        return self.get_dataset().load()
+
+    def _save(self, data: Any) -> None:
+        self.get_dataset().save(data)
+
+    def _exists(self) -> bool:
+        return self.get_dataset().exists()
+
+    def _describe(self) -> Dict[str, Any]:
+        return self.get_dataset()._describe()
+
+
+def create_lazy_catalog(
+    conf_catalog: Dict[str, Dict[str, Any]],
+    get_credentials: Callable[[], Dict[str, Any]],
+    feed_dict: Dict[str, Any],
+) -> DataCatalog:
+    """Create a catalog from the catalog configuration of a Kedro project, whose
+    datasets are `LazyDataSet`s and layers are read from the configuration.
+    As Kedro does, the given feed dict, e.g. the parameters, is added to it.
+    """
+    data_sets: Dict[str, AbstractDataSet] = {}
+    layers: Dict[str, Set[str]] = defaultdict(set)
+    for name, config in conf_catalog.items():
+        dataset = LazyDataSet(name, config, get_credentials)
+        data_sets[name] = dataset
+        if dataset.layer:
+            layers[dataset.layer].add(name)
+    catalog = DataCatalog(data_sets=data_sets, layers=dict(layers) or None)
+    catalog.add_feed_dict(feed_dict)
+    return catalog
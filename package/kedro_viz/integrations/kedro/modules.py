@@ -0,0 +1,66 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.integrations.kedro.modules` locates the source of Python modules
+without importing them, so that they can be analysed statically.
+"""
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+def find_module_file(module_name: str) -> Optional[Path]:
+    """Find the source file of a module without importing it, nor its packages
+    unless they're already imported, as importing them can import the module.
+    """
+    package_name, _, name = module_name.rpartition(".")
+    if not package_name:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            return None
+        return Path(spec.origin)
+
+    package = sys.modules.get(package_name)
+    if package is not None:
+        locations = list(getattr(package, "__path__", []))
+    else:
+        package_file = find_module_file(package_name)
+        if package_file is None or package_file.name != "__init__.py":
+            return None
+        locations = [str(package_file.parent)]
+    for location in locations:
+        for path in (
+            Path(location) / name / "__init__.py",
+            Path(location) / f"{name}.py",
+        ):
+            if path.is_file():
+                return path
+    return None
@@ -0,0 +1,162 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.integrations.kedro.snapshots` caches the graph of a Kedro project
+under the project, so that it isn't loaded again until its code or configuration
+changes.
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from kedro_viz import __version__
+
+from .cache import CACHE_DIR, get_cache_dir
+from .data_loader import KEDRO_VERSION
+
+logger = logging.getLogger(__name__)
+
+# the number of snapshots kept, e.g. one for each environment in use
+_MAX_SNAPSHOTS = 5
+
+# the configuration environments Kedro always reads, and the default one
+_BASE_ENV = "base"
+_DEFAULT_ENV = "local"
+
+# the files at the root of the project that describe it to Kedro
+_PROJECT_FILES = ("pyproject.toml", ".kedro.yml")
+
+
+def _iter_files(directory: Path, suffixes=None) -> Iterator[Path]:
+    """Iterate over the files under a directory, in a stable order, skipping the
+    hidden ones and the caches, optionally only the ones with the given suffixes.
+    """
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(
+            dirname
+            for dirname in dirnames
+            if not dirname.startswith(".") and dirname != "__pycache__"
+        )
+        for filename in sorted(filenames):
+            if filename.startswith("."):
+                continue
+            if suffixes is None or Path(filename).suffix in suffixes:
+                yield Path(dirpath) / filename
+
+
+class SnapshotCache:
+    """The snapshots of the graph of a Kedro project, as created by
+    `DataAccessManager.create_snapshot`, keyed by a fingerprint of the project.
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path
+        self.cache_dir = project_path / CACHE_DIR / "snapshots"
+
+    def get_fingerprint(
+        self,
+        envs: List[Optional[str]],
+        pipeline_name: Optional[str] = None,
+        lazy_catalog: bool = False,
+        static_pipelines: bool = False,
+    ) -> str:
+        """Compute the fingerprint of the project loaded with the given environments,
+        pipeline and loading options, from the installed versions of Kedro and
+        Kedro-Viz, the pipelines' source files and the configuration files
+        of the environments.
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps(
+                {
+                    "kedro": str(KEDRO_VERSION),
+                    "kedro_viz": __version__,
+                    "envs": envs,
+                    "pipeline": pipeline_name,
+                    "lazy_catalog": lazy_catalog,
+                    "static_pipelines": static_pipelines,
+                }
+            ).encode("utf-8")
+        )
+        conf_path = self.project_path / "conf"
+        paths = [self.project_path / filename for filename in _PROJECT_FILES]
+        paths.extend(_iter_files(self.project_path / "src", suffixes={".py"}))
+        for env in dict.fromkeys([_BASE_ENV, *(env or _DEFAULT_ENV for env in envs)]):
+            paths.extend(_iter_files(conf_path / env))
+        for path in paths:
+            if not path.is_file():
+                continue
+            digest.update(str(path.relative_to(self.project_path)).encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _get_snapshot_path(self, fingerprint: str) -> Path:
+        return self.cache_dir / f"{fingerprint}.json"
+
+    def load(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload with the given fingerprint, if any."""
+        snapshot_path = self._get_snapshot_path(fingerprint)
+        try:
+            payload = json.loads(snapshot_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring the invalid snapshot %s: %s", snapshot_path, exc)
+            return None
+        # mark the snapshot as recently used, so that it's the last one to be pruned
+        os.utime(snapshot_path)
+        return payload
+
+    def save(self, fingerprint: str, payload: bytes):
+        """Cache the encoded payload with the given fingerprint, and prune the least
+        recently used snapshots.
+        """
+        get_cache_dir(self.project_path)
+        self.cache_dir.mkdir(exist_ok=True)
+
+        snapshot_path = self._get_snapshot_path(fingerprint)
+        # written to a temporary file first, so that no process reads it half-written
+        temporary_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_bytes(payload)
+        os.replace(temporary_path, snapshot_path)
+
+        snapshot_paths = sorted(
+            self.cache_dir.glob("*.json"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for stale_path in snapshot_paths[_MAX_SNAPSHOTS:]:
+            try:
+                stale_path.unlink()
+            except FileNotFoundError:  # pragma: no cover
+                # pruned by another process in the meantime
+                pass
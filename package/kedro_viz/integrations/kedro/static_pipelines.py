@@ -0,0 +1,819 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.integrations.kedro.static_pipelines` extracts the pipelines of a Kedro
+project by analysing the source of its pipeline registry, and of the modules creating
+its pipelines, without importing the code of their nodes nor its dependencies.
+
+The `Pipeline`, `node` and `pipeline` constructs are evaluated with Kedro itself,
+so that the extracted pipelines are the same as the registered ones, except that
+the functions of their nodes are stubs pointing at the source of the real ones.
+A function too dynamic to be analysed, e.g. one reading a file, is imported instead.
+"""
+import ast
+import builtins
+import importlib
+import logging
+import operator
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from kedro.pipeline import Pipeline
+
+from .modules import find_module_file
+
+logger = logging.getLogger(__name__)
+
+# the functions creating the pipelines of a project, by Kedro version:
+# `register_pipelines` in `pipeline_registry.py` from 0.17.3, the hook of
+# `ProjectHooks` in `hooks.py` from 0.17.0 and `create_pipelines` before.
+_REGISTRIES = (
+    ("pipeline_registry", None, "register_pipelines"),
+    ("hooks", "ProjectHooks", "register_pipelines"),
+    ("pipeline", None, "create_pipelines"),
+)
+
+# the builtins that can be called while analysing the project
+_BUILTINS: Dict[str, Any] = {
+    name: getattr(builtins, name)
+    for name in ("dict", "len", "list", "set", "sorted", "str", "sum", "tuple", "zip")
+}
+_BUILTINS.update({"None": None, "True": True, "False": False})
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.BitOr: operator.or_,
+    ast.BitAnd: operator.and_,
+    ast.BitXor: operator.xor,
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Invert: operator.invert,
+}
+
+_COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+# the deepest the calls between the functions of a project can be analysed
+_MAX_CALL_DEPTH = 50
+
+
+class _TooDynamic(Exception):
+    """Raised when the source of a project can't be analysed statically."""
+
+
+class _StubCalled(_TooDynamic, NotImplementedError):
+    """Raised by the stub standing for a function of the project when it's called,
+    e.g. by the code of Kedro creating a pipeline, which then needs the real one.
+    """
+
+
+class _Module:
+    """A module of the project, whose top-level names are only evaluated when used."""
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+        self.package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+        self.bindings: Dict[str, ast.stmt] = {}
+        self.star_imports: List[ast.ImportFrom] = []
+        self.values: Dict[str, Any] = {}
+
+        for statement in ast.parse(path.read_text(encoding="utf-8")).body:
+            for name_ in _get_bound_names(statement):
+                self.bindings[name_] = statement
+            if isinstance(statement, ast.ImportFrom) and any(
+                alias.name == "*" for alias in statement.names
+            ):
+                self.star_imports.append(statement)
+
+    def resolve_import(self, statement: ast.ImportFrom) -> str:
+        """The absolute name of the module of a `from ... import ...` statement."""
+        if not statement.level:
+            return statement.module or ""
+        base = self.package.rsplit(".", statement.level - 1)[0]
+        return ".".join(filter(None, [base, statement.module]))
+
+
+class _ModuleRef:  # pylint: disable=too-few-public-methods
+    """A reference to a module of the project, which isn't imported."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class _ClassRef:  # pylint: disable=too-few-public-methods
+    """A reference to a class defined in the project, e.g. `ProjectHooks`."""
+
+    def __init__(self, definition: ast.ClassDef, module: _Module):
+        self.definition = definition
+        self.module = module
+
+
+class _Scope:  # pylint: disable=too-few-public-methods
+    """The variables of a function call, falling back to the enclosing scopes."""
+
+    def __init__(self, module: _Module, parent: Optional["_Scope"] = None):
+        self.module = module
+        self.parent = parent
+        self.variables: Dict[str, Any] = {}
+
+
+class _FunctionRef:
+    """A reference to a function or lambda defined in the project."""
+
+    def __init__(
+        self,
+        definition: Union[ast.FunctionDef, ast.Lambda],
+        module: _Module,
+        scope: Optional[_Scope],
+        qualname: str,
+    ):
+        self.definition = definition
+        self.module = module
+        self.scope = scope
+        self.qualname = qualname
+
+    @property
+    def name(self) -> str:
+        """The name of the function, as Kedro names its node after it."""
+        return getattr(self.definition, "name", "<lambda>")
+
+    def create_stub(self) -> Callable:
+        """Create a function standing for this one in a Kedro node, which has the same
+        name and whose code points at the source of this one, e.g. for `inspect`.
+        """
+        # the source of a decorated function starts with its decorators
+        lineno = min(
+            [
+                decorator.lineno
+                for decorator in getattr(self.definition, "decorator_list", [])
+            ]
+            + [self.definition.lineno]
+        )
+        message = (
+            f"{self.module.name}.{self.qualname} can't be run, as Kedro-Viz extracted "
+            "its pipeline without importing it"
+        )
+        source = "\n" * (lineno - 1)
+        source += f"def stub(*args, **kwargs):\n    raise _StubCalled({message!r})\n"
+        code = compile(source, str(self.module.path), "exec")
+        stub_code = next(
+            const for const in code.co_consts if isinstance(const, types.CodeType)
+        )
+        stub = types.FunctionType(
+            stub_code,
+            {"__builtins__": builtins, "_StubCalled": _StubCalled},
+            self.name,
+        )
+        stub.__qualname__ = self.qualname
+        stub.__module__ = self.module.name
+        return stub
+
+
+def _get_bound_names(statement: ast.stmt) -> List[str]:
+    """The names bound by a top-level statement of a module."""
+    if isinstance(statement, (ast.FunctionDef, ast.ClassDef)):
+        return [statement.name]
+    if isinstance(statement, ast.Import):
+        return [alias.asname or alias.name.split(".")[0] for alias in statement.names]
+    if isinstance(statement, ast.ImportFrom):
+        return [alias.asname or alias.name for alias in statement.names]
+    if isinstance(statement, ast.Assign):
+        return [
+            target.id for target in statement.targets if isinstance(target, ast.Name)
+        ]
+    if isinstance(statement, ast.AnnAssign) and statement.value is not None:
+        return [statement.target.id] if isinstance(statement.target, ast.Name) else []
+    return []
+
+
+def _is_literal(expression: ast.expr) -> bool:
+    return type(expression).__name__ in (
+        "Constant",
+        "Num",
+        "Str",
+        "Bytes",
+        "NameConstant",
+    )
+
+
+def _get_index(subscript: ast.Subscript) -> ast.expr:
+    # the index is wrapped in `ast.Index` before Python 3.9
+    index: Any = subscript.slice
+    return getattr(index, "value", index) if type(index).__name__ == "Index" else index
+
+
+class _PipelineExtractor:
+    """Evaluate the functions creating the pipelines of a Kedro project from their
+    source, only running the code of Kedro and of a few builtins.
+    """
+
+    def __init__(self, package_name: str):
+        self.package_name = package_name
+        self.modules: Dict[str, _Module] = {}
+        self.imported_functions: List[str] = []
+        self._depth = 0
+
+    def extract(self) -> Dict[str, Pipeline]:
+        """Extract the registered pipelines of the project."""
+        for module_name, class_name, function_name in _REGISTRIES:
+            module_name = f"{self.package_name}.{module_name}"
+            if find_module_file(module_name) is None:
+                continue
+            module = self.get_module(module_name)
+            if class_name is None:
+                registry = self.lookup_module(module, function_name)
+                args: List[Any] = []
+            else:
+                registry = self.get_attribute(
+                    self.lookup_module(module, class_name), function_name
+                )
+                # the hook is called without an instance, which it doesn't use
+                args = [None]
+            pipelines = self.call(registry, args, {})
+            if not isinstance(pipelines, dict) or not all(
+                isinstance(pipeline, Pipeline) for pipeline in pipelines.values()
+            ):
+                raise _TooDynamic(f"{module_name} doesn't return pipelines")
+            return pipelines
+        raise _TooDynamic(f"No pipeline registry found in {self.package_name}")
+
+    def get_module(self, name: str) -> _Module:
+        """Parse a module of the project, once."""
+        if name not in self.modules:
+            path = find_module_file(name)
+            if path is None:
+                raise _TooDynamic(f"Module {name} not found")
+            self.modules[name] = _Module(name, path)
+        return self.modules[name]
+
+    def resolve_module(self, name: str) -> Any:
+        """Import the modules of Kedro, and refer to the ones of the project.
+        The others can't be used, as they may be missing or slow to import.
+        """
+        if name == "kedro" or name.startswith("kedro."):
+            return importlib.import_module(name)
+        if name == self.package_name or name.startswith(f"{self.package_name}."):
+            self.get_module(name)
+            return _ModuleRef(name)
+        raise _TooDynamic(f"{name} isn't part of the project")
+
+    def lookup_module(self, module: _Module, name: str) -> Any:
+        """Evaluate a top-level name of a module, once."""
+        if name in module.values:
+            return module.values[name]
+        statement = module.bindings.get(name)
+        if statement is None:
+            for star_import in module.star_imports:
+                source = self.resolve_module(module.resolve_import(star_import))
+                try:
+                    return self.get_attribute(source, name)
+                except _TooDynamic:
+                    continue
+            raise _TooDynamic(f"{name} not found in {module.name}")
+        value = self.bind(statement, name, module, None, module.name)
+        module.values[name] = value
+        return value
+
+    def bind(
+        self,
+        statement: ast.stmt,
+        name: str,
+        module: _Module,
+        scope: Optional[_Scope],
+        qualname: str,
+    ) -> Any:
+        """Evaluate the value a statement binds to a name, at the top level of
+        a module if no scope is given, or in the scope of a function call.
+        """
+        if isinstance(statement, ast.FunctionDef):
+            return _FunctionRef(
+                statement,
+                module,
+                scope,
+                name if scope is None else f"{qualname}.<locals>.{name}",
+            )
+        if isinstance(statement, ast.ClassDef):
+            return _ClassRef(statement, module)
+        if isinstance(statement, ast.Import):
+            for alias in statement.names:
+                if alias.asname == name:
+                    return self.resolve_module(alias.name)
+                if alias.asname is None and alias.name.split(".")[0] == name:
+                    return self.resolve_module(name)
+        if isinstance(statement, ast.ImportFrom):
+            for alias in statement.names:
+                if (alias.asname or alias.name) == name:
+                    source_name = module.resolve_import(statement)
+                    return self.get_attribute(
+                        self.resolve_module(source_name), alias.name
+                    )
+        if isinstance(statement, (ast.Assign, ast.AnnAssign)) and statement.value:
+            return self.evaluate(statement.value, scope or _Scope(module))
+        raise _TooDynamic(f"Can't evaluate {name} in {module.name}")
+
+    def lookup(self, name: str, scope: _Scope) -> Any:
+        """Look a name up in a scope, then in its module and the builtins."""
+        current: Optional[_Scope] = scope
+        while current is not None:
+            if name in current.variables:
+                return current.variables[name]
+            current = current.parent
+        if name in scope.module.bindings or scope.module.star_imports:
+            try:
+                return self.lookup_module(scope.module, name)
+            except _TooDynamic:
+                if name not in _BUILTINS:
+                    raise
+        if name in _BUILTINS:
+            return _BUILTINS[name]
+        raise _TooDynamic(f"{name} not found in {scope.module.name}")
+
+    def get_attribute(self, value: Any, name: str) -> Any:
+        """Get an attribute of a value, which may refer to the project."""
+        if isinstance(value, _ModuleRef):
+            module = self.get_module(value.name)
+            if name in module.bindings or module.star_imports:
+                try:
+                    return self.lookup_module(module, name)
+                except _TooDynamic:
+                    pass
+            # e.g. a pipeline imported from its package
+            return self.resolve_module(f"{value.name}.{name}")
+        if isinstance(value, _ClassRef):
+            for statement in value.definition.body:
+                if isinstance(statement, ast.FunctionDef) and statement.name == name:
+                    return _FunctionRef(
+                        statement,
+                        value.module,
+                        None,
+                        f"{value.definition.name}.{name}",
+                    )
+            raise _TooDynamic(f"{name} not found in {value.definition.name}")
+        if isinstance(value, _FunctionRef) or name.startswith("__"):
+            raise _TooDynamic(f"Can't get the attribute {name}")
+        if isinstance(value, types.ModuleType) and not hasattr(value, name):
+            # e.g. `kedro.pipeline.modular_pipeline`
+            return importlib.import_module(f"{value.__name__}.{name}")
+        try:
+            return getattr(value, name)
+        except AttributeError as exc:
+            raise _TooDynamic(str(exc)) from exc
+
+    def to_value(self, value: Any) -> Any:
+        """Convert a value to the one given to Kedro, e.g. the function of a node."""
+        if isinstance(value, _FunctionRef):
+            return value.create_stub()
+        if isinstance(value, (_ModuleRef, _ClassRef)):
+            raise _TooDynamic("Can't use a module or class of the project")
+        if isinstance(value, (list, tuple, set)):
+            return type(value)(self.to_value(item) for item in value)
+        if isinstance(value, dict):
+            return {key: self.to_value(item) for key, item in value.items()}
+        return value
+
+    def call(self, function: Any, args: List[Any], kwargs: Dict[str, Any]) -> Any:
+        """Call a function of the project, or of Kedro and the builtins."""
+        if isinstance(function, _FunctionRef):
+            return self.call_function(function, args, kwargs)
+        if isinstance(function, (_ModuleRef, _ClassRef)) or not callable(function):
+            raise _TooDynamic(f"Can't call {function}")
+        try:
+            return function(
+                *[self.to_value(arg) for arg in args],
+                **{key: self.to_value(value) for key, value in kwargs.items()},
+            )
+        except _TooDynamic:
+            raise
+        except Exception as exc:
+            raise _TooDynamic(f"{type(exc).__name__}: {exc}") from exc
+
+    def call_function(
+        self, function: _FunctionRef, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Evaluate a function of the project. If it's too dynamic, it's imported and
+        called instead if it's defined at the top level of its module.
+        """
+        if self._depth >= _MAX_CALL_DEPTH:
+            raise _TooDynamic("The calls are too deep")
+        self._depth += 1
+        try:
+            return self._run_function(function, args, kwargs)
+        except _TooDynamic as exc:
+            if function.scope is not None or "." in function.qualname:
+                raise
+            try:
+                module = importlib.import_module(function.module.name)
+                result = getattr(module, function.name)(
+                    *[self.to_value(arg) for arg in args],
+                    **{key: self.to_value(value) for key, value in kwargs.items()},
+                )
+            except Exception as import_exc:
+                raise _TooDynamic(
+                    f"{type(import_exc).__name__}: {import_exc}"
+                ) from import_exc
+            logger.info(
+                "%s.%s was imported, as it can't be analysed statically: %s",
+                function.module.name,
+                function.name,
+                exc,
+            )
+            self.imported_functions.append(f"{function.module.name}.{function.name}")
+            return result
+        finally:
+            self._depth -= 1
+
+    def _run_function(
+        self, function: _FunctionRef, args: List[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        definition = function.definition
+        scope = _Scope(function.module, function.scope)
+        self.bind_arguments(definition.args, args, kwargs, scope, function)
+        if isinstance(definition, ast.Lambda):
+            return self.evaluate(definition.body, scope)
+        result = self.execute(definition.body, scope, function.qualname)
+        return result[0] if result else None
+
+    def bind_arguments(
+        self,
+        arguments: ast.arguments,
+        args: List[Any],
+        kwargs: Dict[str, Any],
+        scope: _Scope,
+        function: _FunctionRef,
+    ):  # pylint: disable=too-many-arguments,too-many-branches
+        """Bind the arguments of a function call to its parameters."""
+        definition_scope = function.scope or _Scope(function.module)
+        positional = [*getattr(arguments, "posonlyargs", []), *arguments.args]
+        defaults = [
+            self.evaluate(default, definition_scope) for default in arguments.defaults
+        ]
+        default_values = (
+            dict(zip([arg.arg for arg in positional[-len(defaults) :]], defaults))
+            if defaults
+            else {}
+        )
+        kwargs = dict(kwargs)
+        for index, arg in enumerate(positional):
+            if index < len(args):
+                scope.variables[arg.arg] = args[index]
+            elif arg.arg in kwargs:
+                scope.variables[arg.arg] = kwargs.pop(arg.arg)
+            elif arg.arg in default_values:
+                scope.variables[arg.arg] = default_values[arg.arg]
+            else:
+                raise _TooDynamic(f"Missing argument {arg.arg} of {function.qualname}")
+        extra_args = args[len(positional) :]
+        if arguments.vararg is not None:
+            scope.variables[arguments.vararg.arg] = tuple(extra_args)
+        elif extra_args:
+            raise _TooDynamic(f"Too many arguments for {function.qualname}")
+        for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+            if arg.arg in kwargs:
+                scope.variables[arg.arg] = kwargs.pop(arg.arg)
+            elif default is not None:
+                scope.variables[arg.arg] = self.evaluate(default, definition_scope)
+            else:
+                raise _TooDynamic(f"Missing argument {arg.arg} of {function.qualname}")
+        if arguments.kwarg is not None:
+            scope.variables[arguments.kwarg.arg] = kwargs
+        elif kwargs:
+            raise _TooDynamic(f"Unexpected arguments for {function.qualname}")
+
+    def execute(self, statements: List[ast.stmt], scope: _Scope, qualname: str):
+        """Execute the statements of a function, returning a tuple of the returned
+        value if it returned.
+        """
+        # pylint: disable=too-many-branches
+        for statement in statements:
+            if isinstance(statement, ast.Return):
+                value = statement.value
+                return (None if value is None else self.evaluate(value, scope),)
+            if isinstance(statement, ast.Expr):
+                self.evaluate(statement.value, scope)
+            elif isinstance(statement, ast.Assign):
+                value = self.evaluate(statement.value, scope)
+                for target in statement.targets:
+                    self.assign(target, value, scope)
+            elif isinstance(statement, ast.AnnAssign):
+                if statement.value is not None:
+                    self.assign(
+                        statement.target, self.evaluate(statement.value, scope), scope
+                    )
+            elif isinstance(statement, ast.AugAssign):
+                operation = _BINARY_OPERATORS.get(type(statement.op))
+                if operation is None or not isinstance(statement.target, ast.Name):
+                    raise _TooDynamic("Unsupported assignment")
+                current = self.lookup(statement.target.id, scope)
+                value = self.evaluate(statement.value, scope)
+                self.assign(
+                    statement.target, self.apply(operation, current, value), scope
+                )
+            elif isinstance(statement, ast.If):
+                branch = (
+                    statement.body
+                    if self.is_true(self.evaluate(statement.test, scope))
+                    else statement.orelse
+                )
+                result = self.execute(branch, scope, qualname)
+                if result:
+                    return result
+            elif isinstance(statement, ast.For) and not statement.orelse:
+                for item in self.iterate(self.evaluate(statement.iter, scope)):
+                    self.assign(statement.target, item, scope)
+                    result = self.execute(statement.body, scope, qualname)
+                    if result:
+                        return result
+            elif isinstance(statement, (ast.FunctionDef, ast.Import, ast.ImportFrom)):
+                for name in _get_bound_names(statement):
+                    scope.variables[name] = self.bind(
+                        statement, name, scope.module, scope, qualname
+                    )
+            elif not isinstance(statement, ast.Pass):
+                raise _TooDynamic(f"Unsupported statement {type(statement).__name__}")
+        return None
+
+    def assign(self, target: ast.expr, value: Any, scope: _Scope):
+        """Assign a value to a target, e.g. a name or a tuple of names."""
+        if isinstance(target, ast.Name):
+            scope.variables[target.id] = value
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            values = self.iterate(value)
+            if len(values) != len(target.elts):
+                raise _TooDynamic("Can't unpack the values")
+            for element, element_value in zip(target.elts, values):
+                self.assign(element, element_value, scope)
+        elif isinstance(target, ast.Subscript):
+            container = self.evaluate(target.value, scope)
+            if not isinstance(container, (dict, list)):
+                raise _TooDynamic("Unsupported assignment")
+            container[self.evaluate(_get_index(target), scope)] = value
+        else:
+            raise _TooDynamic("Unsupported assignment")
+
+    @staticmethod
+    def iterate(value: Any) -> List[Any]:
+        """The items of an iterable value."""
+        if isinstance(value, (_ModuleRef, _ClassRef, _FunctionRef)):
+            raise _TooDynamic("Can't iterate over a reference")
+        try:
+            return list(value)
+        except TypeError as exc:
+            raise _TooDynamic(str(exc)) from exc
+
+    @staticmethod
+    def mapping(value: Any) -> Dict[Any, Any]:
+        """A value unpacked as keyword arguments or into a dict."""
+        if not isinstance(value, dict):
+            raise _TooDynamic("Can't unpack a value that isn't a dict")
+        return value
+
+    @staticmethod
+    def is_true(value: Any) -> bool:
+        """The truth value of a value."""
+        if isinstance(value, (_ModuleRef, _ClassRef, _FunctionRef)):
+            raise _TooDynamic("Can't test a reference")
+        return bool(value)
+
+    @staticmethod
+    def apply(operation: Callable, *values: Any) -> Any:
+        """Apply an operator to values, which can't refer to the project."""
+        if any(
+            isinstance(value, (_ModuleRef, _ClassRef, _FunctionRef)) for value in values
+        ):
+            raise _TooDynamic("Can't operate on a reference")
+        try:
+            return operation(*values)
+        except Exception as exc:
+            raise _TooDynamic(f"{type(exc).__name__}: {exc}") from exc
+
+    def evaluate_items(self, elements: List[ast.expr], scope: _Scope) -> List[Any]:
+        """Evaluate the elements of a list, tuple or set, unpacking the starred ones."""
+        items: List[Any] = []
+        for element in elements:
+            if isinstance(element, ast.Starred):
+                items.extend(self.iterate(self.evaluate(element.value, scope)))
+            else:
+                items.append(self.evaluate(element, scope))
+        return items
+
+    def evaluate_comprehension(
+        self, expression: ast.expr, generators: List[ast.comprehension], scope: _Scope
+    ) -> List[Any]:
+        """Evaluate a comprehension, one generator at a time."""
+        if not generators:
+            return [self.evaluate(expression, scope)]
+        generator, *other_generators = generators
+        items = []
+        for item in self.iterate(self.evaluate(generator.iter, scope)):
+            inner_scope = _Scope(scope.module, scope)
+            self.assign(generator.target, item, inner_scope)
+            if all(
+                self.is_true(self.evaluate(condition, inner_scope))
+                for condition in generator.ifs
+            ):
+                items.extend(
+                    self.evaluate_comprehension(
+                        expression, other_generators, inner_scope
+                    )
+                )
+        return items
+
+    def evaluate(self, expression: ast.expr, scope: _Scope) -> Any:
+        """Evaluate an expression of the project's source in a scope."""
+        if _is_literal(expression):
+            return ast.literal_eval(expression)
+        evaluate = getattr(self, f"_evaluate_{type(expression).__name__.lower()}", None)
+        if evaluate is None:
+            raise _TooDynamic(f"Unsupported expression {type(expression).__name__}")
+        return evaluate(expression, scope)
+
+    def _evaluate_name(self, expression: ast.Name, scope: _Scope) -> Any:
+        return self.lookup(expression.id, scope)
+
+    def _evaluate_attribute(self, expression: ast.Attribute, scope: _Scope) -> Any:
+        return self.get_attribute(
+            self.evaluate(expression.value, scope), expression.attr
+        )
+
+    def _evaluate_call(self, expression: ast.Call, scope: _Scope) -> Any:
+        args = self.evaluate_items(expression.args, scope)
+        kwargs: Dict[str, Any] = {}
+        for keyword in expression.keywords:
+            if keyword.arg is None:
+                kwargs.update(self.mapping(self.evaluate(keyword.value, scope)))
+            else:
+                kwargs[keyword.arg] = self.evaluate(keyword.value, scope)
+        return self.call(self.evaluate(expression.func, scope), args, kwargs)
+
+    def _evaluate_list(self, expression: ast.List, scope: _Scope) -> Any:
+        return self.evaluate_items(expression.elts, scope)
+
+    def _evaluate_tuple(self, expression: ast.Tuple, scope: _Scope) -> Any:
+        return tuple(self.evaluate_items(expression.elts, scope))
+
+    def _evaluate_set(self, expression: ast.Set, scope: _Scope) -> Any:
+        return set(self.evaluate_items(expression.elts, scope))
+
+    def _evaluate_dict(self, expression: ast.Dict, scope: _Scope) -> Any:
+        items: Dict[Any, Any] = {}
+        for key, value in zip(expression.keys, expression.values):
+            if key is None:
+                items.update(self.mapping(self.evaluate(value, scope)))
+            else:
+                items[self.evaluate(key, scope)] = self.evaluate(value, scope)
+        return items
+
+    def _evaluate_listcomp(self, expression: ast.ListComp, scope: _Scope) -> Any:
+        return self.evaluate_comprehension(expression.elt, expression.generators, scope)
+
+    _evaluate_generatorexp = _evaluate_listcomp
+
+    def _evaluate_dictcomp(self, expression: ast.DictComp, scope: _Scope) -> Any:
+        pairs = self.evaluate_comprehension(
+            ast.Tuple(elts=[expression.key, expression.value], ctx=ast.Load()),
+            expression.generators,
+            scope,
+        )
+        return dict(pairs)
+
+    @staticmethod
+    def _evaluate_lambda(expression: ast.Lambda, scope: _Scope) -> Any:
+        return _FunctionRef(expression, scope.module, scope, "<lambda>")
+
+    def _evaluate_binop(self, expression: ast.BinOp, scope: _Scope) -> Any:
+        operation = _BINARY_OPERATORS.get(type(expression.op))
+        if operation is None:
+            raise _TooDynamic(f"Unsupported operator {type(expression.op).__name__}")
+        return self.apply(
+            operation,
+            self.evaluate(expression.left, scope),
+            self.evaluate(expression.right, scope),
+        )
+
+    def _evaluate_unaryop(self, expression: ast.UnaryOp, scope: _Scope) -> Any:
+        operand = self.evaluate(expression.operand, scope)
+        if isinstance(expression.op, ast.Not):
+            return not self.is_true(operand)
+        return self.apply(_UNARY_OPERATORS[type(expression.op)], operand)
+
+    def _evaluate_boolop(self, expression: ast.BoolOp, scope: _Scope) -> Any:
+        value = None
+        for operand in expression.values:
+            value = self.evaluate(operand, scope)
+            # `or` stops at the first true value, and `and` at the first false one
+            if self.is_true(value) is isinstance(expression.op, ast.Or):
+                break
+        return value
+
+    def _evaluate_compare(self, expression: ast.Compare, scope: _Scope) -> Any:
+        left = self.evaluate(expression.left, scope)
+        for operator_, comparator in zip(expression.ops, expression.comparators):
+            right = self.evaluate(comparator, scope)
+            if not self.apply(_COMPARISON_OPERATORS[type(operator_)], left, right):
+                return False
+            left = right
+        return True
+
+    def _evaluate_ifexp(self, expression: ast.IfExp, scope: _Scope) -> Any:
+        if self.is_true(self.evaluate(expression.test, scope)):
+            return self.evaluate(expression.body, scope)
+        return self.evaluate(expression.orelse, scope)
+
+    def _evaluate_subscript(self, expression: ast.Subscript, scope: _Scope) -> Any:
+        index = _get_index(expression)
+        if isinstance(index, ast.Slice):
+            key: Any = slice(
+                *[
+                    None if part is None else self.evaluate(part, scope)
+                    for part in (index.lower, index.upper, index.step)
+                ]
+            )
+        else:
+            key = self.evaluate(index, scope)
+        return self.apply(operator.getitem, self.evaluate(expression.value, scope), key)
+
+    def _evaluate_joinedstr(self, expression: ast.JoinedStr, scope: _Scope) -> Any:
+        parts = []
+        for value in expression.values:
+            if not isinstance(value, ast.FormattedValue):
+                parts.append(self.evaluate(value, scope))
+                continue
+            part = self.evaluate(value.value, scope)
+            if value.conversion in (ord("r"), ord("a")):
+                part = repr(part)
+            format_spec = (
+                ""
+                if value.format_spec is None
+                else self.evaluate(value.format_spec, scope)
+            )
+            parts.append(self.apply(format, part, format_spec))
+        return "".join(parts)
+
+
+def extract_pipelines(
+    package_name: str, import_pipelines: Callable[[], Dict[str, Pipeline]]
+) -> Dict[str, Pipeline]:
+    """Extract the registered pipelines of a Kedro project statically. The functions
+    creating them that are too dynamic are imported instead, and if the registry
+    itself is, all the pipelines are imported with the given function.
+    Args:
+        package_name: the name of the Python package of the project.
+        import_pipelines: the function importing the pipelines as Kedro does.
+    Returns:
+        The pipelines by name.
+    """
+    extractor = _PipelineExtractor(package_name)
+    try:
+        return extractor.extract()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.info(
+            "The pipelines of %s can't be extracted statically, so they are "
+            "imported: %s",
+            package_name,
+            exc,
+        )
+        return import_pipelines()
@@ -25,14 +25,65 @@
 #
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""`kedro_viz.launchers.cli` launches the viz server as a CLI app."""
+"""`kedro_viz.launchers.cli` launches the viz server as a CLI app.
 
+Kedro loads this module for every `kedro` command, so it only imports the server
+and its dependencies when `viz` runs.
+"""
+# pylint: disable=import-outside-toplevel
 import traceback
+import webbrowser
+from pathlib import Path
+from typing import Iterable, List
 
 import click
 from kedro.framework.cli.utils import KedroCliError
 
-from kedro_viz.server import run_server
+# the options of a dedicated server, which the daemon can't honour
+# for the projects it hosts
+_SERVER_OPTIONS = (
+    "host",
+    "port",
+    "workers",
+    "isolated",
+    "watch",
+    "profile_startup",
+    "cache",
+)
+
+# the options of a server visualising a single project, which the daemon ignores
+# when it's run, as it hosts the projects of the `kedro viz` calls attaching to it
+_NON_DAEMON_OPTIONS = (
+    "load_file",
+    "save_file",
+    "pipeline",
+    "workers",
+    "isolated",
+    "watch",
+    "profile_startup",
+    "cache",
+    "lazy_catalog",
+    "static_pipelines",
+)
+
+# the options only used when running the daemon
+_DAEMON_OPTIONS = ("memory_budget",)
+
+
+def _get_given_options(ctx: click.Context, names: Iterable[str]) -> List[str]:
+    """The options with the given names given other values than their defaults."""
+    return [
+        "/".join(param.opts + param.secondary_opts)
+        for param in ctx.command.params
+        if param.name in names and ctx.params[param.name] != param.default
+    ]
+
+
+def _reject_options(ctx: click.Context, names: Iterable[str], reason: str):
+    """Raise a usage error if any of the options with the given names is given."""
+    options = _get_given_options(ctx, names)
+    if options:
+        raise click.UsageError(f"{', '.join(options)} {reason}")
 
 
 @click.group(name="Kedro-Viz")
@@ -85,12 +136,157 @@ def commands():
     multiple=False,
     envvar="KEDRO_ENV",
     help="Kedro configuration environment. If not specified, "
-    "catalog config in `local` will be used",
+    "catalog config in `local` will be used. Several comma-separated environments "
+    "can be given, e.g. `staging,prod`, to switch between them with `?env=`",
+)
+@click.option(
+    "--daemon",
+    "run_as_daemon",
+    is_flag=True,
+    default=False,
+    help="Run a long-lived server hosting the pipelines of several Kedro projects. "
+    "Subsequent calls to `kedro viz` attach to it instead of starting a new server.",
+)
+@click.option(
+    "--memory-budget",
+    type=int,
+    default=2048,
+    help="Memory budget of the daemon in MB. The least recently used projects "
+    "are evicted beyond it, as estimated from the size of their graphs. "
+    "Defaults to 2048.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of worker processes serving the API. The project is loaded once "
+    "and shared by the workers. Defaults to 1.",
+)
+@click.option(
+    "--isolated",
+    is_flag=True,
+    default=False,
+    help="Load the Kedro project in a separate process, so that only its graph "
+    "is kept in the server's memory. Node metadata is computed at load time.",
 )
-def viz(host, port, browser, load_file, save_file, pipeline, env):
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Reload the project when its `src` or `conf` directories change, "
+    "and refresh the open browsers.",
+)
+@click.option(
+    "--profile-startup",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Profile loading the project and write the time and memory taken by each "
+    "phase, with the slowest pipelines and datasets, to this JSON file. "
+    "The report is also served on /api/debug/startup.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    help="Cache the graph of the project under its .kedro-viz directory, and "
+    "restore it rather than loading the project until its code or configuration "
+    "changes. Defaults to not caching.",
+)
+@click.option(
+    "--lazy-catalog",
+    is_flag=True,
+    default=False,
+    help="Create the catalog from its configuration alone, without importing "
+    "the dataset classes, which are only instantiated when the metadata of "
+    "their nodes is requested.",
+)
+@click.option(
+    "--static-pipelines",
+    is_flag=True,
+    default=False,
+    help="Extract the pipelines from the source of the project rather than "
+    "importing the code of their nodes, which is only imported for the parts "
+    "too dynamic to be analysed.",
+)
+# pylint: disable=too-many-arguments,too-many-locals
+def viz(
+    host,
+    port,
+    browser,
+    load_file,
+    save_file,
+    pipeline,
+    env,
+    run_as_daemon,
+    memory_budget,
+    workers,
+    isolated,
+    watch,
+    profile_startup,
+    cache,
+    lazy_catalog,
+    static_pipelines,
+):
     """Visualise a Kedro pipeline using Kedro viz."""
+    from kedro_viz import daemon
+    from kedro_viz.server import run_server
+
+    # attach to the running daemon if any, unless the pipeline is read from
+    # or saved to a file, which only a dedicated server can do
+    ctx = click.get_current_context()
+    if run_as_daemon:
+        _reject_options(
+            ctx,
+            _NON_DAEMON_OPTIONS,
+            "can't be used with --daemon, which hosts the projects "
+            "with the options of the `kedro viz` calls attaching to it.",
+        )
+    else:
+        _reject_options(ctx, _DAEMON_OPTIONS, "can only be used with --daemon.")
+
+    should_attach = not run_as_daemon and load_file is None and save_file is None
+    server_options = _get_given_options(ctx, _SERVER_OPTIONS)
+    if should_attach and server_options:
+        daemon_url = daemon.find_daemon()
+        if daemon_url is not None:
+            raise click.UsageError(
+                f"{', '.join(server_options)} can't be used when the project is "
+                f"hosted by the Kedro-Viz daemon running at {daemon_url}. "
+                "Stop the daemon to run a dedicated server."
+            )
+        should_attach = False
+
     try:
-        run_server(host, port, browser, load_file, save_file, pipeline, env)
+        if run_as_daemon:
+            daemon.run_daemon(host, port, memory_budget)
+            return
+
+        url = None
+        if should_attach:
+            url = daemon.attach(
+                Path.cwd(), env, pipeline, lazy_catalog, static_pipelines
+            )
+        if url is not None:
+            click.echo(f"Kedro-Viz is served by the daemon at {url}")
+            if browser:
+                webbrowser.open_new(url)
+            return
+
+        run_server(
+            host,
+            port,
+            browser,
+            load_file,
+            save_file,
+            pipeline,
+            env,
+            workers=workers,
+            isolated=isolated,
+            watch=watch,
+            profile_startup=profile_startup,
+            cache=cache,
+            lazy_catalog=lazy_catalog,
+            static_pipelines=static_pipelines,
+        )
     except Exception as ex:  # pragma: no cover
         traceback.print_exc()
         raise KedroCliError(str(ex)) from ex
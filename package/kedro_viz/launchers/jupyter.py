@@ -27,8 +27,12 @@
 # limitations under the License.
 """`kedro_viz.launchers.jupyter` provides line_magic to launch the viz server
 from a jupyter notebook.
+
+Kedro loads this module when IPython starts, so it only imports the server
+and its dependencies when the line magic runs.
 """
 # pragma: no cover
+# pylint: disable=import-outside-toplevel
 import logging
 import multiprocessing
 import socket
@@ -37,11 +41,8 @@ from functools import partial
 from time import sleep, time
 from typing import Any, Callable, Dict
 
-import requests
 from IPython.core.display import HTML, display
 
-from kedro_viz.server import run_server
-
 _VIZ_PROCESSES: Dict[str, int] = {}
 
 
@@ -97,6 +98,8 @@ def _wait_for(
 
 
 def _check_viz_up(port):  # pragma: no cover
+    import requests
+
     url = "http://127.0.0.1:{}/".format(port)
     try:
         response = requests.get(url)
@@ -139,6 +142,8 @@ def run_viz(port: int = None, line=None, local_ns=None) -> None:
             https://ipython.readthedocs.io/en/stable/config/custommagics.html
 
     """
+    from kedro_viz.server import run_server
+
     port = port or 4141  # Default argument doesn't work in Jupyter line magic.
     port = _allocate_port(start_at=port)
 
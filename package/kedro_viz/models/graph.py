@@ -33,11 +33,23 @@ import inspect
 import json
 import logging
 import re
-from dataclasses import InitVar, dataclass, field
+import sys
+from dataclasses import InitVar, dataclass, field, fields
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from types import FunctionType
-from typing import Any, Dict, List, Optional, Set, Union, cast
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from kedro.io import AbstractDataSet
 from kedro.io.core import get_filepath_str
@@ -45,6 +57,18 @@ from kedro.pipeline.node import Node as KedroNode
 
 logger = logging.getLogger(__name__)
 
+# the number of distinct tuples and frozensets of names, or of namespaces, kept interned
+# at once, so that a long-running server doesn't keep the ones of the projects it reloaded
+_MAX_INTERNED_NAMES = 2 ** 16
+
+
+def is_lazy_dataset(dataset: Any) -> bool:
+    """Whether a dataset comes from a lazy catalog, as marked by its class,
+    i.e. it describes its configuration and is only instantiated
+    by `get_dataset()` when it's first used.
+    """
+    return getattr(type(dataset), "is_lazy", False) is True
+
 
 def _pretty_name(name: str) -> str:
     name = name.replace("-", " ").replace("_", " ")
@@ -57,6 +81,48 @@ def _strip_namespace(name: str) -> str:
     return re.sub(pattern, "", name)
 
 
+@lru_cache(maxsize=_MAX_INTERNED_NAMES)
+def _interned(names: Any) -> Any:
+    """Return the first of the equal tuples or frozensets of names held by the graph
+    nodes, e.g. their pipelines or tags, so that the nodes holding the same names
+    share them rather than each holding a copy.
+    """
+    return names
+
+
+def _intern_tuple(names: Iterable[str]) -> Tuple[str, ...]:
+    return _interned(tuple(sys.intern(name) for name in names))
+
+
+def _intern_frozenset(names: Iterable[str]) -> FrozenSet[str]:
+    return _interned(frozenset(sys.intern(name) for name in names))
+
+
+def _intern_optional(name: Optional[str]) -> Optional[str]:
+    return sys.intern(name) if name is not None else None
+
+
+def _add_slots(cls: Any) -> Any:
+    """Recreate a dataclass with `__slots__` holding its fields, as `dataclass(slots=True)`
+    does from Python 3.10, so that its instances have no `__dict__`.
+    The class must not be referenced by its methods, e.g. through a bare `super()`.
+    """
+    field_names = [f.name for f in fields(cls)]
+    inherited_slots = {
+        slot for base in cls.__mro__[1:] for slot in getattr(base, "__slots__", ())
+    }
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = tuple(
+        name for name in field_names if name not in inherited_slots
+    )
+    for name in field_names + ["__dict__", "__weakref__"]:
+        # the defaults of the fields are kept by the generated `__init__`
+        cls_dict.pop(name, None)
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
 @dataclass
 class RegisteredPipeline:
     """Represent a registered pipeline in a Kedro project"""
@@ -96,9 +162,14 @@ class GraphNodeType(Enum):
     PARAMETERS = "parameters"
 
 
+@_add_slots
 @dataclass
 class GraphNode(abc.ABC):
-    """Represent a node in the graph representation of a Kedro pipeline"""
+    """Represent a node in the graph representation of a Kedro pipeline.
+    As there can be hundreds of thousands of them, the graph nodes are slotted,
+    their names are interned and the collections of names they hold are immutable,
+    so that the nodes holding the same ones share them.
+    """
 
     # a unique identifier for the node in the graph
     # obtained by hashing the node's string representation
@@ -111,17 +182,23 @@ class GraphNode(abc.ABC):
     full_name: str
 
     # the tags associated with this node
-    tags: Set[str]
+    tags: FrozenSet[str]
 
-    # the list of registered pipeline IDs this node belongs to
-    pipelines: List[str]
+    # the registered pipeline IDs this node belongs to
+    pipelines: Tuple[str, ...]
 
-    # the list of modular pipeline this node belongs to
-    modular_pipelines: List[str] = field(init=False)
+    # the modular pipelines this node belongs to
+    modular_pipelines: Tuple[str, ...] = field(init=False)
 
     # the underlying Kedro object for this node
     _kedro_obj: Union[KedroNode, Optional[AbstractDataSet]] = field(init=False)
 
+    def _intern_names(self):
+        """Intern the names held by this node, as each subclass does once created."""
+        self.name = sys.intern(self.name)
+        self.tags = _intern_frozenset(self.tags or ())
+        self.pipelines = _intern_tuple(self.pipelines)
+
     @staticmethod
     def _hash(value: str):
         return hashlib.sha1(value.encode("UTF-8")).hexdigest()[:8]
@@ -140,14 +217,15 @@ class GraphNode(abc.ABC):
         return dataset_full_name.rsplit(".", 1)[0]
 
     @staticmethod
-    def _expand_namespaces(namespace: Optional[str]) -> List[str]:
+    @lru_cache(maxsize=_MAX_INTERNED_NAMES)
+    def _expand_namespaces(namespace: Optional[str]) -> Tuple[str, ...]:
         """
         Expand a node's namespace to the modular pipelines this node belongs to.
         For example, if the node's namespace is: "pipeline1.data_science"
-        it should be expanded to: ["pipeline1", "pipeline1.data_science"]
+        it should be expanded to: ("pipeline1", "pipeline1.data_science")
         """
         if not namespace:
-            return []
+            return ()
         namespace_list = []
         namespace_chunks = namespace.split(".")
         prefix = ""
@@ -157,7 +235,7 @@ class GraphNode(abc.ABC):
             else:
                 prefix = chunk
             namespace_list.append(prefix)
-        return namespace_list
+        return _intern_tuple(namespace_list)
 
     @property
     def kedro_obj(self) -> Union[KedroNode, Optional[AbstractDataSet]]:
@@ -180,8 +258,8 @@ class GraphNode(abc.ABC):
             id=cls._hash(str(node)),
             name=_pretty_name(getattr(node, "short_name", node.name)),
             full_name=getattr(node, "short_name", node.name),
-            tags=set(node.tags),
-            pipelines=[],
+            tags=cast(FrozenSet[str], node.tags),
+            pipelines=(),
             kedro_obj=node,
         )
 
@@ -190,7 +268,7 @@ class GraphNode(abc.ABC):
         cls,
         full_name: str,
         layer: Optional[str],
-        tags: Set[str],
+        tags: Iterable[str],
         dataset: AbstractDataSet,
         is_free_input: bool = False,
     ) -> "DataNode":
@@ -211,9 +289,9 @@ class GraphNode(abc.ABC):
             id=cls._hash(full_name),
             name=_pretty_name(_strip_namespace(full_name)),
             full_name=full_name,
-            tags=tags,
+            tags=cast(FrozenSet[str], tags),
             layer=layer,
-            pipelines=[],
+            pipelines=(),
             kedro_obj=dataset,
             is_free_input=is_free_input,
         )
@@ -223,7 +301,7 @@ class GraphNode(abc.ABC):
         cls,
         full_name: str,
         layer: Optional[str],
-        tags: Set[str],
+        tags: Iterable[str],
         parameters: AbstractDataSet,
     ) -> "ParametersNode":
         """Create a graph node of type PARAMETERS for a given Kedro parameters dataset instance.
@@ -242,16 +320,21 @@ class GraphNode(abc.ABC):
             id=cls._hash(full_name),
             name=_pretty_name(_strip_namespace(full_name)),
             full_name=full_name,
-            tags=tags,
+            tags=cast(FrozenSet[str], tags),
             layer=layer,
-            pipelines=[],
+            pipelines=(),
             kedro_obj=parameters,
         )
 
     def add_pipeline(self, pipeline_id: str):
-        """Add a pipeline_id to the list of pipelines that this node belongs to."""
+        """Add a pipeline_id to the pipelines that this node belongs to."""
         if pipeline_id not in self.pipelines:
-            self.pipelines.append(pipeline_id)
+            self.pipelines = _intern_tuple(self.pipelines + (pipeline_id,))
+
+    def add_tags(self, tags: Iterable[str]):
+        """Add tags to the ones associated with this node."""
+        if not self.tags.issuperset(tags):
+            self.tags = _intern_frozenset(self.tags.union(tags))
 
     def belongs_to_pipeline(self, pipeline_id: str) -> bool:
         """Check whether this graph node belongs to a given pipeline_id."""
@@ -270,20 +353,26 @@ class GraphNodeMetadata(abc.ABC):
     """Represent a graph node's metadata"""
 
 
+@_add_slots
 @dataclass
 class TaskNode(GraphNode):
     """Represent a graph node of type TASK"""
 
     kedro_obj: InitVar[KedroNode]
-    modular_pipelines: List[str] = field(init=False)
+    modular_pipelines: Tuple[str, ...] = field(init=False)
     parameters: Dict = field(init=False, default_factory=dict)
-    type: str = GraphNodeType.TASK.value
+    type: ClassVar[str] = GraphNodeType.TASK.value
 
     def __post_init__(self, kedro_obj: KedroNode):
+        self._intern_names()
         self._kedro_obj = kedro_obj
 
         # the modular pipelines that a task node belongs to are derived from its namespace.
-        self.modular_pipelines = self._expand_namespaces(kedro_obj.namespace)
+        # a task node restored from a snapshot has no underlying Kedro node,
+        # so its modular pipelines are restored along with it.
+        self.modular_pipelines = self._expand_namespaces(
+            kedro_obj.namespace if kedro_obj else None
+        )
 
 
 def _extract_wrapped_func(func: FunctionType) -> FunctionType:
@@ -339,7 +428,7 @@ class TaskNodeMetadata(GraphNodeMetadata):
             self.run_command = f'kedro run --to-nodes="{kedro_node._name}"'
 
 
-# pylint: disable=too-many-instance-attributes
+@_add_slots
 @dataclass
 class DataNode(GraphNode):
     """Represent a graph node of type DATA"""
@@ -356,22 +445,29 @@ class DataNode(GraphNode):
     # the concrete type of the underlying kedro_obj
     dataset_type: Optional[str] = field(init=False)
 
-    # the list of modular pipelines this data node belongs to
-    modular_pipelines: List[str] = field(init=False)
+    # the modular pipelines this data node belongs to
+    modular_pipelines: Tuple[str, ...] = field(init=False)
 
     # command to run the pipeline to this node
-    run_command: Optional[str] = field(init=False, default=None)
+    run_command: ClassVar[Optional[str]] = None
 
     # the type of this graph node, which is DATA
-    type: str = GraphNodeType.DATA.value
+    type: ClassVar[str] = GraphNodeType.DATA.value
 
     def __post_init__(self, kedro_obj: Optional[AbstractDataSet]):
+        self._intern_names()
         self._kedro_obj = kedro_obj
-        self.dataset_type = (
-            f"{kedro_obj.__class__.__module__}.{kedro_obj.__class__.__qualname__}"
-            if self.kedro_obj
-            else None
-        )
+        self.layer = _intern_optional(self.layer)
+        if is_lazy_dataset(kedro_obj):
+            # read from the catalog configuration, without instantiating the dataset
+            self.dataset_type = cast(Any, kedro_obj).dataset_type
+        else:
+            self.dataset_type = (
+                f"{kedro_obj.__class__.__module__}.{kedro_obj.__class__.__qualname__}"
+                if self.kedro_obj
+                else None
+            )
+        self.dataset_type = _intern_optional(self.dataset_type)
 
         # the modular pipelines that a data node belongs to
         # are derived from its namespace, which in turn
@@ -415,11 +511,18 @@ class DataNodeMetadata(GraphNodeMetadata):
     def __post_init__(self, data_node: DataNode):
         self.type = data_node.dataset_type
         dataset = cast(AbstractDataSet, data_node.kedro_obj)
-        filepath = dataset._describe().get("filepath")
+        if is_lazy_dataset(dataset):
+            # read from the catalog configuration, without instantiating the dataset
+            filepath = cast(Any, dataset).filepath
+        else:
+            filepath = dataset._describe().get("filepath")
         self.filepath = str(filepath) if filepath else None
 
         # Parse plot data
         if data_node.is_plot_node():
+            if is_lazy_dataset(dataset):
+                # the dataset of a lazy catalog is only instantiated for its plot
+                dataset = cast(Any, dataset).get_dataset()
             from kedro.extras.datasets.plotly.plotly_dataset import (  # pylint: disable=import-outside-toplevel
                 PlotlyDataSet,
             )
@@ -437,6 +540,7 @@ class DataNodeMetadata(GraphNodeMetadata):
             self.run_command = f'kedro run --to-outputs="{data_node.full_name}"'
 
 
+@_add_slots
 @dataclass
 class ParametersNode(GraphNode):
     """Represent a graph node of type PARAMETERS"""
@@ -448,20 +552,25 @@ class ParametersNode(GraphNode):
     # n.b. for parameters, this is always MemoryDataSet
     kedro_obj: InitVar[AbstractDataSet]
 
-    # the list of modular pipelines this parameters node belongs to
-    modular_pipelines: List[str] = field(init=False)
+    # the modular pipelines this parameters node belongs to
+    modular_pipelines: Tuple[str, ...] = field(init=False)
 
     # the type of this graph node, which is PARAMETERS
-    type: str = GraphNodeType.PARAMETERS.value
+    type: ClassVar[str] = GraphNodeType.PARAMETERS.value
 
     def __post_init__(self, kedro_obj: AbstractDataSet):
+        self._intern_names()
         self._kedro_obj = kedro_obj
+        self.layer = _intern_optional(self.layer)
+        self.modular_pipelines = self.infer_modular_pipelines()
+
+    def infer_modular_pipelines(self) -> Tuple[str, ...]:
+        """Infer the modular pipelines this parameters node may belong to from its name.
+        Only the ones containing task or data nodes are kept by the DataAccessManager.
+        """
         if self.is_all_parameters():
-            self.modular_pipelines = []
-        else:
-            self.modular_pipelines = self._expand_namespaces(
-                self._get_namespace(self.parameter_name)
-            )
+            return ()
+        return self._expand_namespaces(self._get_namespace(self.parameter_name))
 
     def is_all_parameters(self) -> bool:
         """Check whether the graph node represent all parameters in the pipeline"""
@@ -26,39 +26,687 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """`kedro_viz.server` provides utilities to launch a webserver for Kedro pipeline visualisation."""
+import functools
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
 import webbrowser
 from pathlib import Path
-from typing import Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import uvicorn
 from kedro.io import DataCatalog
 from kedro.pipeline import Pipeline
 
-from kedro_viz.api import apps, responses
+from kedro_viz.api import apps, responses, serializers
 from kedro_viz.data_access import DataAccessManager, data_access_manager
 from kedro_viz.integrations.kedro import data_loader as kedro_data_loader
-from kedro_viz.services import layers_services
+from kedro_viz.integrations.kedro.snapshots import SnapshotCache
+from kedro_viz.services import (
+    GraphUpdates,
+    ProjectWatcher,
+    StartupStatus,
+    layers_services,
+    startup_profiler,
+)
+
+logger = logging.getLogger(__name__)
 
 _DEFAULT_HOST = "0.0.0.0"
 _DEFAULT_PORT = 4141
 
+# the phases of loading a Kedro project, reported by `/api/status`
+_STARTUP_PHASES = ("load_project", "add_catalog", "add_pipelines", "sort_layers")
+
+# the phases of loading a Kedro project in a separate process
+_ISOLATED_STARTUP_PHASES = ("load_project", "restore_snapshot")
+
+# the directories of a Kedro project whose changes trigger a reload in watch mode
+_WATCHED_DIRS = ("src", "conf")
+
+# the pause in seconds after populating each pending pipeline in the background,
+# which lets the API requests waiting for the data repositories through
+_POPULATE_INTERVAL = 0.01
+
+
+def _parse_envs(env: Optional[str]) -> List[Optional[str]]:
+    """Parse a comma-separated list of Kedro environments, e.g. "staging,prod".
+    `None` stands for Kedro's default environment.
+    """
+    if not env:
+        return [None]
+    return [e.strip() for e in env.split(",") if e.strip()] or [None]
+
+
+def populate_env_data(
+    data_access_manager: DataAccessManager,
+    env_data_access_managers: Dict[str, DataAccessManager],
+    catalogs: Dict[str, DataCatalog],
+    startup_status: Optional[StartupStatus] = None,
+):  # pylint: disable=redefined-outer-name
+    """Populate a DataAccessManager for each of the given Kedro environments from
+    the already populated one. They share the pipeline structure, so only the catalog
+    dependent parts of the graph and the layers are computed for each environment.
+    """
+    startup_status = startup_status or StartupStatus()
+    for env, catalog in catalogs.items():
+        with startup_status.phase(f"add_env:{env}"):
+            manager = data_access_manager.for_catalog(catalog)
+            manager.set_layers(
+                layers_services.sort_layers(
+                    manager.nodes.as_dict(), manager.node_dependencies
+                )
+            )
+            env_data_access_managers[env] = manager
+
 
 def populate_data(
     data_access_manager: DataAccessManager,
     catalog: DataCatalog,
     pipelines: Dict[str, Pipeline],
+    startup_status: Optional[StartupStatus] = None,
+    lazy: bool = False,
 ):  # pylint: disable=redefined-outer-name
     """Populate data repositories. Should be called once on application start
-    if creatinge an api app from project.
-    """
-    data_access_manager.add_catalog(catalog)
-    data_access_manager.add_pipelines(pipelines)
-    data_access_manager.set_layers(
-        layers_services.sort_layers(
-            data_access_manager.nodes.as_dict(),
-            data_access_manager.node_dependencies,
+    if creatinge an api app from project. If a startup status is given,
+    the progress of each phase is tracked in it. If `lazy` is set, only the
+    default selected pipeline is populated, the others being left pending.
+    """
+    startup_status = startup_status or StartupStatus()
+    with startup_status.phase("add_catalog"):
+        data_access_manager.add_catalog(catalog)
+    with startup_status.phase("add_pipelines"):
+        data_access_manager.add_pipelines(pipelines, lazy=lazy)
+    with startup_status.phase("sort_layers"):
+        data_access_manager.set_layers(
+            layers_services.sort_layers(
+                data_access_manager.nodes.as_dict(),
+                data_access_manager.node_dependencies,
+            )
+        )
+
+
+def load_project(
+    data_access_manager: DataAccessManager,
+    startup_status: StartupStatus,
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    save_file: Optional[str] = None,
+    env_data_access_managers: Optional[Dict[str, DataAccessManager]] = None,
+    snapshot_cache: Optional[SnapshotCache] = None,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+):  # pylint: disable=redefined-outer-name,too-many-arguments,too-many-locals
+    """Load a Kedro project and populate the data repositories with it,
+    tracking the progress in the given startup status. It is run in a background
+    thread by `run_server` so that the server can respond while the project loads.
+
+    `env` can be a comma-separated list of Kedro environments. The first one
+    populates the given DataAccessManager and the others are added, by name,
+    to `env_data_access_managers`, sharing the pipelines loaded only once.
+
+    If a snapshot cache is given, the repositories are restored from the snapshot
+    of the project if it hasn't changed since it was cached, without loading it.
+    The project is then only loaded if the metadata of a node is requested.
+    Otherwise, the project is loaded and its snapshot cached.
+    Whenever the project is loaded, its parsed configuration files are cached
+    in its `.kedro-viz` directory, whether a snapshot cache is given or not.
+
+    If `lazy_catalog` is set, the catalog is created from its configuration alone,
+    and each dataset is only instantiated once the metadata of its node is requested.
+    If `static_pipelines` is set, the pipelines are extracted from the source of the
+    project rather than imported, except for the parts too dynamic to be analysed.
+    """
+    default_env, *other_envs = _parse_envs(env)
+    fingerprint = None
+    if snapshot_cache is not None:
+        with startup_status.phase("fingerprint_project"):
+            fingerprint = snapshot_cache.get_fingerprint(
+                [default_env, *other_envs],
+                pipeline_name,
+                lazy_catalog=lazy_catalog,
+                static_pipelines=static_pipelines,
+            )
+            payload = snapshot_cache.load(fingerprint)
+        if payload is not None:
+            with startup_status.phase("restore_snapshot"):
+                restored = _restore_snapshots(payload, data_access_manager)
+            for env_name, manager in restored:
+                manager.live_loader = functools.partial(
+                    _load_live_manager,
+                    project_path,
+                    env_name,
+                    pipeline_name,
+                    lazy_catalog,
+                    static_pipelines,
+                )
+                if env_name is not None and env_data_access_managers is not None:
+                    env_data_access_managers[env_name] = manager
+            _save_default_response(data_access_manager, save_file, startup_status)
+            startup_status.set_ready()
+            for _, manager in restored:
+                _add_graph_version(manager)
+            return
+
+    # only the configuration files changed since the last load are parsed
+    with startup_status.phase("load_project"), kedro_data_loader.cache_config_files(
+        project_path
+    ):
+        if other_envs:
+            catalogs, pipelines = kedro_data_loader.load_data_for_envs(
+                project_path,
+                [default_env, *other_envs],
+                lazy_catalog,
+                static_pipelines,
+            )
+            catalog = catalogs.pop(default_env)
+        else:
+            catalog, pipelines = kedro_data_loader.load_data(
+                project_path, default_env, lazy_catalog, static_pipelines
+            )
+            catalogs = {}
+        pipelines = (
+            pipelines
+            if pipeline_name is None
+            else {pipeline_name: pipelines[pipeline_name]}
+        )
+    populate_data(data_access_manager, catalog, pipelines, startup_status, lazy=True)
+    if env_data_access_managers is not None:
+        if default_env is not None:
+            env_data_access_managers[default_env] = data_access_manager
+        populate_env_data(
+            data_access_manager,
+            env_data_access_managers,
+            {e: c for e, c in catalogs.items() if e is not None},
+            startup_status,
+        )
+    _save_default_response(data_access_manager, save_file, startup_status)
+    startup_status.set_ready()
+
+    # the project is served while the other pipelines are populated,
+    # unless they are requested first
+    _populate_pending_pipelines(data_access_manager, env_data_access_managers or {})
+
+    if snapshot_cache is not None and fingerprint is not None:
+        # the project is served in the meantime
+        try:
+            snapshot_cache.save(
+                fingerprint,
+                serializers.dumps(
+                    {
+                        "snapshots": _create_snapshots(
+                            data_access_manager,
+                            default_env,
+                            env_data_access_managers or {},
+                        )
+                    }
+                ),
+            )
+        except OSError as exc:
+            logger.warning("Failed to cache the snapshot of the project: %s", exc)
+
+
+def _populate_pending_pipelines(
+    default_manager: DataAccessManager, env_managers: Dict[str, DataAccessManager]
+):
+    """Populate the pipelines left pending by the manager of each environment."""
+    managers = [
+        default_manager,
+        *[m for m in env_managers.values() if m is not default_manager],
+    ]
+    with startup_profiler.phase("populate_pending_pipelines"):
+        for manager in managers:
+            manager.populate_pending_pipelines(_POPULATE_INTERVAL)
+    for manager in managers:
+        _add_graph_version(manager)
+
+
+def _add_graph_version(manager: DataAccessManager):
+    """Retain the current version of the graph of the given manager, if it has one,
+    which is serialised for the first time then.
+    """
+    # a project without any pipeline has no graph
+    if manager.registered_pipelines.as_list():
+        with startup_profiler.phase("serialize_graph"):
+            responses.add_graph_version(manager)
+
+
+def _save_default_response(
+    manager: DataAccessManager,
+    save_file: Optional[str],
+    startup_status: StartupStatus,
+):
+    """Save the default API response to the given file, if any,
+    tracking it as a phase of the given startup status.
+    """
+    if save_file:
+        with startup_status.phase("save_file"):
+            manager.populate_pending_pipelines()
+            res = responses.get_default_response(manager)
+            Path(save_file).write_text(res.json(indent=4, sort_keys=True))
+
+
+def _load_live_manager(
+    project_path: Path,
+    env: Optional[str],
+    pipeline_name: Optional[str],
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+) -> DataAccessManager:
+    """Load a Kedro project into a new DataAccessManager, whose nodes hold
+    their underlying Kedro objects, unlike the ones restored from a snapshot.
+    """
+    manager = DataAccessManager()
+    load_project(
+        manager,
+        StartupStatus(),
+        project_path,
+        env,
+        pipeline_name,
+        lazy_catalog=lazy_catalog,
+        static_pipelines=static_pipelines,
+    )
+    return manager
+
+
+def _create_snapshots(
+    default_manager: DataAccessManager,
+    default_env: Optional[str],
+    env_managers: Dict[str, DataAccessManager],
+    with_metadata: bool = False,
+) -> List[List[Any]]:
+    """Create the snapshot of each environment, as `[env, snapshot]` pairs starting
+    with the default one, optionally along with the metadata of every node.
+    """
+    snapshots = []
+    for env_name, env_manager in [
+        (default_env, default_manager),
+        *[(e, m) for e, m in env_managers.items() if m is not default_manager],
+    ]:
+        node_metadata = {}
+        if with_metadata:
+            for node in env_manager.nodes.as_list():
+                try:
+                    node_metadata[node.id] = serializers.user_value(
+                        responses.get_node_metadata(node, env_manager)
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    # e.g. a plot that can't be read, which is then served
+                    # as a node without metadata
+                    pass
+        snapshot = env_manager.create_snapshot(node_metadata)
+        for record in snapshot["nodes"]:
+            if "parameters" in record:
+                record["parameters"] = serializers.user_value(record["parameters"])
+        snapshots.append([env_name, snapshot])
+    return snapshots
+
+
+def _restore_snapshots(
+    payload: Dict[str, Any], default_manager: DataAccessManager
+) -> List[Tuple[Optional[str], DataAccessManager]]:
+    """Rebuild the repositories of each environment from the snapshots of a payload,
+    the first, default one into the given manager, returning them by environment.
+    """
+    restored = []
+    for index, (env_name, snapshot) in enumerate(payload["snapshots"]):
+        manager = default_manager if index == 0 else DataAccessManager()
+        manager.add_snapshot(snapshot)
+        restored.append((env_name, manager))
+    return restored
+
+
+def _load_snapshots(
+    conn,
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+):
+    """Load a Kedro project, then send a snapshot of the graph of each of its
+    environments through the given connection, along with the metadata of every node.
+    It is the entry point of the process started by `load_project_isolated`.
+    """
+    try:
+        manager = DataAccessManager()
+        env_managers: Dict[str, DataAccessManager] = {}
+        load_project(
+            manager,
+            StartupStatus(),
+            project_path,
+            env,
+            pipeline_name,
+            env_data_access_managers=env_managers,
         )
+        payload: Dict[str, Any] = {
+            "snapshots": _create_snapshots(
+                manager, _parse_envs(env)[0], env_managers, with_metadata=True
+            )
+        }
+    except Exception as exc:  # pylint: disable=broad-except
+        payload = {"error": f"{type(exc).__name__}: {exc}"}
+    conn.send_bytes(serializers.dumps(payload))
+    conn.close()
+
+
+def _run_loader_process(
+    project_path: Path, env: Optional[str] = None, pipeline_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run `_load_snapshots` in a new process, which exits once it has sent
+    the snapshots back, and return them.
+    """
+    # the loader is spawned rather than forked, so it starts from a clean
+    # interpreter instead of a copy of the server
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_load_snapshots,
+        args=(sender, project_path, env, pipeline_name),
+        name="kedro-viz-loader",
+    )
+    process.start()
+    sender.close()
+    try:
+        data = receiver.recv_bytes()
+    except EOFError:
+        data = None
+    finally:
+        receiver.close()
+        process.join()
+
+    if data is None:
+        raise RuntimeError(
+            f"The process loading the Kedro project exited with code {process.exitcode}."
+        )
+    payload = json.loads(data)
+    if "error" in payload:
+        raise RuntimeError(payload["error"])
+    return payload
+
+
+def load_project_isolated(
+    app,
+    startup_status: StartupStatus,
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    save_file: Optional[str] = None,
+    snapshot_cache: Optional[SnapshotCache] = None,
+):  # pylint: disable=too-many-arguments
+    """Load a Kedro project in a separate process, so that the pipelines' code and
+    its dependencies are never imported by the server, which only rebuilds the data
+    repositories from the snapshot sent back. Once rebuilt, they replace the ones
+    served by the app. Calling it again therefore reloads the project while the
+    previous data keeps being served; a new startup status should be given then,
+    so that a failed reload doesn't stop the previous data from being served.
+
+    If a snapshot cache is given, the snapshots sent back are cached, and restored
+    instead of starting the process as long as the project doesn't change.
+    """
+    payload = None
+    fingerprint = None
+    if snapshot_cache is not None:
+        with startup_status.phase("fingerprint_project"):
+            fingerprint = snapshot_cache.get_fingerprint(
+                _parse_envs(env), pipeline_name
+            )
+            payload = snapshot_cache.load(fingerprint)
+    if payload is None:
+        with startup_status.phase("load_project"):
+            payload = _run_loader_process(project_path, env, pipeline_name)
+        if snapshot_cache is not None and fingerprint is not None:
+            try:
+                snapshot_cache.save(fingerprint, serializers.dumps(payload))
+            except OSError as exc:
+                logger.warning("Failed to cache the snapshot of the project: %s", exc)
+
+    with startup_status.phase("restore_snapshot"):
+        manager = DataAccessManager()
+        env_data_access_managers = {
+            env_name: env_manager
+            for env_name, env_manager in _restore_snapshots(payload, manager)
+            if env_name is not None
+        }
+
+    app.state.env_data_access_managers = env_data_access_managers
+    app.state.data_access_manager = manager
+    _save_default_response(manager, save_file, startup_status)
+    startup_status.set_ready()
+    for env_manager in [
+        manager,
+        *[m for m in env_data_access_managers.values() if m is not manager],
+    ]:
+        _add_graph_version(env_manager)
+
+
+def _unload_project_modules(project_path: Path):
+    """Remove the modules of a Kedro project from the imported modules,
+    so that its code is imported again, with any change, when it is reloaded.
+    """
+    project_path = project_path.resolve()
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and project_path in Path(module_file).resolve().parents:
+            del sys.modules[name]
+
+
+def _keep_graph_versions(
+    current_manager: DataAccessManager,
+    current_env_managers: Dict[str, DataAccessManager],
+    manager: DataAccessManager,
+    env_managers: Dict[str, DataAccessManager],
+):
+    """Move the versions of the graph served by the current managers to the ones
+    replacing them, so that the clients holding one of these versions can fetch
+    only what changed in the reloaded project.
+    """
+    manager.graph_versions = current_manager.graph_versions
+    for env, env_manager in env_managers.items():
+        if env_manager is not manager and env in current_env_managers:
+            env_manager.graph_versions = current_env_managers[env].graph_versions
+
+
+def reload_project(
+    app,
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    changed_paths: Iterable[Path] = (),
+    isolated: bool = False,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+):  # pylint: disable=too-many-locals,too-many-arguments
+    """Reload a Kedro project into new data repositories and swap them into the app,
+    which keeps serving the previous ones in the meantime. If only the configuration
+    changed, the pipelines are not reloaded: only the catalog-dependent parts of the
+    graph are rebuilt from the current one. The clients are then notified of the
+    update on `/api/events`.
+    """
+    startup_status = StartupStatus()
+    conf_path = (project_path / "conf").resolve()
+    changed_paths = list(changed_paths)
+    only_conf_changed = bool(changed_paths) and all(
+        conf_path in Path(path).resolve().parents for path in changed_paths
     )
+    current_manager = getattr(app.state, "data_access_manager", data_access_manager)
+    current_env_managers = getattr(app.state, "env_data_access_managers", {})
+
+    if isolated:
+        load_project_isolated(app, startup_status, project_path, env, pipeline_name)
+        _keep_graph_versions(
+            current_manager,
+            current_env_managers,
+            app.state.data_access_manager,
+            app.state.env_data_access_managers,
+        )
+    else:
+        env_data_access_managers: Dict[str, DataAccessManager] = {}
+        # the pipelines of a graph restored from a snapshot have to be reloaded
+        if (
+            only_conf_changed
+            and current_manager.live_loader is None
+            and current_manager.nodes.as_list()
+        ):
+            default_env, *other_envs = _parse_envs(env)
+            with startup_status.phase("load_project"):
+                catalogs = kedro_data_loader.load_catalogs(
+                    project_path, [default_env, *other_envs], lazy_catalog
+                )
+            with startup_status.phase("add_catalog"):
+                manager = current_manager.for_catalog(catalogs.pop(default_env))
+                manager.set_layers(
+                    layers_services.sort_layers(
+                        manager.nodes.as_dict(), manager.node_dependencies
+                    )
+                )
+            if default_env is not None:
+                env_data_access_managers[default_env] = manager
+            populate_env_data(
+                manager,
+                env_data_access_managers,
+                {e: c for e, c in catalogs.items() if e is not None},
+                startup_status,
+            )
+            startup_status.set_ready()
+        else:
+            _unload_project_modules(project_path)
+            manager = DataAccessManager()
+            load_project(
+                manager,
+                startup_status,
+                project_path,
+                env,
+                pipeline_name,
+                env_data_access_managers=env_data_access_managers,
+                lazy_catalog=lazy_catalog,
+                static_pipelines=static_pipelines,
+            )
+        _keep_graph_versions(
+            current_manager, current_env_managers, manager, env_data_access_managers
+        )
+        app.state.env_data_access_managers = env_data_access_managers
+        app.state.data_access_manager = manager
+    app.state.startup_status = startup_status
+
+    # a project without any pipeline has no graph to refresh the clients with
+    if app.state.data_access_manager.registered_pipelines.as_list():
+        encoded = responses.add_graph_version(manager=app.state.data_access_manager)
+        app.state.graph_updates.publish(
+            {"type": "graph-updated", "version": encoded.digest}
+        )
+    if not isolated:
+        # the pipelines of a graph rebuilt for the new configuration may still be pending
+        _populate_pending_pipelines(manager, env_data_access_managers)
+
+
+def _watch_project(
+    app,
+    startup_status: StartupStatus,
+    project_path: Path,
+    env: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    isolated: bool = False,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+):  # pylint: disable=too-many-arguments
+    """Reload a Kedro project whenever its code or configuration changes,
+    once it has first been loaded, whether successfully or not.
+    """
+    while not startup_status.wait(timeout=1) and not startup_status.has_failed:
+        pass
+    ProjectWatcher(
+        [project_path / dirname for dirname in _WATCHED_DIRS],
+        lambda changed_paths: reload_project(
+            app,
+            project_path,
+            env,
+            pipeline_name,
+            changed_paths,
+            isolated,
+            lazy_catalog,
+            static_pipelines,
+        ),
+    ).run()
+
+
+def _profile_startup(
+    load_target: Callable[..., None], load_args: tuple, report_path: Path
+):
+    """Load a Kedro project with the startup profiler enabled, including the first
+    serialisation of its graph, then write the profiler's report to the given file.
+    """
+    startup_profiler.enable()
+    try:
+        load_target(*load_args)
+    finally:
+        startup_profiler.disable()
+        startup_profiler.write_report(report_path)
+
+
+def _reap_workers(pids: List[int]):
+    """Wait for the given worker processes to exit."""
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            # already reaped
+            pass
+
+
+def _run_workers(app, host: str, port: int, workers: int):
+    """Serve the app from several worker processes forked from this one, so that
+    they share the already populated data repositories copy-on-write, instead of
+    each loading the Kedro project. Block until all workers have exited.
+    Terminating this process, e.g. by a process manager, terminates the workers.
+    """
+    # move every object allocated so far, e.g. the populated graph, out of reach of
+    # the garbage collector, so that collections in the workers don't write to,
+    # and thus copy, the memory pages they share with this process
+    gc.collect()
+    if hasattr(gc, "freeze"):  # Python 3.7+
+        gc.freeze()
+
+    config = uvicorn.Config(app, host=host, port=port)
+    sock = config.bind_socket()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                uvicorn.Server(config).run(sockets=[sock])
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+        pids.append(pid)
+
+    def stop_workers(signum: int, _frame=None):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    # forward SIGTERM to the workers, which exit gracefully, and keep waiting
+    # for them so that none is left behind. Handlers can only be set from the
+    # main thread, though.
+    previous_handler = None
+    try:
+        previous_handler = signal.signal(signal.SIGTERM, stop_workers)
+    except ValueError:  # pragma: no cover
+        pass
+    try:
+        _reap_workers(pids)
+    except KeyboardInterrupt:  # pragma: no cover
+        stop_workers(signal.SIGTERM)
+        _reap_workers(pids)
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+        sock.close()
 
 
 def run_server(
@@ -66,11 +714,18 @@ def run_server(
     port: int = _DEFAULT_PORT,
     browser: bool = None,
     load_file: str = None,
-    save_file: str = None,
-    pipeline_name: str = None,
-    env: str = None,
+    save_file: Optional[str] = None,
+    pipeline_name: Optional[str] = None,
+    env: Optional[str] = None,
     project_path: str = None,
-):
+    workers: int = 1,
+    isolated: bool = False,
+    watch: bool = False,
+    profile_startup: str = None,
+    cache: bool = False,
+    lazy_catalog: bool = False,
+    static_pipelines: bool = False,
+):  # pylint: disable=too-many-locals,too-many-branches
     """Run a uvicorn server with a FastAPI app that either launches API response data from a file
     or from reading data from a real Kedro project.
 
@@ -84,30 +739,135 @@ def run_server(
         pipeline_name: the optional name of the pipeline to visualise.
         env: the optional environment of the pipeline to visualise.
             If not provided, it will use Kedro's default, which is "local".
+            Several comma-separated environments can be given, e.g. "staging,prod",
+            in which case the first one is served by default and the others
+            can be selected with `?env=` on the API.
         project_path: the optional path of the Kedro project that contains the pipelines
             to visualise. If not supplied, the current working directory will be used.
+        workers: the number of worker processes serving the API. If more than one,
+            the project is loaded before the workers are forked, so that they share it.
+        isolated: whether to load the project in a separate process, so that only
+            its graph is kept in the server's memory.
+        watch: whether to reload the project when its `src` or `conf` directories
+            change, pushing the updates to the browsers.
+        profile_startup: if provided, loading the project is profiled and the report
+            is written to this JSON file, as well as served on `/api/debug/startup`.
+        cache: whether to cache the snapshot of the project's graph under the project,
+            from which it is restored rather than loaded until the project changes.
+        lazy_catalog: whether to create the catalog from its configuration alone,
+            only instantiating a dataset once the metadata of its node is requested.
+        static_pipelines: whether to extract the pipelines from the source of the
+            project rather than importing the code of their nodes, which is only
+            imported for the parts of the project too dynamic to be analysed.
+
+    Raises:
+        ValueError: if several workers can't be forked on this platform, or the
+            options given can't be combined.
     """
+    if workers > 1 and not hasattr(os, "fork"):
+        raise ValueError("Running several workers is not supported on this platform.")
+    if workers > 1 and watch:
+        raise ValueError("The project can't be watched when running several workers.")
+    if isolated and lazy_catalog:
+        raise ValueError(
+            "The catalog can't be created lazily when the project is isolated."
+        )
+    if isolated and static_pipelines:
+        raise ValueError(
+            "The pipelines can't be extracted statically when the project is isolated."
+        )
+
     if load_file is None:
         path = Path(project_path) if project_path else Path.cwd()
-        catalog, pipelines = kedro_data_loader.load_data(path, env)
-        pipelines = (
-            pipelines
-            if pipeline_name is None
-            else {pipeline_name: pipelines[pipeline_name]}
+        startup_status = StartupStatus(
+            _ISOLATED_STARTUP_PHASES if isolated else _STARTUP_PHASES
         )
-        populate_data(data_access_manager, catalog, pipelines)
-        if save_file:
-            res = responses.get_default_response()
-            Path(save_file).write_text(res.json(indent=4, sort_keys=True))
-
-        app = apps.create_api_app_from_project(path)
+        env_data_access_managers: Dict[str, DataAccessManager] = {}
+        app = apps.create_api_app_from_project(
+            path,
+            startup_status,
+            env_data_access_managers=env_data_access_managers,
+            graph_updates=GraphUpdates() if watch else None,
+            startup_profiler=startup_profiler if profile_startup else None,
+        )
+        snapshot_cache = SnapshotCache(path) if cache else None
+        load_target: Callable[..., None]
+        if isolated:
+            load_target = load_project_isolated
+            load_project_args: tuple = (
+                app,
+                startup_status,
+                path,
+                env,
+                pipeline_name,
+                save_file,
+                snapshot_cache,
+            )
+        else:
+            load_target = functools.partial(
+                load_project,
+                lazy_catalog=lazy_catalog,
+                static_pipelines=static_pipelines,
+            )
+            load_project_args = (
+                data_access_manager,
+                startup_status,
+                path,
+                env,
+                pipeline_name,
+                save_file,
+                env_data_access_managers,
+                snapshot_cache,
+            )
+        if profile_startup:
+            load_project_args = (
+                load_target,
+                load_project_args,
+                Path(profile_startup),
+            )
+            load_target = _profile_startup
+        if workers > 1:
+            # the workers are forked from the populated process, so the project
+            # is loaded first, along with the main graph response they all serve
+            load_target(*load_project_args)
+            responses.get_encoded_default_response(
+                manager=getattr(app.state, "data_access_manager", data_access_manager)
+            )
+        else:
+            # the project can take a long time to load, so it is loaded in the background
+            # while the server starts, which serves its progress on `/api/status`
+            threading.Thread(
+                target=load_target,
+                args=load_project_args,
+                name="kedro-viz-load-project",
+                daemon=True,
+            ).start()
+        if watch:
+            threading.Thread(
+                target=_watch_project,
+                args=(
+                    app,
+                    startup_status,
+                    path,
+                    env,
+                    pipeline_name,
+                    isolated,
+                    lazy_catalog,
+                    static_pipelines,
+                ),
+                name="kedro-viz-watch-project",
+                daemon=True,
+            ).start()
     else:
         app = apps.create_api_app_from_file(load_file)
 
     is_localhost = host in ("127.0.0.1", "localhost", "0.0.0.0")
     if browser and is_localhost:
         webbrowser.open_new(f"http://{host}:{port}/")
-    uvicorn.run(app, host=host, port=port)
+    if workers > 1:
+        _run_workers(app, host, port, workers)
+    else:
+        uvicorn.run(app, host=host, port=port)
 
 
 if __name__ == "__main__":  # pragma: no cover
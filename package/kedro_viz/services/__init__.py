@@ -27,3 +27,7 @@
 # limitations under the License.
 """`kedro_viz.services` provides an additional business logic layer for the API."""
 from . import layers as layers_services
+from .profiler import StartupProfiler, startup_profiler
+from .startup import StartupStatus
+from .updates import GraphUpdates
+from .watcher import ProjectWatcher
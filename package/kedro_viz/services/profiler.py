@@ -0,0 +1,259 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.services.profiler` profiles loading a Kedro project, recording the
+time and memory taken by each phase, so that a slow start can be explained.
+"""
+import functools
+import json
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from kedro_viz import __version__
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # not available on Windows, where the peak memory isn't reported
+    resource = None  # type: ignore
+
+# the kinds of items whose slowest ones are broken out in the report
+_ITEM_KINDS = ("pipelines", "datasets")
+
+# the CPU time of each phase is the one of the thread it runs in, as some phases
+# of loading the project run concurrently, e.g. creating the catalog
+_thread_time = getattr(time, "thread_time", time.process_time)
+
+
+def _get_peak_memory() -> Optional[int]:
+    """The peak resident memory of the process so far in bytes, if it's known."""
+    if resource is None:  # pragma: no cover
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports it in bytes and Linux in kilobytes
+    return peak_memory if sys.platform == "darwin" else peak_memory * 1024
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class PhaseProfile:
+    """The time and memory taken by a phase of loading a Kedro project."""
+
+    name: str
+
+    # the phase this one is part of, e.g. `load_project` for `load_context`
+    parent: Optional[str]
+
+    # when the phase started, in seconds since the profiling started
+    start: float
+
+    # the name of the thread the phase ran in
+    thread: str
+
+    wall_time: float
+    cpu_time: float
+
+    # the peak memory of the process at the end of the phase in bytes,
+    # and how much the phase raised it
+    peak_memory: Optional[int]
+    peak_memory_increase: Optional[int]
+
+
+def _get_overlaps(phases: List[PhaseProfile]) -> List[Dict[str, Any]]:
+    """How long the phases of the same parent ran concurrently in different threads,
+    e.g. `get_pipelines` and `create_catalog`, for each pair of such phases.
+    """
+    overlaps = []
+    for index, phase in enumerate(phases):
+        for other_phase in phases[index + 1 :]:
+            if phase.thread == other_phase.thread or phase.parent != other_phase.parent:
+                continue
+            overlap = (
+                min(
+                    phase.start + phase.wall_time,
+                    other_phase.start + other_phase.wall_time,
+                )
+                - max(phase.start, other_phase.start)
+            )
+            if overlap > 0:
+                overlaps.append(
+                    {"phases": [phase.name, other_phase.name], "wall_time": overlap}
+                )
+    return overlaps
+
+
+class _NoProfiling:
+    """The context manager used instead of profiling when the profiler is disabled,
+    which is cheap enough to wrap every dataset and pipeline.
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PROFILING = _NoProfiling()
+
+
+class StartupProfiler:
+    """Profile the phases of loading a Kedro project, and the pipelines and datasets
+    taking the longest to load, once enabled, e.g. with `--profile-startup`.
+    """
+
+    def __init__(self, top_count: int = 10):
+        self.top_count = top_count
+        self.enabled = False
+        self.phases: List[PhaseProfile] = []
+        self.items: Dict[str, Dict[str, float]] = {kind: {} for kind in _ITEM_KINDS}
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        """Start profiling, discarding the previous profiles."""
+        with self._lock:
+            self.phases = []
+            self.items = {kind: {} for kind in _ITEM_KINDS}
+            self._started_at = time.perf_counter()
+        self.enabled = True
+
+    def disable(self):
+        """Stop profiling, keeping the profiles for the report."""
+        self.enabled = False
+
+    def phase(self, name: str) -> ContextManager:
+        """Profile a phase of loading the project for the duration of the context.
+        Phases can be nested, in which case the outer one is recorded as the parent.
+        """
+        if not self.enabled:
+            return _NO_PROFILING
+        return self._profile_phase(name)
+
+    def bind(self, func: Callable) -> Callable:
+        """Bind a function to the current phase, so that the phases it profiles
+        are recorded as part of it when it's run in another thread.
+        """
+        stack = list(self._local.__dict__.get("stack", []))
+
+        @functools.wraps(func)
+        def bound_func(*args, **kwargs):
+            previous_stack = self._local.__dict__.get("stack")
+            self._local.stack = list(stack)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.stack = previous_stack or []
+
+        return bound_func
+
+    @contextmanager
+    def _profile_phase(self, name: str) -> Iterator[None]:
+        stack = self._local.__dict__.setdefault("stack", [])
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        peak_memory_before = _get_peak_memory()
+        started_at = time.perf_counter()
+        cpu_started_at = _thread_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - started_at
+            cpu_time = _thread_time() - cpu_started_at
+            stack.pop()
+            peak_memory = _get_peak_memory()
+            profile = PhaseProfile(
+                name=name,
+                parent=parent,
+                start=started_at - self._started_at,
+                thread=threading.current_thread().name,
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                peak_memory=peak_memory,
+                peak_memory_increase=(
+                    None
+                    if peak_memory is None or peak_memory_before is None
+                    else peak_memory - peak_memory_before
+                ),
+            )
+            with self._lock:
+                self.phases.append(profile)
+
+    def item(self, kind: str, name: str) -> ContextManager:
+        """Time loading an item of the project for the duration of the context,
+        e.g. a pipeline or a dataset, adding up the times of the same item.
+        """
+        if not self.enabled:
+            return _NO_PROFILING
+        return self._profile_item(kind, name)
+
+    @contextmanager
+    def _profile_item(self, kind: str, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - started_at
+            with self._lock:
+                items = self.items.setdefault(kind, {})
+                items[name] = items.get(name, 0.0) + wall_time
+
+    def report(self) -> Dict[str, Any]:
+        """The profiles of the phases, in the order they started, how long the ones
+        running concurrently overlapped, and the slowest pipelines and datasets.
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase.start)
+            report: Dict[str, Any] = {
+                "kedro_viz_version": __version__,
+                "python_version": platform.python_version(),
+                "phases": [asdict(phase) for phase in phases],
+                "overlaps": _get_overlaps(phases),
+            }
+            for kind, items in self.items.items():
+                slowest_items = sorted(
+                    items.items(), key=lambda item: item[1], reverse=True
+                )
+                report[f"slowest_{kind}"] = [
+                    {"name": name, "wall_time": wall_time}
+                    for name, wall_time in slowest_items[: self.top_count]
+                ]
+        return report
+
+    def write_report(self, path: Path):
+        """Write the report as JSON to the given file."""
+        path.write_text(json.dumps(self.report(), indent=4))
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,136 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.services.startup` tracks the progress of loading a Kedro project,
+which happens in the background while the server already responds to requests.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .profiler import startup_profiler
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class StartupPhase:
+    """Represent a phase of loading a Kedro project, e.g. adding its pipelines"""
+
+    name: str
+    status: str = PENDING
+
+    # how long the phase took in seconds, or has been running for so far
+    duration: Optional[float] = None
+
+    # when the phase started, as given by `time.perf_counter`
+    started_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The phase as reported by `/api/status`."""
+        duration = self.duration
+        if self.status == RUNNING and self.started_at is not None:
+            duration = time.perf_counter() - self.started_at
+        return {"name": self.name, "status": self.status, "duration": duration}
+
+
+class StartupStatus:
+    """Track the phases of loading a Kedro project, so that the API can report
+    the progress and refuse to serve the graph until it is fully loaded.
+    """
+
+    def __init__(self, phase_names: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.phases: List[StartupPhase] = [StartupPhase(name) for name in phase_names]
+        self.error: Optional[str] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the project is fully loaded."""
+        return self._ready.is_set()
+
+    @property
+    def has_failed(self) -> bool:
+        """Whether loading the project failed."""
+        return self.error is not None
+
+    def set_ready(self):
+        """Mark the project as fully loaded."""
+        self._ready.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the project is loaded, or the timeout has passed.
+        Return whether the project is loaded.
+        """
+        return self._ready.wait(timeout)
+
+    def _get_phase(self, name: str) -> StartupPhase:
+        with self._lock:
+            for phase in self.phases:
+                if phase.name == name:
+                    return phase
+            phase = StartupPhase(name)
+            self.phases.append(phase)
+            return phase
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[StartupPhase]:
+        """Track a phase of loading the project for the duration of the context.
+        If an exception is raised, the phase and the whole loading are marked as failed.
+        The phase is also profiled if the startup profiler is enabled.
+        """
+        phase = self._get_phase(name)
+        phase.started_at = time.perf_counter()
+        phase.status = RUNNING
+        try:
+            with startup_profiler.phase(name):
+                yield phase
+        except Exception as exc:
+            phase.duration = time.perf_counter() - phase.started_at
+            phase.status = FAILED
+            self.error = f"{type(exc).__name__}: {exc}"
+            raise
+        phase.duration = time.perf_counter() - phase.started_at
+        phase.status = DONE
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The status as reported by `/api/status`."""
+        if self.is_ready:
+            status = "ready"
+        elif self.has_failed:
+            status = FAILED
+        else:
+            status = "loading"
+        with self._lock:
+            phases = [phase.as_dict() for phase in self.phases]
+        return {"status": status, "phases": phases, "error": self.error}
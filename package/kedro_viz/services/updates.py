@@ -0,0 +1,78 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.services.updates` notifies the API's clients when the graph is reloaded,
+e.g. when the Kedro project changed in watch mode.
+"""
+import asyncio
+import threading
+from typing import Any, Dict, Set, Tuple
+
+
+class GraphUpdates:
+    """Publish graph updates from any thread to the subscribers,
+    which each receive them through an asyncio queue on their own event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Subscribe to the updates from a coroutine, returning the queue
+        on which they will be put.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.add((asyncio.get_event_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop putting the updates on the given queue."""
+        with self._lock:
+            self._subscribers = {
+                subscriber for subscriber in self._subscribers if subscriber[1] != queue
+            }
+
+    def publish(self, event: Dict[str, Any]):
+        """Put an event on the queue of every subscriber. The subscribers whose
+        event loop is closed, e.g. because their server stopped, are unsubscribed.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # the loop is closed, so the subscriber can't receive anything anymore
+                self.unsubscribe(queue)
+
+    @property
+    def subscribers_count(self) -> int:
+        """The number of current subscribers."""
+        with self._lock:
+            return len(self._subscribers)
@@ -0,0 +1,122 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""`kedro_viz.services.watcher` watches the files of a Kedro project,
+so that it can be reloaded when they change.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# the state of a watched file, i.e. its modification time and size
+_FileState = Tuple[int, int]
+
+
+class ProjectWatcher:
+    """Poll the files under the given directories for changes, calling back with
+    the changed paths once they have stopped changing for the debounce period,
+    so that e.g. saving several files at once results in a single call.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        callback: Callable[[Set[Path]], None],
+        interval: float = 1.0,
+        debounce: float = 0.5,
+    ):
+        self.paths = list(paths)
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._stopped = threading.Event()
+
+    def scan(self) -> Dict[Path, _FileState]:
+        """Get the state of every watched file,
+        ignoring hidden files and Python's bytecode caches.
+        """
+        files = {}
+        for path in self.paths:
+            for root, dirs, filenames in os.walk(path):
+                dirs[:] = [
+                    d for d in dirs if not d.startswith(".") and d != "__pycache__"
+                ]
+                for filename in filenames:
+                    if filename.startswith("."):
+                        continue
+                    filepath = Path(root) / filename
+                    try:
+                        stat = filepath.stat()
+                    except OSError:  # pragma: no cover
+                        # the file was removed while scanning
+                        continue
+                    files[filepath] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    @staticmethod
+    def diff(
+        before: Dict[Path, _FileState], after: Dict[Path, _FileState]
+    ) -> Set[Path]:
+        """Get the paths of the files added, removed or modified between two scans."""
+        return {
+            path
+            for path in before.keys() | after.keys()
+            if before.get(path) != after.get(path)
+        }
+
+    def run(self):
+        """Watch the files until stopped."""
+        files = self.scan()
+        while not self._stopped.wait(self.interval):
+            latest = self.scan()
+            changed = self.diff(files, latest)
+            if not changed:
+                continue
+
+            # wait for the files to stop changing before calling back
+            while not self._stopped.wait(self.debounce):
+                files, latest = latest, self.scan()
+                more_changed = self.diff(files, latest)
+                if not more_changed:
+                    break
+                changed |= more_changed
+            else:
+                return
+
+            files = latest
+            try:
+                self.callback(changed)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Failed to handle the changes of the project.")
+
+    def stop(self):
+        """Stop watching the files."""
+        self._stopped.set()
@@ -71,6 +71,7 @@ setup(
     python_requires=">=3.6, <3.9",
     install_requires=requires,
     tests_require=test_requires,
+    extras_require={"orjson": ["orjson>=3.0"]},
     keywords="pipelines, machine learning, data pipelines, data science, data engineering, visualisation",
     author="QuantumBlack Labs",
     packages=find_packages(exclude=["tests*", "features*"]),
@@ -25,20 +25,26 @@
 #
 # See the License for the specific language governing permissions and
 # limitations under the License.
+# pylint: disable=too-many-lines
+import asyncio
+import gzip
+import json
 import operator
 from pathlib import Path
 from typing import Dict
 from unittest import mock
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from kedro.io import DataCatalog
 from kedro.pipeline import Pipeline
 
-from kedro_viz.api import apps
+from kedro_viz.api import apps, responses, serializers
 from kedro_viz.data_access.managers import DataAccessManager
-from kedro_viz.models.graph import TaskNode
-from kedro_viz.server import populate_data
+from kedro_viz.models.graph import DataNode, GraphEdge, TaskNode
+from kedro_viz.server import populate_data, populate_env_data
+from kedro_viz.services import GraphUpdates, StartupProfiler, StartupStatus
 
 
 @pytest.fixture
@@ -206,6 +212,81 @@ class TestIndexEndpoint:
         assert 'heap.load("my_heap_app")' in response.text
         assert 'heap.identify("my_heap_identity")' in response.text
 
+    def test_index_rendered_once(self, mocker, tmp_path):
+        get_heap_app_id = mocker.patch(
+            "kedro_viz.integrations.kedro.telemetry.get_heap_app_id",
+            return_value=None,
+        )
+        client = TestClient(apps.create_api_app_from_project(tmp_path))
+        assert client.get("/").text == client.get("/").text
+        get_heap_app_id.assert_called_once_with(tmp_path)
+
+    @mock.patch("kedro_viz.integrations.kedro.telemetry.get_heap_identity")
+    def test_index_rendered_again_on_telemetry_change(
+        self, mock_get_heap_identity, mocker, tmp_path
+    ):
+        mock_get_heap_identity.return_value = "my_heap_identity"
+        mocker.patch(
+            "kedro_viz.integrations.kedro.telemetry.get_heap_app_id",
+            side_effect=lambda project_path: (
+                "my_heap_app" if (project_path / ".telemetry").exists() else None
+            ),
+        )
+        client = TestClient(apps.create_api_app_from_project(tmp_path))
+        assert "heap" not in client.get("/").text
+        (tmp_path / ".telemetry").write_text("consent: true")
+        assert 'heap.load("my_heap_app")' in client.get("/").text
+
+
+class TestStaticFiles:
+    @pytest.fixture
+    def static_client(self, tmp_path):
+        (tmp_path / "main.abc123.js").write_text("console.log('viz');")
+        (tmp_path / "main.abc123.js.gz").write_bytes(
+            gzip.compress(b"console.log('viz');")
+        )
+        (tmp_path / "logo.abc123.png").write_bytes(b"png")
+        app = FastAPI()
+        app.mount("/static", apps.PrecompressedStaticFiles(directory=tmp_path))
+        yield TestClient(app)
+
+    def test_precompressed_file(self, static_client):
+        response = static_client.get(
+            "/static/main.abc123.js", headers={"Accept-Encoding": "gzip, br"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "javascript" in response.headers["content-type"]
+        assert "immutable" in response.headers["cache-control"]
+        assert response.text == "console.log('viz');"
+
+    @pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0, br"])
+    def test_gzip_not_accepted(self, static_client, accept_encoding):
+        response = static_client.get(
+            "/static/main.abc123.js", headers={"Accept-Encoding": accept_encoding}
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.text == "console.log('viz');"
+
+    def test_uncompressed_file(self, static_client):
+        response = static_client.get("/static/logo.abc123.png")
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert "immutable" in response.headers["cache-control"]
+        assert response.content == b"png"
+
+    def test_precompressed_file_not_modified(self, static_client):
+        response = static_client.get("/static/main.abc123.js")
+        response = static_client.get(
+            "/static/main.abc123.js",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+        assert "immutable" in response.headers["cache-control"]
+
 
 class TestMainEndpoint:
     """Test a viz API created from a Kedro project."""
@@ -215,6 +296,186 @@ class TestMainEndpoint:
         assert response.status_code == 200
         assert_example_data(response.json())
 
+    def test_endpoint_main_gzipped(self, client):
+        response = client.get("/api/main", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert_example_data(response.json())
+
+    def test_endpoint_main_not_gzipped(self, client):
+        response = client.get("/api/main", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert_example_data(response.json())
+
+    @pytest.mark.parametrize("accept_encoding", ["gzip", "identity"])
+    def test_endpoint_main_not_modified(self, client, accept_encoding):
+        headers = {"Accept-Encoding": accept_encoding}
+        response = client.get("/api/main", headers=headers)
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "no-cache"
+
+        response = client.get("/api/main", headers={"If-None-Match": etag, **headers})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert not response.content
+
+    @pytest.mark.parametrize(
+        "if_none_match_template", ["*", "{tag}", "W/{tag}", '"other", W/{tag}']
+    )
+    def test_endpoint_main_if_none_match_variants(self, client, if_none_match_template):
+        tag = client.get("/api/main").headers["etag"].replace("W/", "", 1)
+        response = client.get(
+            "/api/main",
+            headers={"If-None-Match": if_none_match_template.format(tag=tag)},
+        )
+        assert response.status_code == 304
+
+    def test_endpoint_main_modified(self, client):
+        etag = client.get("/api/main").headers["etag"]
+        response = client.get("/api/main", headers={"If-None-Match": '"outdated"'})
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag
+
+    def test_etag_is_per_encoding(self, client):
+        gzip_etag = client.get(
+            "/api/main", headers={"Accept-Encoding": "gzip"}
+        ).headers["etag"]
+        identity_etag = client.get(
+            "/api/main", headers={"Accept-Encoding": "identity"}
+        ).headers["etag"]
+        # each encoding has its own strong ETag
+        assert gzip_etag == f'{identity_etag[:-1]}-gz"'
+        assert not identity_etag.startswith("W/")
+
+        response = client.get(
+            "/api/main",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": identity_etag},
+        )
+        assert response.status_code == 200
+
+    def test_gzip_can_be_refused(self, client):
+        response = client.get("/api/main", headers={"Accept-Encoding": "gzip;q=0"})
+        assert "content-encoding" not in response.headers
+        assert not response.headers["etag"].endswith('-gz"')
+
+    def test_endpoint_main_is_serialised_once(self, client, mocker):
+        spy = mocker.spy(serializers, "serialize_graph")
+        client.get("/api/main")
+        client.get("/api/main")
+        assert spy.call_count == 1
+
+
+class TestMainPatchEndpoint:
+    @pytest.fixture(autouse=True)
+    def graph_version(self, client, data_access_manager):
+        # the versions are retained once the project is loaded
+        return responses.add_graph_version(data_access_manager).digest
+
+    def test_graph_version_header(self, client):
+        for accept_encoding in ("gzip", "identity"):
+            response = client.get(
+                "/api/main", headers={"Accept-Encoding": accept_encoding}
+            )
+            version = response.headers["x-graph-version"]
+            suffix = "-gz" if accept_encoding == "gzip" else ""
+            assert response.headers["etag"] == f'"{version}{suffix}"'
+
+    def test_versions_are_summarised(self, client, data_access_manager):
+        version = client.get("/api/main").headers["x-graph-version"]
+        summary = data_access_manager.graph_versions.get_version(version)
+        # only a hash of each node is retained, rather than the whole node
+        assert all(
+            isinstance(node_hash, bytes) and len(node_hash) == 8
+            for node_hash in summary["nodes"].values()
+        )
+
+    def test_no_changes(self, client):
+        version = client.get("/api/main").headers["x-graph-version"]
+        response = client.get("/api/main", params={"since": version})
+        assert response.status_code == 200
+        assert response.json() == {
+            "base_version": version,
+            "version": version,
+            "nodes": {"added": [], "changed": [], "removed": []},
+            "edges": {"added": [], "removed": []},
+        }
+
+    def test_changes_since_version(self, client, data_access_manager):
+        base = client.get("/api/main")
+        base_version = base.headers["x-graph-version"]
+
+        renamed_node = data_access_manager.nodes.get_node_by_id("56118ad8")
+        renamed_node.name = "Renamed"
+        data_access_manager.edges.add_edge(GraphEdge("56118ad8", "d5a8b994"))
+        removed_edge = data_access_manager.edges.edges_list.pop(0)
+        data_access_manager.edges.edges_set.remove(removed_edge)
+        data_access_manager.set_layers(["model_inputs"])
+
+        current = client.get("/api/main")
+        assert current.headers["x-graph-version"] != base_version
+        response = client.get("/api/main", params={"since": base_version})
+        patch = response.json()
+        assert patch["base_version"] == base_version
+        assert patch["version"] == current.headers["x-graph-version"]
+        assert patch["nodes"]["added"] == []
+        assert patch["nodes"]["removed"] == []
+        assert [node["name"] for node in patch["nodes"]["changed"]] == ["Renamed"]
+        assert patch["edges"] == {
+            "added": [{"source": "56118ad8", "target": "d5a8b994"}],
+            "removed": [base.json()["edges"][0]],
+        }
+        assert patch["layers"] == ["model_inputs"]
+        assert "tags" not in patch
+
+    def test_revisions_do_not_evict_versions(
+        self, client, data_access_manager, graph_version
+    ):
+        for layer in range(data_access_manager.graph_versions.max_versions + 1):
+            data_access_manager.set_layers([str(layer)])
+            client.get("/api/main")
+        assert list(data_access_manager.graph_versions.versions) == [graph_version]
+
+    def test_unknown_version_falls_back_to_full_graph(self, client):
+        response = client.get("/api/main", params={"since": "foo"})
+        assert response.status_code == 200
+        assert "base_version" not in response.json()
+        assert_example_data(response.json())
+
+    def test_patch_not_modified(self, client):
+        version = client.get("/api/main").headers["x-graph-version"]
+        etag = client.get("/api/main", params={"since": version}).headers["etag"]
+        response = client.get(
+            "/api/main", params={"since": version}, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_since_cannot_be_combined(self, client):
+        version = client.get("/api/main").headers["x-graph-version"]
+        response = client.get("/api/main", params={"since": version, "limit": 2})
+        assert response.status_code == 400
+
+
+class TestCompactMainEndpoint:
+    def test_compact_graph(self, client):
+        expected = client.get("/api/main").json()
+        response = client.get("/api/v2/main")
+        assert response.status_code == 200
+        compact = response.json()
+        strings, node_ids = compact["strings"], compact["nodes"]["id"]
+        assert [strings[index] for index in node_ids] == [
+            node["id"] for node in expected["nodes"]
+        ]
+        assert [
+            {"source": strings[node_ids[source]], "target": strings[node_ids[target]]}
+            for source, target in compact["edges"]
+        ] == expected["edges"]
+        assert len(response.content) < len(client.get("/api/main").content)
+
+    def test_compact_graph_not_modified(self, client):
+        etag = client.get("/api/v2/main").headers["etag"]
+        assert etag != client.get("/api/main").headers["etag"]
+        response = client.get("/api/v2/main", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
 
 class TestNodeMetadataEndpoint:
     def test_node_not_exist(self, client):
@@ -257,11 +518,117 @@ class TestNodeMetadataEndpoint:
         response = client.get("/api/nodes/c506f374")
         assert response.json() == {"parameters": {"train_test_split": 0.1}}
 
+    def test_node_metadata_not_modified(self, client):
+        etag = client.get("/api/nodes/56118ad8").headers["etag"]
+        response = client.get("/api/nodes/56118ad8", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_node_metadata_etag_is_per_node(self, client):
+        task_etag = client.get("/api/nodes/56118ad8").headers["etag"]
+        data_etag = client.get("/api/nodes/0ecea0de").headers["etag"]
+        assert task_etag != data_etag
+
+    def test_plot_node_metadata_has_no_etag(self, client):
+        with mock.patch.object(DataNode, "is_plot_node", return_value=True):
+            response = client.get("/api/nodes/0ecea0de")
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+
     def test_no_metadata(self, client):
         with mock.patch.object(TaskNode, "has_metadata", return_value=False):
             response = client.get("/api/nodes/56118ad8")
         assert response.json() == {}
 
+    def test_precomputed_metadata(self, data_access_manager, example_pipelines):
+        populate_data(data_access_manager, DataCatalog(), example_pipelines)
+        restored = DataAccessManager()
+        restored.add_snapshot(
+            data_access_manager.create_snapshot(
+                {"0ecea0de": {"filepath": "model_inputs.csv"}}
+            )
+        )
+        client = TestClient(
+            apps.create_api_app_from_project(
+                mock.MagicMock(), data_access_manager=restored
+            )
+        )
+        response = client.get("/api/nodes/0ecea0de")
+        assert response.json() == {"filepath": "model_inputs.csv"}
+        response = client.get("/api/nodes?ids=0ecea0de")
+        assert response.json()["nodes"] == {
+            "0ecea0de": {"filepath": "model_inputs.csv"}
+        }
+        # the nodes without precomputed metadata have none
+        assert client.get("/api/nodes/56118ad8").json() == {}
+
+    def test_live_metadata(
+        self, data_access_manager, example_catalog, example_pipelines
+    ):
+        populate_data(data_access_manager, example_catalog, example_pipelines)
+        restored = DataAccessManager()
+        restored.add_snapshot(data_access_manager.create_snapshot())
+        restored.live_loader = mock.Mock(return_value=data_access_manager)
+        client = TestClient(
+            apps.create_api_app_from_project(
+                mock.MagicMock(), data_access_manager=restored
+            )
+        )
+        response = client.get("/api/nodes/56118ad8")
+        assert response.json()["parameters"] == {"train_test_split": 0.1}
+        response = client.get("/api/nodes?ids=0ecea0de")
+        assert response.json()["nodes"]["0ecea0de"]["filepath"] == "model_inputs.csv"
+        # the project is loaded by the first request only
+        restored.live_loader.assert_called_once()
+
+
+class TestNodesMetadataEndpoint:
+    node_ids = ["56118ad8", "0ecea0de", "13399a82", "f1f1425b", "c506f374"]
+
+    def test_get_nodes_metadata(self, client):
+        response = client.get("/api/nodes", params={"ids": ",".join(self.node_ids)})
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data["nodes"]) == self.node_ids
+        assert data["nodes"] == {
+            node_id: client.get(f"/api/nodes/{node_id}").json()
+            for node_id in self.node_ids
+        }
+        assert data["errors"] == {}
+
+    def test_post_nodes_metadata(self, client):
+        response = client.post("/api/nodes", json={"ids": self.node_ids})
+        assert response.status_code == 200
+        assert (
+            response.json()
+            == client.get("/api/nodes", params={"ids": ",".join(self.node_ids)}).json()
+        )
+
+    def test_errors_are_reported_per_node(self, client):
+        with mock.patch(
+            "kedro_viz.api.responses.DataNodeMetadata",
+            side_effect=RuntimeError("broken dataset"),
+        ):
+            response = client.get(
+                "/api/nodes", params={"ids": "foo,56118ad8,0ecea0de,56118ad8"}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data["nodes"]) == ["56118ad8"]
+        assert data["errors"] == {
+            "foo": "Invalid node ID",
+            "0ecea0de": "RuntimeError: broken dataset",
+        }
+
+    def test_no_metadata(self, client):
+        with mock.patch.object(TaskNode, "has_metadata", return_value=False):
+            response = client.get("/api/nodes", params={"ids": "56118ad8"})
+        assert response.json() == {"nodes": {"56118ad8": {}}, "errors": {}}
+
+    def test_ids_are_required(self, client):
+        assert client.get("/api/nodes").status_code == 422
+        assert client.post("/api/nodes", json={}).status_code == 422
+
 
 class TestSinglePipelineEndpoint:
     def test_get_pipeline(self, client):
@@ -338,10 +705,477 @@ class TestSinglePipelineEndpoint:
             "selected_pipeline": "data_science",
         }
 
+    def test_get_pipeline_not_modified(self, client):
+        etag = client.get("/api/pipelines/data_science").headers["etag"]
+        assert etag != client.get("/api/main").headers["etag"]
+        response = client.get(
+            "/api/pipelines/data_science", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_get_pipeline_is_serialised_once(self, client, mocker):
+        spy = mocker.spy(serializers, "serialize_graph")
+        client.get("/api/pipelines/data_science")
+        client.get("/api/pipelines/data_science")
+        client.get("/api/pipelines/data_processing")
+        assert spy.call_count == 2
+
     def test_get_non_existing_pipeline(self, client):
         response = client.get("/api/pipelines/foo")
         assert response.status_code == 404
 
+    def test_pending_pipeline_is_populated_on_request(
+        self, example_pipelines, example_catalog
+    ):
+        manager = DataAccessManager()
+        populate_data(manager, example_catalog, example_pipelines, lazy=True)
+        eager_manager = DataAccessManager()
+        populate_data(eager_manager, example_catalog, example_pipelines)
+        client = TestClient(
+            apps.create_api_app_from_project(mock.MagicMock(), None, manager)
+        )
+        assert "data_science" in manager.pending_pipelines
+
+        response = client.get("/api/pipelines/data_science")
+        assert response.status_code == 200
+        assert "data_science" not in manager.pending_pipelines
+        assert "data_processing" in manager.pending_pipelines
+        assert {node["id"] for node in response.json()["nodes"]} == (
+            eager_manager.registered_pipelines.get_node_ids_by_pipeline_id(
+                "data_science"
+            )
+        )
+
+
+def read_ndjson(response):
+    """Reassemble a graph response from its NDJSON records."""
+    data = {"nodes": [], "edges": []}
+    for line in response.text.splitlines():
+        record = json.loads(line)
+        if "node" in record:
+            data["nodes"].append(record["node"])
+        elif "edge" in record:
+            data["edges"].append(record["edge"])
+        else:
+            data.update(record)
+    return data
+
+
+def read_pages(client, url, limit):
+    """Reassemble a graph response from all of its pages."""
+    data = {"nodes": [], "edges": []}
+    params = {"limit": limit}
+    while True:
+        page = client.get(url, params=params).json()
+        assert len(page["nodes"]) + len(page["edges"]) <= limit
+        data["nodes"].extend(page.pop("nodes"))
+        data["edges"].extend(page.pop("edges"))
+        next_cursor = page.pop("next_cursor")
+        data.update(page)
+        if next_cursor is None:
+            return data
+        params["cursor"] = next_cursor
+
+
+class TestStreamingEndpoints:
+    def test_main_as_ndjson(self, client):
+        response = client.get("/api/main", params={"format": "ndjson"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert_example_data(read_ndjson(response))
+
+    def test_pipeline_as_ndjson(self, client):
+        response = client.get(
+            "/api/pipelines/data_science", params={"format": "ndjson"}
+        )
+        assert read_ndjson(response) == client.get("/api/pipelines/data_science").json()
+
+    def test_ndjson_cannot_be_paginated(self, client):
+        response = client.get("/api/main", params={"format": "ndjson", "limit": 2})
+        assert response.status_code == 400
+
+    def test_invalid_format(self, client):
+        response = client.get("/api/main", params={"format": "xml"})
+        assert response.status_code == 422
+
+
+class TestPaginatedEndpoints:
+    @pytest.mark.parametrize("limit", [1, 3, 7, 100])
+    def test_main_paginated(self, client, limit):
+        assert_example_data(read_pages(client, "/api/main", limit))
+
+    @pytest.mark.parametrize("limit", [1, 2, 5])
+    def test_pipeline_paginated(self, client, limit):
+        expected = client.get("/api/pipelines/data_science").json()
+        assert read_pages(client, "/api/pipelines/data_science", limit) == expected
+
+    def test_pages_follow_repository_order(self, client):
+        expected = client.get("/api/main").json()
+        first_page = client.get("/api/main", params={"limit": 8}).json()
+        assert first_page["nodes"] == expected["nodes"][:7]
+        assert first_page["edges"] == expected["edges"][:1]
+
+    @pytest.mark.parametrize(
+        "cursor", ["foo", "outdated:3", "{revision}:x", "{unknown_revision}:1"]
+    )
+    def test_invalid_cursor(self, client, cursor):
+        first_page = client.get("/api/main", params={"limit": 1}).json()
+        revision = int(first_page["next_cursor"].split(":")[0])
+        response = client.get(
+            "/api/main",
+            params={
+                "limit": 1,
+                "cursor": cursor.format(
+                    revision=revision, unknown_revision=revision + 1
+                ),
+            },
+        )
+        assert response.status_code == 400
+
+    def test_cursor_holds_revision_and_offset(self, client, data_access_manager):
+        first_page = client.get("/api/main", params={"limit": 3}).json()
+        assert first_page["next_cursor"] == f"{data_access_manager.revision}:3"
+
+    def test_expired_revision(self, client, data_access_manager, mocker):
+        mocker.patch("kedro_viz.api.responses.graph_pages.max_revisions", 1)
+        first_page = client.get("/api/main", params={"limit": 1}).json()
+        data_access_manager.revision += 1
+        client.get("/api/main", params={"limit": 1})
+        response = client.get(
+            "/api/main", params={"limit": 1, "cursor": first_page["next_cursor"]}
+        )
+        assert response.status_code == 400
+
+    def test_only_page_is_converted(self, client, mocker):
+        client.get("/api/main")
+        spy = mocker.spy(serializers, "serialize_node")
+        client.get("/api/main", params={"limit": 2})
+        assert spy.call_count == 2
+
+    def test_cursor_survives_pending_pipelines(
+        self, example_pipelines, example_catalog
+    ):
+        manager = DataAccessManager()
+        populate_data(manager, example_catalog, example_pipelines, lazy=True)
+        client = TestClient(
+            apps.create_api_app_from_project(mock.MagicMock(), None, manager)
+        )
+        first_page = client.get("/api/main", params={"limit": 1}).json()
+        expected = client.get("/api/main").json()
+        manager.populate_pending_pipelines()
+        assert client.get("/api/main").json() != expected
+
+        page = client.get(
+            "/api/main", params={"limit": 100, "cursor": first_page["next_cursor"]}
+        ).json()
+        # the walk goes through the nodes and edges there were on its first page,
+        # as they are now
+        assert [node["id"] for node in first_page["nodes"] + page["nodes"]] == [
+            node["id"] for node in expected["nodes"]
+        ]
+        assert page["edges"] == expected["edges"]
+        # a new walk goes through the populated graph
+        assert read_pages(client, "/api/main", 1) == client.get("/api/main").json()
+
+
+class TestSparseFieldsets:
+    def test_main_with_fields(self, client):
+        expected = client.get("/api/main").json()
+        response = client.get("/api/main", params={"fields": "name,type"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["nodes"] == [
+            {"id": node["id"], "name": node["name"], "type": node["type"]}
+            for node in expected["nodes"]
+        ]
+        # edges are kept whole unless one of their fields is requested
+        assert data["edges"] == expected["edges"]
+        assert data["pipelines"] == expected["pipelines"]
+
+    def test_edge_fields(self, client):
+        expected = client.get("/api/main").json()
+        data = client.get("/api/main", params={"fields": "id,source"}).json()
+        assert data["nodes"] == [{"id": node["id"]} for node in expected["nodes"]]
+        assert data["edges"] == [
+            {"source": edge["source"]} for edge in expected["edges"]
+        ]
+
+    def test_pipeline_with_fields(self, client):
+        expected = client.get("/api/pipelines/data_science").json()
+        data = client.get(
+            "/api/pipelines/data_science", params={"fields": "layer"}
+        ).json()
+        assert data["nodes"] == [
+            {key: node[key] for key in ("id", "layer") if key in node}
+            for node in expected["nodes"]
+        ]
+
+    def test_unknown_field(self, client):
+        response = client.get("/api/main", params={"fields": "name,foo"})
+        assert response.status_code == 400
+        assert response.json()["message"].startswith("Unknown fields: foo.")
+
+    def test_projection_serialised_once(self, client, mocker):
+        spy = mocker.spy(serializers, "serialize_graph")
+        client.get("/api/main", params={"fields": "name,type"})
+        # the same projection in a different order is served from the cache
+        client.get("/api/main", params={"fields": "type,name,id"})
+        client.get("/api/main", params={"fields": "name"})
+        # the full graph is serialised once too, to identify its version
+        assert spy.call_count == 3
+
+    def test_projection_has_its_own_etag(self, client):
+        full_etag = client.get("/api/main").headers["etag"]
+        response = client.get("/api/main", params={"fields": "name"})
+        assert response.headers["etag"] != full_etag
+        response = client.get(
+            "/api/main",
+            params={"fields": "name"},
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+
+    def test_fields_with_ndjson_and_pages(self, client):
+        expected = client.get("/api/main", params={"fields": "name"}).json()
+        response = client.get(
+            "/api/main", params={"fields": "name", "format": "ndjson"}
+        )
+        assert read_ndjson(response) == expected
+        response = client.get("/api/main", params={"fields": "name", "limit": 100})
+        page = response.json()
+        page.pop("next_cursor")
+        assert page == expected
+
+
+class TestStartupStatus:
+    @pytest.fixture
+    def startup_status(self):
+        yield StartupStatus(["load_project", "add_pipelines"])
+
+    @pytest.fixture
+    def loading_client(self, startup_status, data_access_manager):
+        api = apps.create_api_app_from_project(mock.MagicMock(), startup_status)
+        with mock.patch(
+            "kedro_viz.api.responses.data_access_manager", new=data_access_manager
+        ), mock.patch(
+            "kedro_viz.api.router.data_access_manager", new=data_access_manager
+        ):
+            yield TestClient(api)
+
+    def test_status_without_startup_status(self, client):
+        response = client.get("/api/status")
+        assert response.json() == {"status": "ready", "phases": [], "error": None}
+
+    def test_status_while_loading(self, loading_client, startup_status):
+        with startup_status.phase("load_project"):
+            pass
+        response = loading_client.get("/api/status")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "loading"
+        assert [(p["name"], p["status"]) for p in data["phases"]] == [
+            ("load_project", "done"),
+            ("add_pipelines", "pending"),
+        ]
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/main",
+            "/api/v2/main",
+            "/api/nodes/56118ad8",
+            "/api/nodes?ids=56118ad8",
+            "/api/pipelines/data_science",
+        ],
+    )
+    def test_graph_not_served_while_loading(self, loading_client, url):
+        response = loading_client.get(url)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    def test_graph_served_once_loaded(
+        self,
+        loading_client,
+        startup_status,
+        data_access_manager,
+        example_catalog,
+        example_pipelines,
+    ):
+        populate_data(data_access_manager, example_catalog, example_pipelines)
+        startup_status.set_ready()
+        assert loading_client.get("/api/status").json()["status"] == "ready"
+        response = loading_client.get("/api/main")
+        assert response.status_code == 200
+        assert_example_data(response.json())
+
+    def test_graph_not_served_if_loading_failed(self, loading_client, startup_status):
+        with pytest.raises(ValueError):
+            with startup_status.phase("load_project"):
+                raise ValueError("Invalid project")
+        response = loading_client.get("/api/main")
+        assert response.status_code == 500
+        assert "ValueError: Invalid project" in response.json()["detail"]
+        assert loading_client.get("/api/status").json()["status"] == "failed"
+
+    def test_index_served_while_loading(self, loading_client):
+        response = loading_client.get("/")
+        assert response.status_code == 200
+
+
+class TestEnvironments:
+    @pytest.fixture
+    def env_client(
+        self,
+        data_access_manager,
+        example_pipelines,
+        example_catalog,
+    ):
+        populate_data(data_access_manager, example_catalog, example_pipelines)
+        prod_catalog = DataCatalog(
+            feed_dict={
+                "parameters": {"train_test_split": 0.2, "num_epochs": 10},
+                "params:train_test_split": 0.2,
+            },
+            # two layers, as the layers are only sorted if several nodes have one
+            layers={
+                "primary": {"uk.data_processing.raw_data"},
+                "feature": {"model_inputs"},
+            },
+        )
+        env_data_access_managers = {"local": data_access_manager}
+        populate_env_data(
+            data_access_manager, env_data_access_managers, {"prod": prod_catalog}
+        )
+        api = apps.create_api_app_from_project(
+            mock.MagicMock(), env_data_access_managers=env_data_access_managers
+        )
+        with mock.patch(
+            "kedro_viz.api.responses.data_access_manager", new=data_access_manager
+        ), mock.patch(
+            "kedro_viz.api.router.data_access_manager", new=data_access_manager
+        ):
+            yield TestClient(api)
+
+    def test_default_env(self, env_client):
+        response = env_client.get("/api/main")
+        assert_example_data(response.json())
+        response = env_client.get("/api/main?env=local")
+        assert_example_data(response.json())
+
+    def test_other_env(self, env_client):
+        response = env_client.get("/api/main?env=prod")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["layers"] == ["primary", "feature"]
+        assert {(edge["source"], edge["target"]) for edge in data["edges"]} == {
+            (edge["source"], edge["target"])
+            for edge in env_client.get("/api/main").json()["edges"]
+        }
+        raw_data = next(node for node in data["nodes"] if node["id"] == "13399a82")
+        assert raw_data["layer"] == "primary"
+        model_inputs = next(node for node in data["nodes"] if node["id"] == "0ecea0de")
+        assert model_inputs["layer"] == "feature"
+
+        response = env_client.get("/api/nodes/56118ad8?env=prod")
+        assert response.json()["parameters"] == {"train_test_split": 0.2}
+        response = env_client.get("/api/nodes/56118ad8?env=local")
+        assert response.json()["parameters"] == {"train_test_split": 0.1}
+
+    def test_pending_pipelines_of_other_env(
+        self, data_access_manager, example_pipelines, example_catalog
+    ):
+        # the pending pipeline then has nodes and edges of its own
+        del example_pipelines["__default__"]
+        populate_data(
+            data_access_manager, example_catalog, example_pipelines, lazy=True
+        )
+        env_data_access_managers = {"local": data_access_manager}
+        populate_env_data(
+            data_access_manager,
+            env_data_access_managers,
+            {"prod": DataCatalog(feed_dict={"params:train_test_split": 0.2})},
+        )
+        client = TestClient(
+            apps.create_api_app_from_project(
+                mock.MagicMock(),
+                None,
+                data_access_manager,
+                env_data_access_managers,
+            )
+        )
+        prod_manager = env_data_access_managers["prod"]
+
+        # the pending pipelines are populated before the other environment
+        # shares the graph
+        assert not data_access_manager.pending_pipelines
+        assert not prod_manager.pending_pipelines
+        data = client.get("/api/main?env=prod").json()
+        node_ids = {node["id"] for node in data["nodes"]}
+        for edge in data["edges"]:
+            assert {edge["source"], edge["target"]} <= node_ids
+        assert client.get("/api/v2/main?env=prod").status_code == 200
+        assert {
+            (edge["source"], edge["target"])
+            for edge in client.get("/api/main?env=prod").json()["edges"]
+        } == {
+            (edge["source"], edge["target"])
+            for edge in client.get("/api/main").json()["edges"]
+        }
+
+    @pytest.mark.parametrize(
+        "url", ["/api/main?env=dev", "/api/pipelines/data_science?env=dev"]
+    )
+    def test_invalid_env(self, env_client, url):
+        response = env_client.get(url)
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Invalid environment"}
+
+
+class TestEventsEndpoint:
+    def test_events_when_not_watched(self, client):
+        response = client.get("/api/events")
+        assert response.status_code == 404
+        assert response.json() == {"detail": "The project is not watched"}
+
+    def test_events(self, mocker):
+        graph_updates = GraphUpdates()
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait({"type": "graph-updated", "version": "abc"})
+        mocker.patch.object(graph_updates, "subscribe", return_value=queue)
+        mocker.patch(
+            "starlette.requests.Request.is_disconnected", side_effect=[False, True]
+        )
+        api = apps.create_api_app_from_project(
+            mock.MagicMock(), graph_updates=graph_updates
+        )
+        response = TestClient(api).get("/api/events")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.text == (
+            'event: graph-updated\ndata: {"type":"graph-updated","version":"abc"}\n\n'
+        )
+        assert graph_updates.subscribers_count == 0
+
+
+class TestStartupProfileEndpoint:
+    def test_startup_not_profiled(self, client):
+        response = client.get("/api/debug/startup")
+        assert response.status_code == 404
+        assert response.json() == {"detail": "The startup is not profiled"}
+
+    def test_startup_profile(self):
+        startup_profiler = StartupProfiler()
+        startup_profiler.enable()
+        with startup_profiler.phase("load_project"):
+            pass
+        api = apps.create_api_app_from_project(
+            mock.MagicMock(), startup_profiler=startup_profiler
+        )
+        response = TestClient(api).get("/api/debug/startup")
+        assert response.status_code == 200
+        assert response.json() == startup_profiler.report()
+
 
 class TestAPIAppFromFile:
     def test_api_app_from_json_file(self):
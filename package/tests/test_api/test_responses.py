@@ -0,0 +1,94 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gzip
+import json
+from unittest import mock
+
+from kedro_viz.api.responses import ResponseCache
+from kedro_viz.data_access.managers import DataAccessManager
+
+
+class TestResponseCache:
+    def test_response_is_encoded_once(self, data_access_manager: DataAccessManager):
+        cache = ResponseCache()
+        build = mock.Mock(return_value=b'{"id":"a","name":"A"}')
+        first = cache.get(data_access_manager, "key", build)
+        second = cache.get(data_access_manager, "key", build)
+        assert first is second
+        build.assert_called_once()
+        assert json.loads(first.content) == {"id": "a", "name": "A"}
+        assert gzip.decompress(first.gzipped_content) == first.content
+
+    def test_cache_is_invalidated_when_repositories_change(
+        self, data_access_manager: DataAccessManager
+    ):
+        cache = ResponseCache()
+        build = mock.Mock(return_value=b'{"id":"a","name":"A"}')
+        cache.get(data_access_manager, "key", build)
+        data_access_manager.set_layers(["raw"])
+        cache.get(data_access_manager, "key", build)
+        assert build.call_count == 2
+
+    def test_cache_is_per_manager(self, data_access_manager: DataAccessManager):
+        cache = ResponseCache()
+        build = mock.Mock(return_value=b'{"id":"a","name":"A"}')
+        cache.get(data_access_manager, "key", build)
+        cache.get(DataAccessManager(), "key", build)
+        assert build.call_count == 2
+
+    def test_only_collected_holding_the_lock(
+        self, data_access_manager: DataAccessManager
+    ):
+        cache = ResponseCache()
+
+        def collect():
+            assert data_access_manager.lock._is_owned()
+            return {"id": "a"}
+
+        def build(collected):
+            assert not data_access_manager.lock._is_owned()
+            return json.dumps(collected).encode("utf-8")
+
+        encoded = cache.get(data_access_manager, "key", build, collect)
+        assert json.loads(encoded.content) == {"id": "a"}
+
+    def test_not_cached_if_repositories_change_meanwhile(
+        self, data_access_manager: DataAccessManager
+    ):
+        cache = ResponseCache()
+        builds = []
+
+        def build(_):
+            builds.append(data_access_manager.revision)
+            if len(builds) == 1:
+                data_access_manager.set_layers(["raw"])
+            return b"{}"
+
+        for _ in range(3):
+            cache.get(data_access_manager, "key", build)
+        assert len(builds) == 2
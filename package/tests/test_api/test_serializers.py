@@ -0,0 +1,228 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from pathlib import Path
+
+import pytest
+
+from kedro_viz.api import responses, serializers
+from kedro_viz.server import populate_data
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, mocker):
+    if request.param == "json":
+        mocker.patch.object(serializers, "orjson", None)
+    else:
+        pytest.importorskip("orjson")
+    yield request.param
+
+
+@pytest.fixture
+def populated_data_access_manager(
+    data_access_manager, example_catalog, example_pipelines, mocker
+):
+    populate_data(data_access_manager, example_catalog, example_pipelines)
+    mocker.patch("kedro_viz.api.responses.data_access_manager", new=data_access_manager)
+    yield data_access_manager
+
+
+def pydantic_json(model) -> bytes:
+    return model.json(ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.usefixtures("json_backend")
+class TestSerializeGraph:
+    def test_default_graph_is_byte_equivalent(self, populated_data_access_manager):
+        expected = pydantic_json(responses.get_default_response())
+        assert responses.get_encoded_default_response().content == expected
+
+    @pytest.mark.parametrize(
+        "pipeline_id", ["__default__", "data_science", "data_processing"]
+    )
+    def test_pipeline_graph_is_byte_equivalent(
+        self, pipeline_id, populated_data_access_manager
+    ):
+        expected = pydantic_json(responses.get_pipeline_response(pipeline_id))
+        assert responses.get_encoded_pipeline_response(pipeline_id).content == expected
+
+    @pytest.mark.parametrize(
+        "parameters",
+        [
+            {
+                "unicode": "Paramètre",
+                "nested": {"values": [1, 2.5, None, True]},
+                "path": Path("data/01_raw"),
+            },
+            # encoded differently by orjson, or not at all
+            {"ratio": 1e-05, "threshold": 1e16},
+            {"missing": float("nan"), "limit": float("inf")},
+            {"seed": 2 ** 70, "offset": -(2 ** 64)},
+        ],
+    )
+    def test_arbitrary_parameters_are_byte_equivalent(
+        self, parameters, populated_data_access_manager
+    ):
+        task_node = populated_data_access_manager.nodes.get_node_by_id("7b140b3f")
+        task_node.parameters = parameters
+        expected = pydantic_json(responses.get_default_response())
+        assert responses.get_encoded_default_response().content == expected
+
+    def test_tags_are_sorted(self, populated_data_access_manager):
+        # the order of a frozenset depends on the hash seed of the process
+        tags = [f"tag_{index}" for index in range(20)]
+        task_node = populated_data_access_manager.nodes.get_node_by_id("7b140b3f")
+        task_node.tags = frozenset(tags)
+        assert serializers.serialize_node(task_node)["tags"] == sorted(tags)
+        expected = pydantic_json(responses.get_default_response())
+        assert responses.get_encoded_default_response().content == expected
+
+
+class TestDumps:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ({"a": [1, 2.5, None, True, "b"]}, True),
+            ({"a": 1e-05}, False),
+            ({"a": float("nan")}, False),
+            ({"a": 2 ** 64}, False),
+            ({1: "a"}, False),
+            ({"a": Path("b")}, False),
+        ],
+    )
+    def test_user_values_are_marked(self, value, expected):
+        pytest.importorskip("orjson")
+        assert (serializers.user_value(value) is value) == expected
+
+    def test_unmarked_values_fall_back_to_json(self, json_backend):
+        # orjson can't encode integers wider than 64 bits
+        assert serializers.dumps({"a": 2 ** 70}) == b'{"a":1180591620717411303424}'
+
+
+class TestIterGraphNDJSON:
+    def test_lines_are_buffered_into_chunks(self, populated_data_access_manager):
+        graph = responses._get_default_graph()
+        chunks = list(serializers.iter_graph_ndjson(**graph, chunk_size=1))
+        # with a tiny chunk size, every line is sent in its own chunk
+        assert len(chunks) == len(graph["nodes"]) + len(graph["edges"]) + 5
+        assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+        single_chunk = list(serializers.iter_graph_ndjson(**graph))
+        assert single_chunk == [b"".join(chunks)]
+
+
+class TestParseFields:
+    @pytest.mark.parametrize(
+        "fields,expected",
+        [
+            (None, None),
+            ("", None),
+            ("name", ("id", "name", "source", "target")),
+            ("type, name,name", ("id", "name", "type", "source", "target")),
+            ("target,layer", ("id", "layer", "target")),
+        ],
+    )
+    def test_parse_fields(self, fields, expected):
+        assert serializers.parse_fields(fields) == expected
+
+    def test_unknown_fields(self):
+        with pytest.raises(ValueError, match="Unknown fields: bar, foo."):
+            serializers.parse_fields("name,foo,bar")
+
+
+def decode_compact_graph(compact):
+    """Decode the compact graph format back into a `GraphAPIResponse` document."""
+    strings = compact["strings"]
+    columns = compact["nodes"]
+
+    def lookup(index):
+        return None if index is None else strings[index]
+
+    nodes = []
+    for i, node_id in enumerate(columns["id"]):
+        node = {
+            "id": strings[node_id],
+            "name": strings[columns["name"][i]],
+            "full_name": strings[columns["full_name"][i]],
+            "tags": [strings[index] for index in columns["tags"][i]],
+            "pipelines": [strings[index] for index in columns["pipelines"][i]],
+            "modular_pipelines": [
+                strings[index] for index in columns["modular_pipelines"][i]
+            ],
+            "type": strings[columns["type"][i]],
+        }
+        if node["type"] == "task":
+            node["parameters"] = columns["parameters"][i]
+        else:
+            node["layer"] = lookup(columns["layer"][i])
+            node["dataset_type"] = lookup(columns["dataset_type"][i])
+        nodes.append(node)
+
+    def decode_entities(pairs):
+        return [{"id": strings[id_], "name": strings[name]} for id_, name in pairs]
+
+    return {
+        "nodes": nodes,
+        "edges": [
+            {"source": nodes[source]["id"], "target": nodes[target]["id"]}
+            for source, target in compact["edges"]
+        ],
+        "layers": [strings[index] for index in compact["layers"]],
+        "tags": decode_entities(compact["tags"]),
+        "pipelines": decode_entities(compact["pipelines"]),
+        "modular_pipelines": decode_entities(compact["modular_pipelines"]),
+        "selected_pipeline": strings[compact["selected_pipeline"]],
+    }
+
+
+@pytest.mark.usefixtures("json_backend")
+class TestCompactGraph:
+    def test_compact_graph_decodes_to_default_graph(
+        self, populated_data_access_manager
+    ):
+        expected = json.loads(responses.get_encoded_default_response().content)
+        compact = json.loads(responses.get_encoded_compact_response().content)
+        assert compact["version"] == 2
+        assert decode_compact_graph(compact) == expected
+
+    @pytest.mark.parametrize(
+        "pipeline_id", ["__default__", "data_science", "data_processing"]
+    )
+    def test_compact_graph_decodes_to_pipeline_graph(
+        self, pipeline_id, populated_data_access_manager
+    ):
+        graph = responses._get_pipeline_graph(pipeline_id)
+        compact = json.loads(
+            serializers.dumps(serializers.graph_to_compact_dict(**graph))
+        )
+        expected = json.loads(serializers.serialize_graph(**graph))
+        assert decode_compact_graph(compact) == expected
+
+    def test_strings_are_stored_once(self, populated_data_access_manager):
+        compact = serializers.graph_to_compact_dict(**responses._get_default_graph())
+        assert len(compact["strings"]) == len(set(compact["strings"]))
@@ -0,0 +1,327 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from kedro_viz import daemon
+
+
+class InlineThread:
+    """A thread that runs its target as soon as it is started."""
+
+    def __init__(self, target, args=(), **kwargs):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+
+@pytest.fixture(autouse=True)
+def patched_threading(mocker):
+    patched_threading = mocker.patch("kedro_viz.daemon.threading")
+    patched_threading.Thread.side_effect = InlineThread
+    patched_threading.Lock = threading.Lock
+    yield patched_threading
+
+
+@pytest.fixture(autouse=True)
+def patched_load_data(mocker, example_catalog, example_pipelines):
+    yield mocker.patch(
+        "kedro_viz.server.kedro_data_loader.load_data",
+        return_value=(example_catalog, example_pipelines),
+    )
+
+
+@pytest.fixture(autouse=True)
+def daemon_state_file(tmp_path, mocker):
+    state_file = tmp_path / "daemon.json"
+    mocker.patch.object(daemon, "_DAEMON_STATE_FILE", state_file)
+    yield state_file
+
+
+@pytest.fixture
+def registry():
+    yield daemon.ProjectRegistry(memory_budget=1024 * 1024 * 1024)
+
+
+@pytest.fixture
+def client(registry):
+    client = TestClient(daemon.DaemonApp(registry, "secret"))
+    client.headers["X-Kedro-Viz-Token"] = "secret"
+    yield client
+
+
+class TestProjectKey:
+    def test_key_is_stable(self, tmp_path):
+        assert daemon.get_project_key(tmp_path) == daemon.get_project_key(tmp_path)
+        assert daemon.get_project_key(tmp_path).startswith(f"{tmp_path.name}-")
+
+    def test_key_depends_on_loading_options(self, tmp_path):
+        keys = {
+            daemon.get_project_key(tmp_path),
+            daemon.get_project_key(tmp_path, env="prod"),
+            daemon.get_project_key(tmp_path, pipeline_name="data_science"),
+            daemon.get_project_key(tmp_path, lazy_catalog=True),
+            daemon.get_project_key(tmp_path, static_pipelines=True),
+        }
+        assert len(keys) == 5
+
+    def test_key_is_url_safe(self, tmp_path):
+        project_path = tmp_path / "my project?"
+        assert daemon.get_project_key(project_path).startswith("my-project--")
+
+
+class TestProjectRegistry:
+    def test_add_project(self, registry, tmp_path, patched_load_data):
+        project = registry.add(tmp_path, "local", None)
+        assert project.startup_status.is_ready
+        assert project.data_access_manager.nodes.as_list()
+        assert project.size > 0
+        patched_load_data.assert_called_once_with(tmp_path, "local", False, False)
+
+    def test_add_project_with_loading_options(
+        self, registry, tmp_path, patched_load_data
+    ):
+        project = registry.add(tmp_path, lazy_catalog=True, static_pipelines=True)
+        assert project.startup_status.is_ready
+        patched_load_data.assert_called_once_with(tmp_path, None, True, True)
+
+    def test_add_project_twice(self, registry, tmp_path, patched_load_data):
+        project = registry.add(tmp_path)
+        assert registry.add(tmp_path) is project
+        patched_load_data.assert_called_once()
+
+    def test_project_hosted_per_loading_options(
+        self, registry, tmp_path, patched_load_data
+    ):
+        project = registry.add(tmp_path)
+        assert registry.add(tmp_path, lazy_catalog=True) is not project
+        assert patched_load_data.call_count == 2
+
+    def test_failed_project_is_reloaded(
+        self,
+        registry,
+        tmp_path,
+        patched_load_data,
+        example_catalog,
+        example_pipelines,
+    ):
+        patched_load_data.side_effect = [
+            ValueError("Invalid project"),
+            (example_catalog, example_pipelines),
+        ]
+        with pytest.raises(ValueError):
+            registry.add(tmp_path)
+        failed_project = registry.get(daemon.get_project_key(tmp_path))
+        assert failed_project.startup_status.has_failed
+
+        project = registry.add(tmp_path)
+        assert project is not failed_project
+        assert project.startup_status.is_ready
+
+    def test_least_recently_used_projects_are_evicted(self, registry, tmp_path):
+        first, second, third = (
+            registry.add(tmp_path / name) for name in ("first", "second", "third")
+        )
+        registry.get(first.key)
+        registry.memory_budget = first.size + second.size
+        assert registry.evict() == [second.key]
+        assert [project.key for project in registry.as_list()] == [
+            third.key,
+            first.key,
+        ]
+
+    def test_loading_projects_are_not_evicted(self, registry, tmp_path):
+        first, second = (registry.add(tmp_path / name) for name in ("first", "second"))
+        loading = registry.add(tmp_path / "loading")
+        loading.startup_status = daemon.StartupStatus()
+        loading.size = first.size
+        registry.get(second.key)
+        registry.memory_budget = second.size
+        assert registry.evict() == [first.key]
+        assert registry.as_list() == [loading, second]
+
+    def test_most_recently_used_project_is_never_evicted(self, registry, tmp_path):
+        project = registry.add(tmp_path)
+        registry.memory_budget = 0
+        assert registry.evict() == []
+        assert registry.as_list() == [project]
+
+    def test_remove_project(self, registry, tmp_path):
+        project = registry.add(tmp_path)
+        assert registry.remove(project.key)
+        assert not registry.remove(project.key)
+        assert registry.get(project.key) is None
+
+    def test_project_modules_are_unloaded(
+        self, registry, tmp_path, patched_load_data, example_catalog, example_pipelines
+    ):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "viz_test_package.py").write_text("VALUE = 1\n")
+
+        def load_data(project_path, env, lazy_catalog, static_pipelines):
+            sys.path.insert(0, str((project_path / "src").resolve()))
+            import viz_test_package  # pylint: disable=import-outside-toplevel,import-error,unused-import
+
+            return example_catalog, example_pipelines
+
+        patched_load_data.side_effect = load_data
+        sys_path = list(sys.path)
+        project = registry.add(tmp_path)
+        assert project.modules == {"viz_test_package"}
+        assert "viz_test_package" not in sys.modules
+        assert sys.path == sys_path
+
+
+class TestDaemonApp:
+    def test_project_is_served(self, client, registry, tmp_path):
+        project = registry.add(tmp_path)
+        response = client.get(f"/projects/{project.key}/api/main")
+        assert response.status_code == 200
+        assert len(response.json()["nodes"]) == len(
+            project.data_access_manager.nodes.as_list()
+        )
+
+    def test_projects_are_served_independently(self, client, registry, tmp_path):
+        project = registry.add(tmp_path / "first")
+        other_project = registry.add(tmp_path / "other")
+        other_project.data_access_manager.nodes.as_list()[0].name = "Renamed"
+        other_project.data_access_manager.revision += 1
+        names = {
+            node["name"]
+            for node in client.get(f"/projects/{project.key}/api/main").json()["nodes"]
+        }
+        assert "Renamed" not in names
+
+    def test_project_url_is_redirected(self, client, registry, tmp_path):
+        project = registry.add(tmp_path)
+        response = client.get(f"/projects/{project.key}", allow_redirects=False)
+        assert response.status_code == 307
+        assert response.headers["location"] == f"/projects/{project.key}/"
+
+    def test_unknown_project(self, client):
+        assert client.get("/projects/foo/api/main").status_code == 404
+
+    def test_daemon_api(self, client, tmp_path):
+        response = client.post(
+            "/daemon/projects", json={"project_path": str(tmp_path), "env": "local"}
+        )
+        assert response.status_code == 200
+        project = response.json()
+        assert project["status"] == "ready"
+        assert project["url"] == f"/projects/{project['key']}/"
+
+        assert client.get("/daemon/projects").json() == [project]
+        assert client.delete(f"/daemon/projects/{project['key']}").status_code == 200
+        assert client.get("/daemon/projects").json() == []
+        assert client.delete(f"/daemon/projects/{project['key']}").status_code == 404
+
+    @pytest.mark.parametrize("headers", [{}, {"X-Kedro-Viz-Token": "wrong"}])
+    def test_daemon_api_requires_token(self, registry, tmp_path, headers):
+        client = TestClient(daemon.DaemonApp(registry, "secret"))
+        response = client.post(
+            "/daemon/projects", json={"project_path": str(tmp_path)}, headers=headers
+        )
+        assert response.status_code == 403
+        assert client.get("/daemon/projects", headers=headers).status_code == 403
+        assert registry.as_list() == []
+
+
+class TestRunDaemon:
+    def test_state_file_is_written_while_running(self, mocker, daemon_state_file):
+        def uvicorn_run(app, host, port):
+            assert isinstance(app, daemon.DaemonApp)
+            state = json.loads(daemon_state_file.read_text())
+            assert state["host"] == "127.0.0.1"
+            assert state["port"] == 4150
+            # the token is only readable by the user running the daemon
+            assert state["token"]
+            assert daemon_state_file.stat().st_mode & 0o777 == 0o600
+
+        mocker.patch("kedro_viz.daemon.uvicorn.run", side_effect=uvicorn_run)
+        daemon.run_daemon(port=4150, memory_budget=100)
+        assert not daemon_state_file.exists()
+
+
+class TestAttach:
+    def test_no_daemon(self, tmp_path):
+        assert daemon.attach(tmp_path) is None
+
+    def test_daemon_not_running(self, tmp_path, daemon_state_file, mocker):
+        daemon_state_file.write_text(
+            json.dumps({"host": "0.0.0.0", "port": 4150, "token": "secret"})
+        )
+        urlopen = mocker.patch(
+            "kedro_viz.daemon.urllib_request.urlopen",
+            side_effect=daemon.URLError("Connection refused"),
+        )
+        assert daemon.attach(tmp_path) is None
+        assert (
+            urlopen.call_args[0][0].full_url == "http://127.0.0.1:4150/daemon/projects"
+        )
+
+    def test_attach(self, tmp_path, daemon_state_file, mocker):
+        daemon_state_file.write_text(
+            json.dumps({"host": "127.0.0.1", "port": 4150, "token": "secret"})
+        )
+        urlopen = mocker.patch("kedro_viz.daemon.urllib_request.urlopen")
+        urlopen.return_value.__enter__.return_value.read.return_value = json.dumps(
+            {"url": "/projects/foo-1234/"}
+        )
+        url = daemon.attach(tmp_path, "local", "data_science", lazy_catalog=True)
+        assert url == "http://127.0.0.1:4150/projects/foo-1234/"
+        project_request = urlopen.call_args[0][0]
+        assert project_request.get_header("X-kedro-viz-token") == "secret"
+        assert json.loads(project_request.data) == {
+            "project_path": str(Path(tmp_path).resolve()),
+            "env": "local",
+            "pipeline_name": "data_science",
+            "lazy_catalog": True,
+            "static_pipelines": False,
+        }
+
+    def test_find_daemon(self, daemon_state_file, mocker):
+        assert daemon.find_daemon() is None
+        daemon_state_file.write_text(
+            json.dumps({"host": "127.0.0.1", "port": 4150, "token": "secret"})
+        )
+        urlopen = mocker.patch(
+            "kedro_viz.daemon.urllib_request.urlopen",
+            side_effect=daemon.URLError("Connection refused"),
+        )
+        assert daemon.find_daemon() is None
+        urlopen.side_effect = None
+        urlopen.return_value.__enter__.return_value.read.return_value = "[]"
+        assert daemon.find_daemon() == "http://127.0.0.1:4150"
+        assert urlopen.call_args[0][0].get_method() == "GET"
@@ -25,14 +25,17 @@
 #
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 from typing import Dict, cast
+from unittest import mock
 
 from kedro.extras.datasets.pandas import CSVDataSet
-from kedro.io import DataCatalog
+from kedro.io import DataCatalog, MemoryDataSet
 from kedro.pipeline import Pipeline, node
 
 from kedro_viz.data_access.managers import DataAccessManager
 from kedro_viz.models.graph import DataNode, GraphEdge, ParametersNode, Tag, TaskNode
+from kedro_viz.services import layers_services
 
 
 def identity(x):
@@ -80,11 +83,11 @@ class TestAddNode:
             namespace="uk.data_science.modular_pipeline",
         )
         graph_node = data_access_manager.add_node("my_pipeline", kedro_node)
-        assert graph_node.modular_pipelines == [
+        assert graph_node.modular_pipelines == (
             "uk",
             "uk.data_science",
             "uk.data_science.modular_pipeline",
-        ]
+        )
 
     def test_add_node_input(self, data_access_manager: DataAccessManager):
         dataset = CSVDataSet(filepath="dataset.csv")
@@ -171,18 +174,18 @@ class TestAddNode:
                 pipeline_name, parameter_name, task_node
             ),
         )
-        assert parameter_node.modular_pipelines == [
+        assert parameter_node.modular_pipelines == (
             "uk",
             "uk.data_science",
             "uk.data_science.train_test_split",
-        ]
+        )
         # removing non-modular pipelines from parameters should only leave the ones
         # that exist as defined by the nodes' namespaces in a pipeline
         data_access_manager._remove_non_modular_pipelines()
-        assert parameter_node.modular_pipelines == [
+        assert parameter_node.modular_pipelines == (
             "uk",
             "uk.data_science",
-        ]
+        )
 
     def test_add_node_output(self, data_access_manager: DataAccessManager):
         dataset = CSVDataSet(filepath="dataset.csv")
@@ -254,10 +257,10 @@ class TestAddDataSet:
         data_access_manager.add_dataset("my_pipeline", dataset_name)
         nodes_list = data_access_manager.nodes.as_list()
         graph_node: DataNode = nodes_list[0]
-        assert graph_node.modular_pipelines == [
+        assert graph_node.modular_pipelines == (
             "uk",
             "uk.data_science",
-        ]
+        )
 
     def test_add_all_parameters(self, data_access_manager: DataAccessManager):
         catalog = DataCatalog()
@@ -334,3 +337,295 @@ class TestAddPipelines:
             "__default__"
         )
         assert data_access_manager.get_default_selected_pipeline().id == "data_science"
+
+
+class TestPopulatePipelines:
+    def test_add_pipelines_lazily(
+        self,
+        data_access_manager: DataAccessManager,
+        example_pipelines: Dict[str, Pipeline],
+        example_catalog: DataCatalog,
+    ):
+        data_access_manager.add_catalog(example_catalog)
+        data_access_manager.add_pipelines(example_pipelines, lazy=True)
+
+        # every pipeline is registered, but only the default one is populated
+        assert [p.id for p in data_access_manager.registered_pipelines.as_list()] == [
+            "__default__",
+            "data_science",
+            "data_processing",
+        ]
+        assert list(data_access_manager.pending_pipelines) == [
+            "data_science",
+            "data_processing",
+        ]
+        registered_pipelines = data_access_manager.registered_pipelines
+        assert not registered_pipelines.get_node_ids_by_pipeline_id("data_science")
+        nodes = list(data_access_manager.nodes.as_list())
+
+        revision = data_access_manager.revision
+        data_access_manager.populate_pipeline("data_science")
+        assert list(data_access_manager.pending_pipelines) == ["data_processing"]
+        assert registered_pipelines.get_node_ids_by_pipeline_id("data_science")
+        assert data_access_manager.revision > revision
+        # its nodes are shared with the default pipeline
+        assert data_access_manager.nodes.as_list() == nodes
+        assert data_access_manager.nodes.get_node_by_id("7b140b3f").pipelines == (
+            "__default__",
+            "data_science",
+        )
+
+        # a populated pipeline isn't populated again
+        revision = data_access_manager.revision
+        data_access_manager.populate_pipeline("data_science")
+        assert data_access_manager.revision == revision
+
+    def test_populate_pending_pipelines(
+        self, data_access_manager: DataAccessManager, example_catalog: DataCatalog
+    ):
+        parameter_name = "params:uk.data_science.ratio"
+        example_catalog.add_feed_dict({parameter_name: 0.1})
+        pipelines = {
+            "parameters": Pipeline(
+                [node(identity, inputs=parameter_name, outputs="ratio", tags="a")]
+            ),
+            "data_science": Pipeline(
+                [
+                    node(
+                        identity,
+                        inputs="ratio",
+                        outputs="model",
+                        namespace="uk.data_science",
+                        tags="b",
+                    )
+                ]
+            ),
+        }
+        eager_manager = DataAccessManager()
+        eager_manager.add_catalog(example_catalog)
+        eager_manager.add_pipelines(pipelines)
+
+        data_access_manager.add_catalog(example_catalog)
+        data_access_manager.add_pipelines(pipelines, lazy=True)
+        parameters_node = next(
+            graph_node
+            for graph_node in data_access_manager.nodes.as_list()
+            if graph_node.full_name == parameter_name
+        )
+        # the modular pipelines of the parameters aren't known yet
+        assert parameters_node.modular_pipelines == ()
+
+        data_access_manager.populate_pending_pipelines()
+        assert not data_access_manager.pending_pipelines
+        assert parameters_node.modular_pipelines == ("uk", "uk.data_science")
+
+        # the same graph is populated lazily and eagerly
+        nodes = eager_manager.nodes.as_dict()
+        assert data_access_manager.nodes.as_dict().keys() == nodes.keys()
+        for node_id, graph_node in data_access_manager.nodes.as_dict().items():
+            for attr in ("tags", "pipelines", "modular_pipelines"):
+                assert getattr(graph_node, attr) == getattr(nodes[node_id], attr)
+        assert set(data_access_manager.edges.as_list()) == set(
+            eager_manager.edges.as_list()
+        )
+        assert data_access_manager.tags.as_list() == eager_manager.tags.as_list()
+        assert (
+            data_access_manager.modular_pipelines.as_list()
+            == eager_manager.modular_pipelines.as_list()
+        )
+
+    def test_layers_are_sorted_once_pending_pipelines_are_populated(
+        self, data_access_manager: DataAccessManager
+    ):
+        catalog = DataCatalog(
+            data_sets={name: CSVDataSet(filepath=f"{name}.csv") for name in "abcd"},
+            layers={"raw": {"a"}, "primary": {"b"}, "model": {"c"}, "output": {"d"}},
+        )
+        pipelines = {
+            "__default__": Pipeline([node(identity, inputs="a", outputs="b")]),
+            "first": Pipeline([node(identity, inputs="b", outputs="c")]),
+            "second": Pipeline([node(identity, inputs="c", outputs="d")]),
+        }
+        data_access_manager.add_catalog(catalog)
+        data_access_manager.add_pipelines(pipelines, lazy=True)
+
+        with mock.patch(
+            "kedro_viz.data_access.managers.layers_services.sort_layers",
+            wraps=layers_services.sort_layers,
+        ) as sort_layers:
+            data_access_manager.populate_pending_pipelines()
+        sort_layers.assert_called_once()
+        assert data_access_manager.layers.as_list() == [
+            "raw",
+            "primary",
+            "model",
+            "output",
+        ]
+
+    def test_populate_pipeline_for_catalog(
+        self,
+        data_access_manager: DataAccessManager,
+        example_pipelines: Dict[str, Pipeline],
+        example_catalog: DataCatalog,
+    ):
+        del example_pipelines["__default__"]
+        data_access_manager.add_catalog(example_catalog)
+        data_access_manager.add_pipelines(example_pipelines, lazy=True)
+        prod_catalog = DataCatalog(
+            feed_dict={"params:train_test_split": 0.2},
+        )
+        prod_manager = data_access_manager.for_catalog(prod_catalog)
+
+        # the pending pipelines are populated before the repositories are shared
+        assert prod_manager.lock is data_access_manager.lock
+        assert not data_access_manager.pending_pipelines
+        assert not prod_manager.pending_pipelines
+        process_data = cast(TaskNode, prod_manager.nodes.get_node_by_id("56118ad8"))
+        assert process_data.parameters == {"train_test_split": 0.2}
+        assert cast(
+            TaskNode, data_access_manager.nodes.get_node_by_id("56118ad8")
+        ).parameters == {"train_test_split": 0.1}
+        node_ids = set(prod_manager.nodes.as_dict())
+        for edge in prod_manager.edges.as_list():
+            assert {edge.source, edge.target} <= node_ids
+
+
+class TestForCatalog:
+    def test_for_catalog(
+        self,
+        data_access_manager: DataAccessManager,
+        example_pipelines: Dict[str, Pipeline],
+        example_catalog: DataCatalog,
+    ):
+        data_access_manager.add_catalog(example_catalog)
+        data_access_manager.add_pipelines(example_pipelines)
+        raw_dataset = CSVDataSet(filepath="prod/raw_data.csv")
+        prod_catalog = DataCatalog(
+            data_sets={
+                "uk.data_processing.raw_data": raw_dataset,
+                "uk.data_science.model": MemoryDataSet(),
+            },
+            feed_dict={
+                "parameters": {"train_test_split": 0.2, "num_epochs": 10},
+                "params:train_test_split": 0.2,
+            },
+            layers={"primary": {"uk.data_processing.raw_data"}},
+        )
+        prod_manager = data_access_manager.for_catalog(prod_catalog)
+
+        # the pipeline structure is shared
+        assert prod_manager.edges is data_access_manager.edges
+        assert prod_manager.node_dependencies is data_access_manager.node_dependencies
+        assert (
+            prod_manager.registered_pipelines
+            is data_access_manager.registered_pipelines
+        )
+        assert prod_manager.tags is data_access_manager.tags
+        assert prod_manager.modular_pipelines is data_access_manager.modular_pipelines
+
+        nodes = data_access_manager.nodes.as_dict()
+        prod_nodes = prod_manager.nodes.as_dict()
+        assert list(prod_nodes) == list(nodes)
+        for node_id, prod_node in prod_nodes.items():
+            assert prod_node.pipelines is nodes[node_id].pipelines
+            assert prod_node.tags is nodes[node_id].tags
+        assert prod_manager.nodes.get_mask(
+            pipeline_id="data_science"
+        ) == data_access_manager.nodes.get_mask(pipeline_id="data_science")
+
+        # as are the nodes configured the same in both catalogs
+        assert prod_nodes["d5a8b994"] is nodes["d5a8b994"]
+
+        # while the catalog-dependent parts are the ones of the new catalog
+        raw_data = cast(DataNode, prod_manager.nodes.get_node_by_id("13399a82"))
+        assert raw_data.layer == "primary"
+        assert raw_data.kedro_obj is raw_dataset
+        assert cast(DataNode, nodes["13399a82"]).layer == "raw"
+        model_inputs = cast(DataNode, prod_manager.nodes.get_node_by_id("0ecea0de"))
+        assert model_inputs.layer is None
+        assert model_inputs.dataset_type is None
+
+        process_data = cast(TaskNode, prod_manager.nodes.get_node_by_id("56118ad8"))
+        assert process_data.parameters == {"train_test_split": 0.2}
+        assert cast(TaskNode, nodes["56118ad8"]).parameters == {"train_test_split": 0.1}
+        train_model = cast(TaskNode, prod_manager.nodes.get_node_by_id("7b140b3f"))
+        assert train_model.parameters == {"train_test_split": 0.2, "num_epochs": 10}
+
+
+class TestSnapshot:
+    def test_restore_snapshot(
+        self,
+        data_access_manager: DataAccessManager,
+        example_pipelines: Dict[str, Pipeline],
+        example_catalog: DataCatalog,
+    ):
+        data_access_manager.add_catalog(example_catalog)
+        data_access_manager.add_pipelines(example_pipelines)
+        data_access_manager.set_layers(["raw", "model_inputs"])
+        snapshot = data_access_manager.create_snapshot(
+            {"56118ad8": {"parameters": {"train_test_split": 0.1}}}
+        )
+
+        # the snapshot survives a round trip through JSON, as sent between processes
+        restored = DataAccessManager()
+        restored.add_snapshot(json.loads(json.dumps(snapshot)))
+
+        for graph_node in data_access_manager.nodes.as_list():
+            restored_node = restored.nodes.get_node_by_id(graph_node.id)
+            assert type(restored_node) is type(graph_node)
+            assert restored_node.kedro_obj is None
+            for attr in (
+                "name",
+                "full_name",
+                "tags",
+                "pipelines",
+                "modular_pipelines",
+                "parameters",
+                "layer",
+                "dataset_type",
+                "is_free_input",
+            ):
+                assert getattr(restored_node, attr, None) == getattr(
+                    graph_node, attr, None
+                )
+        assert restored.edges.as_list() == data_access_manager.edges.as_list()
+        assert restored.node_dependencies == data_access_manager.node_dependencies
+        for pipeline in data_access_manager.registered_pipelines.as_list():
+            assert restored.registered_pipelines.has_pipeline(pipeline.id)
+            assert restored.registered_pipelines.get_node_ids_by_pipeline_id(
+                pipeline.id
+            ) == data_access_manager.registered_pipelines.get_node_ids_by_pipeline_id(
+                pipeline.id
+            )
+        assert restored.tags.as_list() == data_access_manager.tags.as_list()
+        assert (
+            restored.modular_pipelines.as_list()
+            == data_access_manager.modular_pipelines.as_list()
+        )
+        assert restored.layers.as_list() == ["raw", "model_inputs"]
+        assert restored.node_metadata == {
+            "56118ad8": {"parameters": {"train_test_split": 0.1}}
+        }
+
+    def test_get_live_node(
+        self,
+        data_access_manager: DataAccessManager,
+        example_pipelines: Dict[str, Pipeline],
+        example_catalog: DataCatalog,
+    ):
+        data_access_manager.add_catalog(example_catalog)
+        data_access_manager.add_pipelines(example_pipelines)
+        restored = DataAccessManager()
+        restored.add_snapshot(data_access_manager.create_snapshot())
+        node = restored.nodes.get_node_by_id("56118ad8")
+
+        # without a live loader, the restored node is all there is
+        assert restored.get_live_node(node) is node
+
+        restored.live_loader = mock.Mock(return_value=data_access_manager)
+        assert restored.get_live_node(node) is data_access_manager.nodes.get_node_by_id(
+            "56118ad8"
+        )
+        live_node = data_access_manager.nodes.get_node_by_id("13399a82")
+        assert restored.get_live_node(live_node) is live_node
+        restored.live_loader.assert_called_once()
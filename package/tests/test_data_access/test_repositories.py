@@ -31,6 +31,7 @@ from kedro.pipeline import node
 from kedro_viz.data_access.repositories import (
     GraphEdgesRepository,
     GraphNodesRepository,
+    GraphVersionsRepository,
     ModularPipelinesRepository,
     RegisteredPipelinesRepository,
 )
@@ -66,6 +67,58 @@ class TestGraphNodeRepository:
         assert task_nodes[-1] not in filtered
         assert repo.get_nodes_by_ids({"not exist"}) == []
 
+    def test_filter_by_mask(self):
+        repo = GraphNodesRepository()
+        task_node = repo.add_node(
+            GraphNode.create_task_node(
+                node(identity, inputs="x", outputs="y", namespace="uk.data_science")
+            )
+        )
+        data_node = repo.add_node(
+            GraphNode.create_data_node(
+                full_name="uk.data_science.y", layer="raw", tags=set(), dataset=None
+            )
+        )
+        repo.add_node_to_pipeline(task_node, "__default__")
+        repo.add_node_to_pipeline(data_node, "__default__")
+        repo.add_node_to_pipeline(data_node, "data_science")
+
+        assert repo.indices == {task_node.id: 0, data_node.id: 1}
+        assert repo.get_nodes_by_mask(repo.get_mask()) == [task_node, data_node]
+        assert repo.get_nodes_by_mask(repo.get_mask(pipeline_id="__default__")) == [
+            task_node,
+            data_node,
+        ]
+        assert repo.get_nodes_by_mask(repo.get_mask(pipeline_id="data_science")) == [
+            data_node
+        ]
+        assert repo.get_nodes_by_mask(repo.get_mask(node_type="task")) == [task_node]
+        assert (
+            repo.get_nodes_by_mask(
+                repo.get_mask(pipeline_id="data_science", node_type="task")
+            )
+            == []
+        )
+        assert repo.get_nodes_by_mask(repo.get_mask(pipeline_id="not exist")) == []
+
+    def test_set_modular_pipelines(self):
+        repo = GraphNodesRepository()
+        parameters_node = repo.add_node(
+            GraphNode.create_parameters_node(
+                full_name="params:uk.data_science.ratio",
+                layer=None,
+                tags=set(),
+                parameters=None,
+            )
+        )
+        assert repo.get_modular_pipelines_by_mask(repo.get_mask()) == [
+            "uk",
+            "uk.data_science",
+        ]
+        repo.set_modular_pipelines(parameters_node, ["uk"])
+        assert parameters_node.modular_pipelines == ("uk",)
+        assert repo.get_modular_pipelines_by_mask(repo.get_mask()) == ["uk"]
+
 
 class TestGraphEdgesRepository:
     def test_filter_by_node_is(self):
@@ -78,6 +131,29 @@ class TestGraphEdgesRepository:
             repo.add_edge(edge)
         assert set(repo.get_edges_by_node_ids({"a", "b", "d"})) == {ab, da}
 
+    def test_edges_keep_insertion_order(self):
+        ab = GraphEdge(source="a", target="b")
+        bc = GraphEdge(source="b", target="c")
+        repo = GraphEdgesRepository()
+        for edge in [bc, ab, bc]:
+            repo.add_edge(edge)
+        assert repo.as_list() == [bc, ab]
+
+
+class TestGraphVersionsRepository:
+    def test_oldest_versions_are_evicted(self):
+        repo = GraphVersionsRepository(max_versions=2)
+        repo.add_version("a", {})
+        repo.add_version("b", {})
+        # adding an existing version makes it the most recent one
+        repo.add_version("a", {})
+        repo.add_version("c", {})
+        assert list(repo.versions) == ["a", "c"]
+        assert repo.get_version("a") == {}
+        assert repo.has_version("c")
+        assert repo.get_version("b") is None
+        assert not repo.has_version("b")
+
 
 class TestRegisteredPipelinesrepository:
     def test_get_node_ids_in_pipeline(self):
@@ -106,3 +182,7 @@ class TestModularPipelinesRepository:
             "uk.data_engineering",
             "uk.data_science",
         ]
+
+    def test_modular_pipelines_repo_from_ids(self):
+        repo = ModularPipelinesRepository.from_ids(["uk.data_science", "uk"])
+        assert [p.id for p in repo.as_list()] == ["uk", "uk.data_science"]
@@ -0,0 +1,231 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import datetime
+import json
+import threading
+from unittest import mock
+
+import anyconfig
+import pytest
+from kedro.config import ConfigLoader, TemplatedConfigLoader
+from semver import VersionInfo
+
+from kedro_viz.integrations.kedro.data_loader import (
+    KEDRO_VERSION,
+    _find_config_file_parsers,
+    cache_config_files,
+    load_catalogs,
+    load_data,
+    load_data_for_envs,
+)
+
+
+@pytest.fixture
+def project_path(tmp_path):
+    base_path = tmp_path / "conf" / "base"
+    base_path.mkdir(parents=True)
+    (base_path / "catalog.yml").write_text("cars:\n  type: pandas.CSVDataSet\n")
+    (base_path / "parameters.yml").write_text("alpha: 1\n")
+    (base_path / "credentials.yml").write_text("db:\n  password: secret\n")
+    (base_path / "credentials_prod").mkdir()
+    (base_path / "credentials_prod" / "db.yml").write_text("prod:\n  password: x\n")
+    yield tmp_path
+
+
+@pytest.fixture
+def parse_config_file(mocker):
+    # counts the files actually parsed by Kedro, whichever version it is
+    yield mocker.patch("anyconfig.load", side_effect=anyconfig.load)
+
+
+def load_config(project_path, *patterns, config_loader_class=ConfigLoader):
+    with cache_config_files(project_path):
+        return config_loader_class([str(project_path / "conf" / "base")]).get(*patterns)
+
+
+class TestConfigCache:
+    def test_only_changed_files_are_parsed(self, project_path, parse_config_file):
+        config_content = load_config(project_path, "catalog*", "parameters*")
+        assert config_content == {"cars": {"type": "pandas.CSVDataSet"}, "alpha": 1}
+        assert parse_config_file.call_count == 2
+
+        parse_config_file.reset_mock()
+        assert load_config(project_path, "catalog*", "parameters*") == config_content
+        parse_config_file.assert_not_called()
+
+        (project_path / "conf" / "base" / "parameters.yml").write_text("alpha: 10\n")
+        config_content = load_config(project_path, "catalog*", "parameters*")
+        assert config_content["alpha"] == 10
+        parse_config_file.assert_called_once()
+
+    def test_credentials_are_not_cached(self, project_path, parse_config_file):
+        for _ in range(2):
+            assert load_config(project_path, "credentials*", "credentials*/**") == {
+                "db": {"password": "secret"},
+                "prod": {"password": "x"},
+            }
+        assert parse_config_file.call_count == 4
+        assert not (project_path / ".kedro-viz" / "config.json").exists()
+
+    def test_templates_are_cached_apart(self, project_path, parse_config_file):
+        assert load_config(project_path, "parameters*") == {"alpha": 1}
+        assert load_config(
+            project_path, "parameters*", config_loader_class=TemplatedConfigLoader
+        ) == {"alpha": 1}
+        assert parse_config_file.call_count == 2
+
+    def test_kedro_is_restored(self, project_path, parse_config_file):
+        originals = _find_config_file_parsers()
+        assert originals
+        with pytest.raises(ValueError):
+            with cache_config_files(project_path):
+                assert _find_config_file_parsers() != originals
+                raise ValueError()
+        assert _find_config_file_parsers() == originals
+
+    def test_invalid_cache(self, project_path, parse_config_file):
+        (project_path / ".kedro-viz").mkdir()
+        (project_path / ".kedro-viz" / "config.json").write_text("invalid")
+        assert load_config(project_path, "parameters*") == {"alpha": 1}
+        parse_config_file.reset_mock()
+        assert load_config(project_path, "parameters*") == {"alpha": 1}
+        parse_config_file.assert_not_called()
+
+    def test_cache_is_versioned(self, mocker, project_path, parse_config_file):
+        load_config(project_path, "parameters*")
+        cache = json.loads((project_path / ".kedro-viz" / "config.json").read_text())
+        assert cache["kedro"] == str(KEDRO_VERSION)
+        assert [entry[-1] for entry in cache["entries"]] == [{"alpha": 1}]
+
+        parse_config_file.reset_mock()
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._CONFIG_CACHE_VERSION",
+            cache["version"] + 1,
+        )
+        assert load_config(project_path, "parameters*") == {"alpha": 1}
+        parse_config_file.assert_called_once()
+
+    def test_only_json_content_is_cached(self, project_path, parse_config_file):
+        (project_path / "conf" / "base" / "parameters.yml").write_text(
+            "start: 2021-01-01\nids:\n  1: one\n"
+        )
+        for _ in range(2):
+            assert load_config(project_path, "parameters*") == {
+                "start": datetime.date(2021, 1, 1),
+                "ids": {1: "one"},
+            }
+        assert parse_config_file.call_count == 2
+        assert not (project_path / ".kedro-viz" / "config.json").exists()
+
+
+class TestLoadData:
+    def test_pipelines_are_loaded_concurrently(self, mocker, tmp_path):
+        catalog_created = threading.Event()
+
+        def get_pipelines(context, static_pipelines):
+            # deadlocks unless the catalogs are created in the meantime
+            assert catalog_created.wait(5)
+            return {"__default__": mock.sentinel.pipeline}
+
+        def create_catalog(env):
+            catalog_created.set()
+            return f"{env}_catalog"
+
+        def load_context(project_path, env):
+            context = mock.Mock()
+            type(context).catalog = mock.PropertyMock(
+                side_effect=lambda: create_catalog(env)
+            )
+            return context
+
+        mocker.patch("kedro_viz.integrations.kedro.data_loader._bootstrap")
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._load_context",
+            side_effect=load_context,
+        )
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._get_pipelines",
+            side_effect=get_pipelines,
+        )
+        catalogs, pipelines = load_data_for_envs(tmp_path, ["local", "prod"])
+        assert pipelines == {"__default__": mock.sentinel.pipeline}
+        assert catalogs == {"local": "local_catalog", "prod": "prod_catalog"}
+
+    def test_pipelines_context_is_reused(self, mocker, tmp_path):
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader.KEDRO_VERSION",
+            VersionInfo.parse("0.17.2"),
+        )
+        contexts = []
+
+        def load_context(project_path, env):
+            contexts.append(mock.Mock(catalog=f"{env}_catalog"))
+            return contexts[-1]
+
+        mocker.patch("kedro_viz.integrations.kedro.data_loader._bootstrap")
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._load_context",
+            side_effect=load_context,
+        )
+        get_pipelines = mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._get_pipelines",
+            return_value={"__default__": mock.sentinel.pipeline},
+        )
+        catalogs, _ = load_data_for_envs(tmp_path, ["local", "prod"])
+        assert catalogs == {"local": "local_catalog", "prod": "prod_catalog"}
+        # the context registering the pipelines creates its catalog too
+        assert len(contexts) == 2
+        get_pipelines.assert_called_once_with(contexts[0], False)
+
+    def test_load_catalogs_only(self, mocker, tmp_path):
+        mocker.patch("kedro_viz.integrations.kedro.data_loader._bootstrap")
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._load_context",
+            side_effect=lambda project_path, env: mock.Mock(catalog=f"{env}_catalog"),
+        )
+        get_pipelines = mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._get_pipelines"
+        )
+        catalogs = load_catalogs(tmp_path, ["local", "prod"])
+        assert catalogs == {"local": "local_catalog", "prod": "prod_catalog"}
+        get_pipelines.assert_not_called()
+
+    def test_static_pipelines(self, mocker, tmp_path):
+        mocker.patch("kedro_viz.integrations.kedro.data_loader._bootstrap")
+        mocker.patch("kedro_viz.integrations.kedro.data_loader._load_context")
+        mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader._get_package_name",
+            return_value="demo",
+        )
+        extract_pipelines = mocker.patch(
+            "kedro_viz.integrations.kedro.data_loader.extract_pipelines",
+            return_value={"__default__": mock.sentinel.pipeline},
+        )
+        _, pipelines = load_data(tmp_path, static_pipelines=True)
+        assert pipelines == {"__default__": mock.sentinel.pipeline}
+        extract_pipelines.assert_called_once_with("demo", mock.ANY)
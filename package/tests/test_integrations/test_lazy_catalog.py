@@ -0,0 +1,137 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import sys
+from textwrap import dedent
+
+import pytest
+from kedro.extras.datasets.pandas import CSVDataSet
+from kedro.io import MemoryDataSet
+
+from kedro_viz.integrations.kedro.lazy_catalog import (
+    LazyDataSet,
+    create_lazy_catalog,
+    get_dataset_type,
+)
+
+
+@pytest.fixture
+def datasets_package(tmp_path, monkeypatch):
+    """A package of datasets whose module can't be imported,
+    e.g. because its dependencies aren't installed.
+    """
+    package_path = tmp_path / "viz_test_datasets"
+    package_path.mkdir()
+    (package_path / "__init__.py").write_text(
+        "from .heavy_dataset import HeavyDataSet as HeavyDataSet\n"
+    )
+    (package_path / "heavy_dataset.py").write_text(
+        dedent(
+            """
+            raise ImportError("heavy isn't installed")
+
+
+            class HeavyDataSet:
+                pass
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "viz_test_datasets"
+    for name in list(sys.modules):
+        if name.startswith("viz_test_datasets"):
+            del sys.modules[name]
+
+
+class TestGetDatasetType:
+    @pytest.mark.parametrize(
+        "type_name,dataset_type",
+        [
+            ("MemoryDataSet", "kedro.io.memory_data_set.MemoryDataSet"),
+            (
+                "pandas.CSVDataSet",
+                "kedro.extras.datasets.pandas.csv_dataset.CSVDataSet",
+            ),
+            (
+                "kedro.extras.datasets.pandas.CSVDataSet",
+                "kedro.extras.datasets.pandas.csv_dataset.CSVDataSet",
+            ),
+            ("unknown.UnknownDataSet", "unknown.UnknownDataSet"),
+        ],
+    )
+    def test_get_dataset_type(self, type_name, dataset_type):
+        assert get_dataset_type(type_name) == dataset_type
+
+    def test_dataset_module_is_not_imported(self, datasets_package):
+        assert (
+            get_dataset_type(f"{datasets_package}.HeavyDataSet")
+            == f"{datasets_package}.heavy_dataset.HeavyDataSet"
+        )
+        # nor its package, which imports it
+        assert datasets_package not in sys.modules
+        assert f"{datasets_package}.heavy_dataset" not in sys.modules
+
+
+class TestLazyCatalog:
+    def test_create_lazy_catalog(self, mocker, datasets_package, tmp_path):
+        get_credentials = mocker.Mock(return_value={})
+        catalog = create_lazy_catalog(
+            {
+                "cars": {
+                    "type": "pandas.CSVDataSet",
+                    "filepath": str(tmp_path / "cars.csv"),
+                    "layer": "raw",
+                },
+                "model": {"type": f"{datasets_package}.HeavyDataSet"},
+            },
+            get_credentials,
+            {"params:alpha": 1},
+        )
+        assert catalog.layers == {"raw": {"cars"}}
+        assert catalog.load("params:alpha") == 1
+
+        cars = catalog._get_dataset("cars")
+        assert isinstance(cars, LazyDataSet)
+        assert cars.layer == "raw"
+        assert cars.filepath == str(tmp_path / "cars.csv")
+        model = catalog._get_dataset("model")
+        assert model.dataset_type == f"{datasets_package}.heavy_dataset.HeavyDataSet"
+
+        # the datasets are instantiated once, when they're first used
+        get_credentials.assert_not_called()
+        assert isinstance(cars.get_dataset(), CSVDataSet)
+        assert cars.get_dataset() is cars.get_dataset()
+        assert cars._describe()["filepath"].name == "cars.csv"
+        get_credentials.assert_called_once()
+
+    def test_lazy_dataset_is_loaded(self):
+        dataset = LazyDataSet("numbers", {"type": "MemoryDataSet", "data": [1]}, dict)
+        assert dataset.exists()
+        assert dataset.load() == [1]
+        dataset.save([2])
+        assert dataset.load() == [2]
+        assert isinstance(dataset.get_dataset(), MemoryDataSet)
@@ -0,0 +1,129 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+
+import pytest
+
+from kedro_viz.integrations.kedro.snapshots import SnapshotCache
+
+
+@pytest.fixture
+def project_path(tmp_path):
+    package_path = tmp_path / "src" / "demo"
+    package_path.mkdir(parents=True)
+    (package_path / "pipeline_registry.py").write_text("PIPELINES = {}")
+    for env in ("base", "local", "prod"):
+        (tmp_path / "conf" / env).mkdir(parents=True)
+        (tmp_path / "conf" / env / "catalog.yml").write_text(f"{env}: {{}}")
+    (tmp_path / "pyproject.toml").write_text("[tool.kedro]")
+    yield tmp_path
+
+
+@pytest.fixture
+def snapshot_cache(project_path):
+    yield SnapshotCache(project_path)
+
+
+class TestFingerprint:
+    @pytest.mark.parametrize(
+        "changed_file",
+        [
+            "src/demo/pipeline_registry.py",
+            "src/demo/pipelines/nodes.py",
+            "conf/base/catalog.yml",
+            "conf/local/parameters.yml",
+            "pyproject.toml",
+        ],
+    )
+    def test_fingerprint_changes(self, snapshot_cache, project_path, changed_file):
+        fingerprint = snapshot_cache.get_fingerprint([None])
+        path = project_path / changed_file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("changed")
+        assert snapshot_cache.get_fingerprint([None]) != fingerprint
+
+    @pytest.mark.parametrize(
+        "changed_file",
+        [
+            "conf/prod/catalog.yml",
+            "src/demo/README.md",
+            "src/demo/__pycache__/nodes.py",
+            "data/01_raw/cars.csv",
+        ],
+    )
+    def test_fingerprint_unchanged(self, snapshot_cache, project_path, changed_file):
+        fingerprint = snapshot_cache.get_fingerprint([None])
+        path = project_path / changed_file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("changed")
+        assert snapshot_cache.get_fingerprint([None]) == fingerprint
+
+    def test_fingerprint_depends_on_envs_pipeline_and_options(self, snapshot_cache):
+        fingerprints = {
+            snapshot_cache.get_fingerprint([None]),
+            snapshot_cache.get_fingerprint(["prod"]),
+            snapshot_cache.get_fingerprint(["local", "prod"]),
+            snapshot_cache.get_fingerprint([None], "data_science"),
+            snapshot_cache.get_fingerprint([None], lazy_catalog=True),
+            snapshot_cache.get_fingerprint([None], static_pipelines=True),
+        }
+        assert len(fingerprints) == 6
+
+    def test_fingerprint_depends_on_versions(self, mocker, snapshot_cache):
+        fingerprint = snapshot_cache.get_fingerprint([None])
+        mocker.patch("kedro_viz.integrations.kedro.snapshots.__version__", "0.0.0")
+        assert snapshot_cache.get_fingerprint([None]) != fingerprint
+
+
+class TestSnapshotCache:
+    def test_save_and_load(self, snapshot_cache, project_path):
+        assert snapshot_cache.load("abc") is None
+        snapshot_cache.save("abc", json.dumps({"snapshots": []}).encode("utf-8"))
+        assert snapshot_cache.load("abc") == {"snapshots": []}
+        # the cache isn't committed with the project
+        assert (project_path / ".kedro-viz" / ".gitignore").read_text() == "*\n"
+
+    def test_invalid_snapshot(self, snapshot_cache):
+        snapshot_cache.save("abc", b"{")
+        assert snapshot_cache.load("abc") is None
+
+    def test_least_recently_used_snapshots_are_pruned(self, snapshot_cache):
+        for index in range(5):
+            snapshot_cache.save(str(index), b"{}")
+            os.utime(snapshot_cache.cache_dir / f"{index}.json", (index, index))
+        # loading a snapshot marks it as used
+        snapshot_cache.load("0")
+        snapshot_cache.save("5", b"{}")
+        assert sorted(path.stem for path in snapshot_cache.cache_dir.glob("*")) == [
+            "0",
+            "2",
+            "3",
+            "4",
+            "5",
+        ]
@@ -0,0 +1,373 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import inspect
+import sys
+from textwrap import dedent
+from unittest import mock
+
+import pytest
+from kedro.pipeline import Pipeline
+
+from kedro_viz.integrations.kedro.static_pipelines import (
+    _PipelineExtractor,
+    _StubCalled,
+    _TooDynamic,
+    extract_pipelines,
+)
+
+PROJECT_FILES = {
+    "__init__.py": "",
+    "pipeline_registry.py": """
+        from typing import Dict
+
+        from kedro.pipeline import Pipeline
+
+        from viz_test_project.pipelines import data_processing as dp
+        from viz_test_project.pipelines import data_science
+
+
+        def register_pipelines() -> Dict[str, Pipeline]:
+            pipelines = {
+                "dp": dp.create_pipeline(),
+                "ds": data_science.create_pipeline(),
+            }
+            pipelines["__default__"] = sum(pipelines.values(), Pipeline([]))
+            return pipelines
+        """,
+    "pipelines/__init__.py": "",
+    "pipelines/data_processing/__init__.py": "from .pipeline import create_pipeline\n",
+    "pipelines/data_processing/nodes.py": """
+        import viz_test_missing_dependency
+
+
+        def preprocess(companies):
+            return companies
+
+
+        @viz_test_missing_dependency.decorate
+        def join(left, right):
+            return left
+        """,
+    "pipelines/data_processing/pipeline.py": """
+        from kedro.pipeline import Pipeline, node, pipeline
+
+        from .nodes import join, preprocess
+
+        TAGS = ["raw"]
+
+
+        def _preprocess_nodes(suffix):
+            return [
+                node(
+                    preprocess,
+                    f"companies_{suffix}",
+                    f"preprocessed_{suffix}",
+                    name=f"preprocess_{suffix}",
+                    tags=TAGS,
+                )
+            ]
+
+
+        def create_pipeline(**kwargs):
+            nodes = []
+            for suffix in ("a", "b"):
+                nodes.extend(_preprocess_nodes(suffix))
+            nodes.append(
+                node(
+                    func=join,
+                    inputs=["preprocessed_a", "preprocessed_b"],
+                    outputs="joined",
+                    name="join",
+                )
+            )
+            return pipeline(
+                Pipeline(nodes),
+                namespace="dp",
+                inputs={"companies_a", "companies_b"},
+                outputs="joined",
+            )
+        """,
+    "pipelines/data_science/__init__.py": "from .pipeline import create_pipeline\n",
+    "pipelines/data_science/nodes.py": """
+        def train(x):
+            return x
+        """,
+    "pipelines/data_science/pipeline.py": """
+        import random
+
+        from kedro.pipeline import Pipeline, node
+
+        from .nodes import train
+
+
+        def create_pipeline(**kwargs):
+            if random.random() > 1:
+                return Pipeline([])
+            return Pipeline([node(train, "joined", "model", name="train")])
+        """,
+}
+
+
+@pytest.fixture
+def project_package(tmp_path, monkeypatch):
+    """A Kedro project whose node functions can't all be imported,
+    e.g. because their dependencies aren't installed.
+    """
+    for file_name, source in PROJECT_FILES.items():
+        path = tmp_path / "viz_test_project" / file_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path / "viz_test_project"
+    for module_name in list(sys.modules):
+        if module_name.startswith("viz_test_project"):
+            del sys.modules[module_name]
+
+
+class TestExtractPipelines:
+    def test_extract_pipelines(self, project_package):
+        import_pipelines = mock.Mock()
+        pipelines = extract_pipelines("viz_test_project", import_pipelines)
+
+        import_pipelines.assert_not_called()
+        assert set(pipelines) == {"dp", "ds", "__default__"}
+        assert {node.name for node in pipelines["dp"].nodes} == {
+            "dp.preprocess_a",
+            "dp.preprocess_b",
+            "dp.join",
+        }
+        assert pipelines["dp"].inputs() == {"companies_a", "companies_b"}
+        assert pipelines["dp"].outputs() == {"joined"}
+        assert {
+            node.name for node in pipelines["dp"].only_nodes_with_tags("raw").nodes
+        } == {"dp.preprocess_a", "dp.preprocess_b"}
+        assert len(pipelines["__default__"].nodes) == 4
+
+    def test_node_code_is_not_imported(self, project_package):
+        pipelines = extract_pipelines("viz_test_project", mock.Mock())
+
+        assert "viz_test_project.pipelines.data_processing.nodes" not in sys.modules
+        preprocess = pipelines["dp"].only_nodes("dp.preprocess_a").nodes[0]
+        assert inspect.getsource(preprocess.func) == dedent(
+            """\
+            def preprocess(companies):
+                return companies
+            """
+        )
+        assert preprocess.func.__module__ == (
+            "viz_test_project.pipelines.data_processing.nodes"
+        )
+        with pytest.raises(
+            NotImplementedError, match="data_processing.nodes.preprocess"
+        ):
+            preprocess.func(None)
+
+    def test_dynamic_function_is_imported(self, project_package):
+        pipelines = extract_pipelines("viz_test_project", mock.Mock())
+
+        assert "viz_test_project.pipelines.data_science.pipeline" in sys.modules
+        assert [node.name for node in pipelines["ds"].nodes] == ["train"]
+
+    def test_pipelines_are_imported_without_registry(self, project_package):
+        (project_package / "pipeline_registry.py").unlink()
+        pipelines = {"__default__": Pipeline([])}
+        import_pipelines = mock.Mock(return_value=pipelines)
+
+        assert extract_pipelines("viz_test_project", import_pipelines) == pipelines
+        import_pipelines.assert_called_once_with()
+
+
+def run_snippet(project_package, source, *args, **kwargs):
+    """Evaluate the `run` function of a module of the project, without importing
+    it if it's too dynamic.
+    """
+    (project_package / "snippet.py").write_text(dedent(source))
+    extractor = _PipelineExtractor("viz_test_project")
+    run = extractor.lookup_module(
+        extractor.get_module("viz_test_project.snippet"), "run"
+    )
+    return extractor._run_function(run, list(args), kwargs)
+
+
+class TestPipelineExtractor:
+    @pytest.mark.parametrize(
+        "expression,value",
+        [
+            ("-1", -1),
+            ("+x", 2),
+            ("-x * 3", -6),
+            ("~x", -3),
+            ("not x", False),
+            ("x / 4", 0.5),
+            ("7 // x", 3),
+            ("x ^ 3", 1),
+            ("x | 1", 3),
+            ("x % 2 == 0 and 'even'", "even"),
+            ("len(items) or None", 3),
+            ("x if x > 1 else 0", 2),
+            ("1 < x <= 2", True),
+            ("0 < x < 1", False),
+            ("x in items and x not in ()", True),
+            ("name is None", False),
+            ("items[1:]", (2, 3)),
+            ("items[::-1][0]", 3),
+            ("items[-1]", 3),
+            ("[i * x for i in items if i != 2]", [2, 6]),
+            ("{i: -i for i in items}", {1: -1, 2: -2, 3: -3}),
+            ("tuple(a + b for a, b in zip(items, items))", (2, 4, 6)),
+            ("f'{name}_{x:03d}'", "data_002"),
+            ("f'{name!r}'", "'data'"),
+            ("sorted({*items, 0})", [0, 1, 2, 3]),
+            ("{**{'a': 1}, 'b': x}", {"a": 1, "b": 2}),
+            ("sum(items, x)", 8),
+            ("dict(zip(items, 'abc'))", {1: "a", 2: "b", 3: "c"}),
+            ("(lambda y, z=1: y + z + x)(1)", 4),
+        ],
+    )
+    def test_evaluate(self, project_package, expression, value):
+        source = f"""
+            def run(x=2, items=(1, 2, 3), name="data"):
+                return {expression}
+            """
+        assert run_snippet(project_package, source) == value
+
+    def test_execute(self, project_package):
+        source = """
+            def run(prefix, *suffixes, sep="_", **extra):
+                names = {}
+                count: int = 0
+                first, (second, _) = suffixes[0], suffixes[1:3]
+
+                def name(suffix):
+                    return prefix + sep + suffix
+
+                for suffix in suffixes:
+                    if suffix == "skip":
+                        pass
+                    elif suffix in extra:
+                        names[suffix] = extra[suffix]
+                    else:
+                        names[suffix] = name(suffix)
+                    count += 1
+                return names, count, first, second
+            """
+        assert run_snippet(project_package, source, "ds", "a", "b", "skip", b="x") == (
+            {"a": "ds_a", "b": "x"},
+            3,
+            "a",
+            "b",
+        )
+
+    def test_return_from_loop(self, project_package):
+        source = """
+            def run(items):
+                for item in items:
+                    if item > 1:
+                        return item
+            """
+        assert run_snippet(project_package, source, [1, 2, 3]) == 2
+        assert run_snippet(project_package, source, [1]) is None
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "x ** 2",
+            "-name",
+            "items[10]",
+            "x.__class__",
+            "open(name)",
+            "-run",
+            "not run",
+            "[*run]",
+            "{**items}",
+            "run.attribute",
+            "x @ x",
+        ],
+    )
+    def test_too_dynamic_expression(self, project_package, expression):
+        source = f"""
+            def run(x=2, items=(1, 2, 3), name="data"):
+                return [{expression}]
+            """
+        with pytest.raises(_TooDynamic):
+            run_snippet(project_package, source)
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            """
+            def run():
+                while True:
+                    pass
+            """,
+            """
+            def run():
+                import os
+                return os
+            """,
+            """
+            def run():
+                return run()
+            """,
+            """
+            def run(x):
+                return x
+            """,
+            """
+            def run():
+                a, b = (1, 2, 3)
+            """,
+            """
+            def run():
+                global x
+            """,
+        ],
+    )
+    def test_too_dynamic_function(self, project_package, source):
+        with pytest.raises(_TooDynamic):
+            run_snippet(project_package, source)
+
+    def test_stub_called_while_extracting(self, project_package):
+        source = """
+            def key(item):
+                return -item
+
+
+            def run(items=(1, 2, 3)):
+                return sorted(items, key=key)
+            """
+        with pytest.raises(_StubCalled, match="snippet.key can't be run") as exc_info:
+            run_snippet(project_package, source)
+        assert isinstance(exc_info.value, NotImplementedError)
+
+        # the function calling it is imported instead
+        extractor = _PipelineExtractor("viz_test_project")
+        module = extractor.get_module("viz_test_project.snippet")
+        run = extractor.lookup_module(module, "run")
+        assert extractor.call(run, [], {}) == [3, 2, 1]
+        assert extractor.imported_functions == ["viz_test_project.snippet.run"]
@@ -32,7 +32,7 @@ from kedro_viz.launchers import cli
 
 
 @pytest.mark.parametrize(
-    "command_options,run_server_args",
+    "command_options,run_server_args,options",
     [
         (
             ["viz"],
@@ -45,6 +45,15 @@ from kedro_viz.launchers import cli
                 pipeline=None,
                 env=None,
             ),
+            dict(
+                workers=1,
+                isolated=False,
+                watch=False,
+                profile_startup=None,
+                cache=False,
+                lazy_catalog=False,
+                static_pipelines=False,
+            ),
         ),
         (
             [
@@ -60,6 +69,10 @@ from kedro_viz.launchers import cli
                 "data_science",
                 "--env",
                 "local",
+                "--workers",
+                "4",
+                "--isolated",
+                "--cache",
             ],
             dict(
                 host="8.8.8.8",
@@ -70,13 +83,166 @@ from kedro_viz.launchers import cli
                 pipeline="data_science",
                 env="local",
             ),
+            dict(
+                workers=4,
+                isolated=True,
+                watch=False,
+                profile_startup=None,
+                cache=True,
+                lazy_catalog=False,
+                static_pipelines=False,
+            ),
+        ),
+        (
+            [
+                "viz",
+                "--watch",
+                "--profile-startup",
+                "startup.json",
+                "--lazy-catalog",
+                "--static-pipelines",
+            ],
+            dict(
+                host="127.0.0.1",
+                port=4141,
+                browser=True,
+                load_file=None,
+                save_file=None,
+                pipeline=None,
+                env=None,
+            ),
+            dict(
+                workers=1,
+                isolated=False,
+                watch=True,
+                profile_startup="startup.json",
+                cache=False,
+                lazy_catalog=True,
+                static_pipelines=True,
+            ),
         ),
     ],
 )
-def test_kedro_viz_command_run_server(command_options, run_server_args, mocker):
-    run_server = mocker.patch("kedro_viz.launchers.cli.run_server")
+def test_kedro_viz_command_run_server(
+    command_options, run_server_args, options, mocker
+):
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    mocker.patch("kedro_viz.daemon.attach", return_value=None)
+    mocker.patch("kedro_viz.daemon.find_daemon", return_value=None)
     runner = CliRunner()
     with runner.isolated_filesystem():
         runner.invoke(cli.commands, command_options)
 
-    run_server.assert_called_once_with(*run_server_args.values())
+    run_server.assert_called_once_with(*run_server_args.values(), **options)
+
+
+def test_kedro_viz_command_run_daemon(mocker):
+    run_daemon = mocker.patch("kedro_viz.daemon.run_daemon")
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        runner.invoke(
+            cli.commands,
+            ["viz", "--daemon", "--port", "4150", "--memory-budget", "512"],
+        )
+
+    run_daemon.assert_called_once_with("127.0.0.1", 4150, 512)
+    run_server.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "browser_option,should_browser_open", [([], True), (["--no-browser"], False)]
+)
+def test_kedro_viz_command_attach_to_daemon(
+    browser_option, should_browser_open, mocker
+):
+    url = "http://127.0.0.1:4141/projects/project-1234/"
+    attach = mocker.patch("kedro_viz.daemon.attach", return_value=url)
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    webbrowser = mocker.patch("kedro_viz.launchers.cli.webbrowser")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            cli.commands, ["viz", "--pipeline", "data_science", *browser_option]
+        )
+
+    attach.assert_called_once_with(mocker.ANY, None, "data_science", False, False)
+    run_server.assert_not_called()
+    assert url in result.output
+    assert webbrowser.open_new.called == should_browser_open
+
+
+def test_kedro_viz_command_forwards_loading_options_to_daemon(mocker):
+    url = "http://127.0.0.1:4141/projects/project-1234/"
+    attach = mocker.patch("kedro_viz.daemon.attach", return_value=url)
+    mocker.patch("kedro_viz.launchers.cli.webbrowser")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        runner.invoke(cli.commands, ["viz", "--lazy-catalog", "--static-pipelines"])
+
+    attach.assert_called_once_with(mocker.ANY, None, None, True, True)
+
+
+@pytest.mark.parametrize(
+    "server_option", [["--port", "4150"], ["--workers", "2"], ["--watch"]]
+)
+def test_kedro_viz_command_rejects_server_options_with_daemon(server_option, mocker):
+    mocker.patch("kedro_viz.daemon.find_daemon", return_value="http://127.0.0.1:4141")
+    attach = mocker.patch("kedro_viz.daemon.attach")
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli.commands, ["viz", *server_option])
+
+    assert result.exit_code == 2
+    assert server_option[0] in result.output
+    attach.assert_not_called()
+    run_server.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "project_option", [["--pipeline", "data_science"], ["--workers", "2"], ["--cache"]]
+)
+def test_kedro_viz_command_rejects_project_options_for_daemon(project_option, mocker):
+    run_daemon = mocker.patch("kedro_viz.daemon.run_daemon")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli.commands, ["viz", "--daemon", *project_option])
+
+    assert result.exit_code == 2
+    assert project_option[0] in result.output
+    run_daemon.assert_not_called()
+
+
+def test_kedro_viz_command_rejects_memory_budget_without_daemon(mocker):
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli.commands, ["viz", "--memory-budget", "512"])
+
+    assert result.exit_code == 2
+    assert "--memory-budget can only be used with --daemon" in result.output
+    run_server.assert_not_called()
+
+
+def test_kedro_viz_command_runs_server_options_without_daemon(mocker):
+    mocker.patch("kedro_viz.daemon.find_daemon", return_value=None)
+    attach = mocker.patch("kedro_viz.daemon.attach")
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        runner.invoke(cli.commands, ["viz", "--port", "4150"])
+
+    attach.assert_not_called()
+    run_server.assert_called_once()
+
+
+def test_kedro_viz_command_does_not_attach_to_save_file(mocker):
+    attach = mocker.patch("kedro_viz.daemon.attach")
+    run_server = mocker.patch("kedro_viz.server.run_server")
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        runner.invoke(cli.commands, ["viz", "--save-file", "save.json"])
+
+    attach.assert_not_called()
+    run_server.assert_called_once()
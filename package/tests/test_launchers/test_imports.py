@@ -0,0 +1,76 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import subprocess
+import sys
+
+import pytest
+
+# the dependencies of the server, which the launchers must only import when they run
+HEAVY_PACKAGES = {"fastapi", "starlette", "uvicorn", "pydantic", "jinja2", "semver"}
+
+
+def get_imported_modules(module_name, *preloaded_modules):
+    """Return the modules that importing the given module adds to the preloaded ones,
+    in a fresh interpreter so that the modules imported by other tests don't count.
+    """
+    code = "\n".join(
+        [
+            "import json, sys",
+            *(f"import {preloaded_module}" for preloaded_module in preloaded_modules),
+            "before = set(sys.modules)",
+            f"import {module_name}",
+            "print(json.dumps(sorted(set(sys.modules) - before)))",
+        ]
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE
+    )
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize(
+    "module_name,preloaded_modules",
+    [
+        # Kedro has already loaded its own CLI when it loads the plugins' commands
+        ("kedro_viz.launchers.cli", ["click", "kedro.framework.cli.utils"]),
+        # and IPython is running when its line magics are loaded
+        ("kedro_viz.launchers.jupyter", ["IPython.core.display"]),
+    ],
+)
+def test_launcher_import_is_light(module_name, preloaded_modules):
+    imported_modules = get_imported_modules(module_name, *preloaded_modules)
+    imported_packages = {name.split(".")[0] for name in imported_modules}
+
+    assert not imported_packages & HEAVY_PACKAGES
+    assert "kedro.io" not in imported_modules
+    assert {name for name in imported_modules if name.startswith("kedro_viz")} == {
+        "kedro_viz",
+        "kedro_viz.launchers",
+        module_name,
+    }
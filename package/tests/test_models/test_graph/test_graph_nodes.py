@@ -34,6 +34,7 @@ from kedro.extras.datasets.pandas import CSVDataSet
 from kedro.io import MemoryDataSet
 from kedro.pipeline.node import node
 
+from kedro_viz.integrations.kedro.lazy_catalog import LazyDataSet
 from kedro_viz.models.graph import (
     DataNode,
     DataNodeMetadata,
@@ -44,6 +45,7 @@ from kedro_viz.models.graph import (
     RegisteredPipeline,
     TaskNode,
     TaskNodeMetadata,
+    _interned,
 )
 
 orig_import = __import__
@@ -82,14 +84,14 @@ class TestGraphNodeCreation:
     @pytest.mark.parametrize(
         "namespace,expected_modular_pipelines",
         [
-            (None, []),
+            (None, ()),
             (
                 "uk.data_science.model_training",
-                [
+                (
                     "uk",
                     "uk.data_science",
                     "uk.data_science.model_training",
-                ],
+                ),
             ),
         ],
     )
@@ -109,21 +111,21 @@ class TestGraphNodeCreation:
         assert task_node.name == "Identity Node"
         assert task_node.full_name == "identity_node"
         assert task_node.tags == {"tag"}
-        assert task_node.pipelines == []
+        assert task_node.pipelines == ()
         assert task_node.modular_pipelines == expected_modular_pipelines
 
     @pytest.mark.parametrize(
         "dataset_name,pretty_name,expected_modular_pipelines",
         [
-            ("dataset", "Dataset", []),
+            ("dataset", "Dataset", ()),
             (
                 "uk.data_science.model_training.dataset",
                 "Dataset",
-                [
+                (
                     "uk",
                     "uk.data_science",
                     "uk.data_science.model_training",
-                ],
+                ),
             ),
         ],
     )
@@ -143,7 +145,7 @@ class TestGraphNodeCreation:
         assert data_node.name == pretty_name
         assert data_node.layer == "raw"
         assert data_node.tags == set()
-        assert data_node.pipelines == []
+        assert data_node.pipelines == ()
         assert data_node.modular_pipelines == expected_modular_pipelines
         assert not data_node.is_plot_node()
 
@@ -163,15 +165,15 @@ class TestGraphNodeCreation:
             "test_split_ratio": 0.3,
             "num_epochs": 1000,
         }
-        assert parameters_node.modular_pipelines == []
+        assert parameters_node.modular_pipelines == ()
 
     @pytest.mark.parametrize(
         "dataset_name,expected_modular_pipelines",
         [
-            ("params:test_split_ratio", []),
+            ("params:test_split_ratio", ()),
             (
                 "params:uk.data_science.model_training.test_split_ratio",
-                ["uk", "uk.data_science", "uk.data_science.model_training"],
+                ("uk", "uk.data_science", "uk.data_science.model_training"),
             ),
         ],
     )
@@ -220,10 +222,63 @@ class TestGraphNodePipelines:
             tags=set(),
             dataset=kedro_dataset,
         )
-        assert data_node.pipelines == []
-        data_node.add_pipeline(default_pipeline)
-        assert data_node.belongs_to_pipeline(default_pipeline)
-        assert not data_node.belongs_to_pipeline(another_pipeline)
+        assert data_node.pipelines == ()
+        data_node.add_pipeline(default_pipeline.id)
+        assert data_node.belongs_to_pipeline(default_pipeline.id)
+        assert not data_node.belongs_to_pipeline(another_pipeline.id)
+
+
+class TestGraphNodeFootprint:
+    def test_graph_nodes_are_slotted(self):
+        kedro_node = node(identity, inputs="x", outputs="y", name="identity_node")
+        task_node = GraphNode.create_task_node(kedro_node)
+        data_node = GraphNode.create_data_node(
+            full_name="dataset", layer="raw", tags=set(), dataset=MemoryDataSet()
+        )
+        parameters_node = GraphNode.create_parameters_node(
+            full_name="params:ratio", layer=None, tags=set(), parameters=None
+        )
+        for graph_node in (task_node, data_node, parameters_node):
+            assert not hasattr(graph_node, "__dict__")
+        assert task_node.type == "task"
+        assert data_node.type == "data"
+        assert parameters_node.type == "parameters"
+
+    def test_graph_nodes_share_their_names(self):
+        data_nodes = [
+            GraphNode.create_data_node(
+                full_name=f"uk.data_science.{name}",
+                layer="".join(["ra", "w"]),
+                tags={"".join(["ta", "g"])},
+                dataset=CSVDataSet(filepath="foo.csv"),
+            )
+            for name in ("a", "b")
+        ]
+        for data_node in data_nodes:
+            data_node.add_pipeline("__default__")
+            data_node.add_pipeline("data_science")
+        first, second = data_nodes
+        assert first.tags is second.tags
+        assert first.pipelines is second.pipelines
+        assert first.modular_pipelines is second.modular_pipelines
+        assert first.layer is second.layer
+        assert first.dataset_type is second.dataset_type
+
+    def test_interned_names_are_bounded(self):
+        # the names of the projects reloaded by a long-running server are dropped
+        assert _interned.cache_info().maxsize is not None
+        assert GraphNode._expand_namespaces.cache_info().maxsize is not None
+
+    def test_add_tags(self):
+        data_node = GraphNode.create_data_node(
+            full_name="dataset", layer=None, tags={"a"}, dataset=MemoryDataSet()
+        )
+        tags = data_node.tags
+        data_node.add_tags(["a"])
+        assert data_node.tags is tags
+        data_node.add_tags(["b"])
+        assert data_node.tags == frozenset({"a", "b"})
+        assert tags == frozenset({"a"})
 
 
 class TestGraphNodeMetadata:
@@ -310,6 +365,38 @@ class TestGraphNodeMetadata:
         assert data_node_metadata.filepath == "/tmp/dataset.csv"
         assert data_node_metadata.run_command == 'kedro run --to-outputs="dataset"'
 
+    def test_lazy_data_node_metadata(self):
+        dataset = LazyDataSet(
+            "dataset",
+            {"type": "pandas.CSVDataSet", "filepath": "/tmp/dataset.csv"},
+            dict,
+        )
+        data_node = GraphNode.create_data_node(
+            full_name="dataset",
+            layer="raw",
+            tags=set(),
+            dataset=dataset,
+        )
+        # the dataset isn't instantiated for its node
+        assert (
+            data_node.dataset_type
+            == "kedro.extras.datasets.pandas.csv_dataset.CSVDataSet"
+        )
+        assert dataset._dataset is None
+
+        # nor is it for its filepath, read from its configuration
+        data_node_metadata = DataNodeMetadata(data_node=data_node)
+        assert dataset._dataset is None
+        assert data_node_metadata.type == data_node.dataset_type
+        assert data_node_metadata.filepath == "/tmp/dataset.csv"
+        assert isinstance(dataset.get_dataset(), CSVDataSet)
+
+    def test_mock_dataset_is_not_lazy(self):
+        data_node = GraphNode.create_data_node(
+            full_name="dataset", layer=None, tags=set(), dataset=MagicMock()
+        )
+        assert data_node.dataset_type == "unittest.mock.MagicMock"
+
     @patch("builtins.__import__", side_effect=import_mock)
     @patch("json.load")
     def test_plotly_data_node_metadata(self, patched_json_load, patched_import):
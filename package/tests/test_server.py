@@ -25,27 +25,73 @@
 #
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import importlib
 import json
+import multiprocessing
+import signal
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict
 from unittest import mock
 
 import pytest
+from kedro.io import DataCatalog
 from pydantic import BaseModel
 
-from kedro_viz.server import run_server
+import kedro_viz.server
+from kedro_viz.api import responses, serializers
+from kedro_viz.data_access import DataAccessManager
+from kedro_viz.integrations.kedro.snapshots import SnapshotCache
+from kedro_viz.server import (
+    _load_snapshots,
+    _run_loader_process,
+    _unload_project_modules,
+    load_project,
+    load_project_isolated,
+    populate_data,
+    reload_project,
+    run_server,
+)
+from kedro_viz.services import GraphUpdates, StartupStatus
 
 
 class ExampleAPIResponse(BaseModel):
     content: str
 
 
+class InlineThread:
+    """A thread that runs its target as soon as it is started,
+    so that tests can check the result of loading the project in the background.
+    """
+
+    def __init__(self, target, args=(), **kwargs):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+
 @pytest.fixture(autouse=True)
 def patched_uvicorn_run(mocker):
     yield mocker.patch("uvicorn.run")
 
 
+@pytest.fixture(autouse=True)
+def patched_threading(mocker):
+    patched_threading = mocker.patch("kedro_viz.server.threading")
+    patched_threading.Thread.side_effect = InlineThread
+    yield patched_threading
+
+
 @pytest.fixture(autouse=True)
 def patched_data_access_manager(mocker):
-    yield mocker.patch("kedro_viz.server.data_access_manager")
+    manager = mocker.patch("kedro_viz.server.data_access_manager")
+    # the mocked manager has no graph to serialise
+    manager.registered_pipelines.as_list.return_value = []
+    yield manager
 
 
 @pytest.fixture(autouse=True)
@@ -79,7 +125,7 @@ class TestServer:
         # assert that when running server, data are added correctly to the data access manager
         patched_data_access_manager.add_catalog.assert_called_once_with(example_catalog)
         patched_data_access_manager.add_pipelines.assert_called_once_with(
-            example_pipelines
+            example_pipelines, lazy=True
         )
 
         # correct api app is created
@@ -97,9 +143,224 @@ class TestServer:
 
         # assert that when running server, data are added correctly to the data access manager
         patched_data_access_manager.add_pipelines.assert_called_once_with(
-            {"data_science": example_pipelines["data_science"]}
+            {"data_science": example_pipelines["data_science"]}, lazy=True
+        )
+
+    def test_load_project_with_default_env(self, patched_load_data, tmp_path):
+        load_project(DataAccessManager(), StartupStatus(), tmp_path, "prod,")
+        patched_load_data.assert_called_once_with(tmp_path, "prod", False, False)
+
+    def test_graph_version_added_once_populated(self, tmp_path):
+        manager = DataAccessManager()
+        load_project(manager, StartupStatus(), tmp_path)
+        # only the version of the populated graph is retained
+        assert list(manager.graph_versions.versions) == [
+            responses.get_encoded_default_response(manager=manager).digest
+        ]
+
+    def test_lazy_catalog(self, patched_load_data, tmp_path):
+        run_server(project_path=str(tmp_path), lazy_catalog=True)
+        patched_load_data.assert_called_once_with(tmp_path, None, True, False)
+
+    def test_cannot_isolate_lazy_catalog(self):
+        with pytest.raises(ValueError, match="lazily"):
+            run_server(isolated=True, lazy_catalog=True)
+
+    def test_static_pipelines(self, patched_load_data, tmp_path):
+        run_server(project_path=str(tmp_path), static_pipelines=True)
+        patched_load_data.assert_called_once_with(tmp_path, None, False, True)
+
+    def test_cannot_isolate_static_pipelines(self):
+        with pytest.raises(ValueError, match="statically"):
+            run_server(isolated=True, static_pipelines=True)
+
+    def test_several_envs(
+        self,
+        mocker,
+        data_access_manager,
+        patched_create_api_app_from_project,
+        patched_load_data,
+        example_catalog,
+        example_pipelines,
+    ):
+        mocker.patch("kedro_viz.server.data_access_manager", new=data_access_manager)
+        prod_catalog = DataCatalog(feed_dict=example_catalog._data_sets)
+        patched_load_data_for_envs = mocker.patch(
+            "kedro_viz.server.kedro_data_loader.load_data_for_envs",
+            return_value=(
+                {"local": example_catalog, "prod": prod_catalog},
+                example_pipelines,
+            ),
+        )
+        run_server(env="local, prod")
+
+        # the pipelines are loaded once, with the catalog of each env
+        patched_load_data.assert_not_called()
+        patched_load_data_for_envs.assert_called_once_with(
+            mock.ANY, ["local", "prod"], False, False
+        )
+        env_data_access_managers = patched_create_api_app_from_project.call_args[1][
+            "env_data_access_managers"
+        ]
+        assert list(env_data_access_managers) == ["local", "prod"]
+        assert env_data_access_managers["local"] is data_access_manager
+        prod_manager = env_data_access_managers["prod"]
+        assert prod_manager.catalog.get_catalog() is prod_catalog
+        assert prod_manager.edges.as_list() == data_access_manager.edges.as_list()
+        assert prod_manager.layers.as_list() == []
+
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        assert startup_status.is_ready
+        assert [phase.name for phase in startup_status.phases][-1] == "add_env:prod"
+
+    def test_pending_pipelines_are_populated_once_ready(self, mocker, tmp_path):
+        manager = DataAccessManager()
+        startup_status = StartupStatus()
+        populate_pending_pipelines = manager.populate_pending_pipelines
+
+        def populate_once_ready(interval):
+            # only the default pipeline is populated before the project is served
+            assert startup_status.is_ready
+            assert list(manager.pending_pipelines) == [
+                "data_science",
+                "data_processing",
+            ]
+            populate_pending_pipelines(interval)
+
+        mocker.patch.object(
+            manager, "populate_pending_pipelines", side_effect=populate_once_ready
+        )
+        load_project(manager, startup_status, tmp_path)
+        assert not manager.pending_pipelines
+        assert manager.registered_pipelines.get_node_ids_by_pipeline_id(
+            "data_processing"
+        )
+
+    def test_several_workers(
+        self,
+        mocker,
+        patched_threading,
+        patched_uvicorn_run,
+        patched_create_api_app_from_project,
+    ):
+        mocker.patch("kedro_viz.server.responses.get_encoded_default_response")
+        freeze = mocker.patch("kedro_viz.server.gc.freeze", create=True)
+        config = mocker.patch("kedro_viz.server.uvicorn.Config")
+        fork = mocker.patch("kedro_viz.server.os.fork", side_effect=[101, 102])
+        waitpid = mocker.patch("kedro_viz.server.os.waitpid")
+        run_server(workers=2)
+
+        # the project is loaded before forking the workers, so they share it
+        patched_threading.Thread.assert_not_called()
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        assert startup_status.is_ready
+        freeze.assert_called_once()
+        assert fork.call_count == 2
+        waitpid.assert_has_calls([mock.call(101, 0), mock.call(102, 0)])
+
+        # the workers serve the socket bound by the parent
+        patched_uvicorn_run.assert_not_called()
+        config.return_value.bind_socket.return_value.close.assert_called_once()
+
+    def test_workers_are_terminated_with_server(
+        self, mocker, patched_threading, patched_create_api_app_from_project
+    ):
+        mocker.patch("kedro_viz.server.responses.get_encoded_default_response")
+        mocker.patch("kedro_viz.server.uvicorn.Config")
+        mocker.patch("kedro_viz.server.os.fork", side_effect=[101, 102])
+        kill = mocker.patch("kedro_viz.server.os.kill")
+        handlers = {signal.SIGTERM: signal.SIG_DFL}
+
+        def set_handler(signum, handler):
+            previous_handler, handlers[signum] = handlers[signum], handler
+            return previous_handler
+
+        mocker.patch("kedro_viz.server.signal.signal", side_effect=set_handler)
+
+        def waitpid(pid, options):
+            # the server is terminated while waiting for the first worker
+            if pid == 101:
+                handlers[signal.SIGTERM](signal.SIGTERM, None)
+
+        waitpid = mocker.patch("kedro_viz.server.os.waitpid", side_effect=waitpid)
+        run_server(workers=2)
+
+        kill.assert_has_calls(
+            [mock.call(101, signal.SIGTERM), mock.call(102, signal.SIGTERM)]
+        )
+        # both workers are reaped
+        waitpid.assert_has_calls([mock.call(101, 0), mock.call(102, 0)])
+        assert handlers[signal.SIGTERM] == signal.SIG_DFL
+
+    def test_profile_startup(
+        self, mocker, patched_create_api_app_from_project, data_access_manager, tmp_path
+    ):
+        # the time spent on each pipeline is only profiled by a real manager
+        mocker.patch("kedro_viz.server.data_access_manager", data_access_manager)
+        report_path = tmp_path / "startup.json"
+        run_server(profile_startup=str(report_path))
+
+        # the first serialisation of the graph is profiled along with the loading
+        report = json.loads(report_path.read_text())
+        assert [phase["name"] for phase in report["phases"]] == [
+            "load_project",
+            "add_catalog",
+            "add_pipelines",
+            "sort_layers",
+            "populate_pending_pipelines",
+            "serialize_graph",
+        ]
+        assert {item["name"] for item in report["slowest_pipelines"]} == {
+            "__default__",
+            "data_science",
+            "data_processing",
+        }
+        startup_profiler = patched_create_api_app_from_project.call_args[1][
+            "startup_profiler"
+        ]
+        assert not startup_profiler.enabled
+
+    def test_project_is_loaded_in_background(
+        self,
+        patched_create_api_app_from_project,
+        patched_threading,
+        patched_uvicorn_run,
+    ):
+        run_server()
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        assert isinstance(startup_status, StartupStatus)
+        assert startup_status.is_ready
+        assert [phase.status for phase in startup_status.phases] == ["done"] * 4
+        assert patched_threading.Thread.call_args[1]["daemon"]
+
+    def test_server_starts_before_project_is_loaded(
+        self, patched_create_api_app_from_project, patched_uvicorn_run, mocker
+    ):
+        # use a real thread and block loading the project until the server has started
+        mocker.patch("kedro_viz.server.threading", new=threading)
+        server_started = threading.Event()
+        patched_uvicorn_run.side_effect = lambda *args, **kwargs: server_started.set()
+
+        def load_data(project_path, env, lazy_catalog, static_pipelines):
+            assert server_started.wait(timeout=5)
+            return mocker.MagicMock(), {}
+
+        mocker.patch(
+            "kedro_viz.server.kedro_data_loader.load_data", side_effect=load_data
         )
 
+        run_server()
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        patched_uvicorn_run.assert_called_once()
+        assert startup_status.wait(timeout=5)
+
+    def test_failed_to_load_project(self, patched_create_api_app_from_project):
+        with pytest.raises(KeyError):
+            run_server(pipeline_name="foo")
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        assert startup_status.as_dict()["status"] == "failed"
+        assert startup_status.error == "KeyError: 'foo'"
+
     def test_load_file(self, patched_create_api_app_from_file):
         load_file = "test.json"
         run_server(load_file=load_file)
@@ -115,6 +376,20 @@ class TestServer:
         with open(save_file, "r") as f:
             assert json.load(f) == {"content": "test"}
 
+    def test_failed_to_save_file(
+        self, tmp_path, patched_create_api_app_from_project, mocker
+    ):
+        mocker.patch(
+            "kedro_viz.server.responses.get_default_response",
+            return_value=ExampleAPIResponse(content="test"),
+        )
+        with pytest.raises(OSError):
+            run_server(save_file=tmp_path / "missing" / "save.json")
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        assert startup_status.as_dict()["status"] == "failed"
+        assert startup_status.error.startswith("FileNotFoundError")
+        assert startup_status.phases[-1].name == "save_file"
+
     @pytest.mark.parametrize(
         "browser,ip,should_browser_open",
         [
@@ -139,3 +414,373 @@ class TestServer:
             webbrowser.open_new.assert_called_once()
         else:
             webbrowser.open_new.assert_not_called()
+
+
+class TestIsolatedLoading:
+    def load_snapshots(self, pipeline_name=None):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        _load_snapshots(sender, Path("project"), "local", pipeline_name)
+        return json.loads(receiver.recv_bytes())
+
+    @pytest.fixture
+    def patched_multiprocessing_context(self, mocker):
+        context = mocker.patch(
+            "kedro_viz.server.multiprocessing.get_context"
+        ).return_value
+        receiver, sender = mock.MagicMock(), mock.MagicMock()
+        context.Pipe.return_value = (receiver, sender)
+        context.Process.return_value.exitcode = 1
+        yield context
+
+    def test_load_snapshots(self):
+        payload = self.load_snapshots()
+        [[env_name, snapshot]] = payload["snapshots"]
+        assert env_name == "local"
+        assert len(snapshot["nodes"]) == 7
+        assert len(snapshot["edges"]) == 6
+        assert snapshot["node_metadata"]["56118ad8"]["parameters"] == {
+            "train_test_split": 0.1
+        }
+
+    def test_load_snapshots_failed(self):
+        assert self.load_snapshots("foo") == {"error": "KeyError: 'foo'"}
+
+    def test_run_loader_process(self, patched_multiprocessing_context):
+        receiver = patched_multiprocessing_context.Pipe.return_value[0]
+        receiver.recv_bytes.return_value = serializers.dumps({"snapshots": []})
+        assert _run_loader_process(Path("project")) == {"snapshots": []}
+
+        # the loader runs in a spawned process, which is waited for
+        patched_multiprocessing_context.Process.assert_called_once_with(
+            target=_load_snapshots,
+            args=(mock.ANY, Path("project"), None, None),
+            name="kedro-viz-loader",
+        )
+        patched_multiprocessing_context.Process.return_value.join.assert_called_once()
+
+    def test_run_loader_process_failed(self, patched_multiprocessing_context):
+        receiver = patched_multiprocessing_context.Pipe.return_value[0]
+        receiver.recv_bytes.return_value = serializers.dumps({"error": "Boom"})
+        with pytest.raises(RuntimeError, match="Boom"):
+            _run_loader_process(Path("project"))
+
+    def test_run_loader_process_crashed(self, patched_multiprocessing_context):
+        receiver = patched_multiprocessing_context.Pipe.return_value[0]
+        receiver.recv_bytes.side_effect = EOFError
+        with pytest.raises(RuntimeError, match="exited with code 1"):
+            _run_loader_process(Path("project"))
+
+    def test_load_project_isolated(self, mocker):
+        payload = self.load_snapshots()
+        mocker.patch("kedro_viz.server._run_loader_process", return_value=payload)
+        app = mock.MagicMock()
+        startup_status = StartupStatus()
+        load_project_isolated(app, startup_status, Path("project"), "local")
+
+        assert startup_status.is_ready
+        manager = app.state.data_access_manager
+        assert len(manager.nodes.as_list()) == 7
+        assert app.state.env_data_access_managers == {"local": manager}
+
+        # reloading swaps in new data
+        load_project_isolated(app, StartupStatus(), Path("project"), "local")
+        assert app.state.data_access_manager is not manager
+
+    def test_run_server_isolated(
+        self, mocker, patched_create_api_app_from_project, patched_data_access_manager
+    ):
+        load_project_isolated = mocker.patch("kedro_viz.server.load_project_isolated")
+        run_server(isolated=True)
+
+        app = patched_create_api_app_from_project.return_value
+        startup_status = patched_create_api_app_from_project.call_args[0][1]
+        load_project_isolated.assert_called_once_with(
+            app, startup_status, mock.ANY, None, None, None, None
+        )
+        patched_data_access_manager.add_pipelines.assert_not_called()
+
+
+class TestWatchMode:
+    @pytest.fixture
+    def app(self):
+        yield SimpleNamespace(state=SimpleNamespace(graph_updates=mock.Mock()))
+
+    def assert_update_published(self, app):
+        app.state.graph_updates.publish.assert_called_once_with(
+            {"type": "graph-updated", "version": mock.ANY}
+        )
+
+    def test_reload_project_after_code_change(
+        self, mocker, app, patched_load_data, tmp_path
+    ):
+        unload_project_modules = mocker.patch(
+            "kedro_viz.server._unload_project_modules"
+        )
+        reload_project(app, tmp_path, changed_paths=[tmp_path / "src" / "nodes.py"])
+
+        unload_project_modules.assert_called_once_with(tmp_path)
+        patched_load_data.assert_called_once_with(tmp_path, None, False, False)
+        assert isinstance(app.state.data_access_manager, DataAccessManager)
+        assert len(app.state.data_access_manager.nodes.as_list()) == 7
+        assert app.state.env_data_access_managers == {}
+        assert app.state.startup_status.is_ready
+        self.assert_update_published(app)
+
+    def test_reload_project_after_conf_change(
+        self,
+        mocker,
+        app,
+        patched_load_data,
+        data_access_manager,
+        example_catalog,
+        example_pipelines,
+        tmp_path,
+    ):
+        populate_data(data_access_manager, example_catalog, example_pipelines)
+        app.state.data_access_manager = data_access_manager
+        prod_catalog = DataCatalog(feed_dict={"params:train_test_split": 0.2})
+        load_catalogs = mocker.patch(
+            "kedro_viz.server.kedro_data_loader.load_catalogs",
+            return_value={"prod": prod_catalog},
+        )
+        load_data_for_envs = mocker.patch(
+            "kedro_viz.server.kedro_data_loader.load_data_for_envs"
+        )
+        unload_project_modules = mocker.patch(
+            "kedro_viz.server._unload_project_modules"
+        )
+        reload_project(
+            app, tmp_path, "prod", changed_paths=[tmp_path / "conf" / "catalog.yml"]
+        )
+
+        # only the catalog-dependent parts of the graph are rebuilt
+        unload_project_modules.assert_not_called()
+        patched_load_data.assert_not_called()
+        load_data_for_envs.assert_not_called()
+        load_catalogs.assert_called_once_with(tmp_path, ["prod"], False)
+        manager = app.state.data_access_manager
+        assert manager is not data_access_manager
+        assert manager.catalog.get_catalog() is prod_catalog
+        assert manager.edges.as_list() == data_access_manager.edges.as_list()
+        assert manager.nodes.get_node_by_id("56118ad8").parameters == {
+            "train_test_split": 0.2
+        }
+        assert app.state.env_data_access_managers == {"prod": manager}
+        self.assert_update_published(app)
+
+    def test_graph_versions_survive_reload(
+        self, app, patched_load_data, data_access_manager, tmp_path
+    ):
+        app.state.data_access_manager = data_access_manager
+        reload_project(app, tmp_path)
+        version = app.state.graph_updates.publish.call_args[0][0]["version"]
+
+        reload_project(app, tmp_path)
+        manager = app.state.data_access_manager
+        assert manager.graph_versions is data_access_manager.graph_versions
+        assert manager.graph_versions.has_version(version)
+
+    def test_reload_project_isolated(
+        self,
+        mocker,
+        app,
+        data_access_manager,
+        example_catalog,
+        example_pipelines,
+        tmp_path,
+    ):
+        def load_project_isolated(app, startup_status, *args):
+            populate_data(data_access_manager, example_catalog, example_pipelines)
+            app.state.data_access_manager = data_access_manager
+            app.state.env_data_access_managers = {}
+            startup_status.set_ready()
+
+        mocker.patch(
+            "kedro_viz.server.load_project_isolated", side_effect=load_project_isolated
+        )
+        reload_project(app, tmp_path, isolated=True)
+        assert app.state.data_access_manager is data_access_manager
+        self.assert_update_published(app)
+
+    def test_reload_project_without_pipelines(
+        self, mocker, app, data_access_manager, tmp_path
+    ):
+        def load_project_isolated(app, startup_status, *args):
+            app.state.data_access_manager = data_access_manager
+            app.state.env_data_access_managers = {}
+            startup_status.set_ready()
+
+        mocker.patch(
+            "kedro_viz.server.load_project_isolated", side_effect=load_project_isolated
+        )
+        reload_project(app, tmp_path, isolated=True)
+        assert app.state.data_access_manager is data_access_manager
+        app.state.graph_updates.publish.assert_not_called()
+
+    def test_failed_reload_keeps_serving(
+        self, app, patched_load_data, data_access_manager, tmp_path
+    ):
+        app.state.data_access_manager = data_access_manager
+        with pytest.raises(KeyError):
+            reload_project(app, tmp_path, pipeline_name="foo")
+        assert app.state.data_access_manager is data_access_manager
+        app.state.graph_updates.publish.assert_not_called()
+
+    def test_unload_project_modules(self, tmp_path, monkeypatch):
+        (tmp_path / "watched_project_nodes.py").write_text("a = 1")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        watched_project_nodes = importlib.import_module("watched_project_nodes")
+
+        assert watched_project_nodes.a == 1
+        _unload_project_modules(tmp_path)
+        assert "watched_project_nodes" not in sys.modules
+        assert "kedro_viz.server" in sys.modules
+
+    def test_run_server_with_watch(
+        self, mocker, patched_create_api_app_from_project, tmp_path
+    ):
+        project_watcher = mocker.patch("kedro_viz.server.ProjectWatcher")
+        patched_reload_project = mocker.patch("kedro_viz.server.reload_project")
+        run_server(project_path=str(tmp_path), env="local", watch=True)
+
+        app = patched_create_api_app_from_project.return_value
+        graph_updates = patched_create_api_app_from_project.call_args[1][
+            "graph_updates"
+        ]
+        assert isinstance(graph_updates, GraphUpdates)
+
+        # the project is watched once loaded
+        paths, callback = project_watcher.call_args[0]
+        assert paths == [tmp_path / "src", tmp_path / "conf"]
+        project_watcher.return_value.run.assert_called_once()
+        callback({tmp_path / "conf" / "catalog.yml"})
+        patched_reload_project.assert_called_once_with(
+            app,
+            tmp_path,
+            "local",
+            None,
+            {tmp_path / "conf" / "catalog.yml"},
+            False,
+            False,
+            False,
+        )
+
+    def test_cannot_watch_with_several_workers(self):
+        with pytest.raises(ValueError, match="several workers"):
+            run_server(workers=2, watch=True)
+
+
+class TestSnapshotCache:
+    @pytest.fixture
+    def snapshot_cache(self, tmp_path):
+        yield SnapshotCache(tmp_path)
+
+    def test_load_project_from_cache(self, patched_load_data, snapshot_cache, tmp_path):
+        manager = DataAccessManager()
+        load_project(manager, StartupStatus(), tmp_path, snapshot_cache=snapshot_cache)
+        assert len(list(snapshot_cache.cache_dir.glob("*.json"))) == 1
+
+        # the project is restored from the cache while it doesn't change
+        patched_load_data.reset_mock()
+        startup_status = StartupStatus()
+        restored = DataAccessManager()
+        load_project(restored, startup_status, tmp_path, snapshot_cache=snapshot_cache)
+        patched_load_data.assert_not_called()
+        assert startup_status.is_ready
+        assert [node.id for node in restored.nodes.as_list()] == [
+            node.id for node in manager.nodes.as_list()
+        ]
+        assert restored.layers.as_list() == manager.layers.as_list()
+
+        # and only loaded when the Kedro object of a node is needed
+        node = restored.nodes.get_node_by_id("56118ad8")
+        assert node.kedro_obj is None
+        live_node = restored.get_live_node(node)
+        assert live_node.kedro_obj is not None
+        restored.get_live_node(restored.nodes.get_node_by_id("0ecea0de"))
+        patched_load_data.assert_called_once_with(tmp_path, None, False, False)
+
+    def test_project_loaded_once_changed(
+        self, mocker, patched_load_data, snapshot_cache, tmp_path
+    ):
+        cache_config_files = mocker.spy(
+            kedro_viz.server.kedro_data_loader, "cache_config_files"
+        )
+        load_project(
+            DataAccessManager(),
+            StartupStatus(),
+            tmp_path,
+            snapshot_cache=snapshot_cache,
+        )
+        (tmp_path / "conf" / "base").mkdir(parents=True)
+        (tmp_path / "conf" / "base" / "catalog.yml").write_text("cars: {}")
+        load_project(
+            DataAccessManager(),
+            StartupStatus(),
+            tmp_path,
+            snapshot_cache=snapshot_cache,
+        )
+        assert patched_load_data.call_count == 2
+        assert len(list(snapshot_cache.cache_dir.glob("*.json"))) == 2
+        # the configuration files are cached too
+        assert cache_config_files.call_args_list == [mock.call(tmp_path)] * 2
+
+    def test_config_cached_by_default(self, mocker, patched_load_data, tmp_path):
+        cache_config_files = mocker.spy(
+            kedro_viz.server.kedro_data_loader, "cache_config_files"
+        )
+        load_project(DataAccessManager(), StartupStatus(), tmp_path)
+        cache_config_files.assert_called_once_with(tmp_path)
+
+    def test_several_envs_from_cache(
+        self, mocker, example_catalog, example_pipelines, snapshot_cache, tmp_path
+    ):
+        load_data_for_envs = mocker.patch(
+            "kedro_viz.server.kedro_data_loader.load_data_for_envs",
+            return_value=(
+                {"local": example_catalog, "prod": DataCatalog()},
+                example_pipelines,
+            ),
+        )
+        for _ in range(2):
+            manager = DataAccessManager()
+            env_managers: Dict[str, DataAccessManager] = {}
+            load_project(
+                manager,
+                StartupStatus(),
+                tmp_path,
+                "local,prod",
+                env_data_access_managers=env_managers,
+                snapshot_cache=snapshot_cache,
+            )
+        load_data_for_envs.assert_called_once()
+        assert env_managers["local"] is manager
+        assert env_managers["prod"].layers.as_list() == []
+
+    def test_load_project_isolated_from_cache(self, mocker, snapshot_cache):
+        payload = TestIsolatedLoading().load_snapshots()
+        run_loader_process = mocker.patch(
+            "kedro_viz.server._run_loader_process", return_value=payload
+        )
+        for _ in range(2):
+            app = mock.MagicMock()
+            load_project_isolated(
+                app,
+                StartupStatus(),
+                Path("project"),
+                "local",
+                snapshot_cache=snapshot_cache,
+            )
+            assert len(app.state.data_access_manager.nodes.as_list()) == 7
+        run_loader_process.assert_called_once()
+
+    def test_run_server_with_cache(self, mocker, patched_data_access_manager):
+        load_project = mocker.patch("kedro_viz.server.load_project")
+        run_server(project_path="project", cache=True)
+        snapshot_cache = load_project.call_args[0][-1]
+        assert isinstance(snapshot_cache, SnapshotCache)
+        assert load_project.call_args[1] == {
+            "lazy_catalog": False,
+            "static_pipelines": False,
+        }
+        assert snapshot_cache.project_path == Path("project")
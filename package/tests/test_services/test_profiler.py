@@ -0,0 +1,151 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kedro_viz.services.profiler import StartupProfiler
+from kedro_viz.services.startup import StartupStatus
+
+
+@pytest.fixture
+def profiler():
+    profiler = StartupProfiler(top_count=2)
+    profiler.enable()
+    yield profiler
+
+
+class TestStartupProfiler:
+    def test_disabled_profiler(self):
+        profiler = StartupProfiler()
+        with profiler.phase("load_project"), profiler.item("pipelines", "ds"):
+            pass
+        assert not profiler.phases
+        assert profiler.report()["slowest_pipelines"] == []
+
+    def test_nested_phases(self, profiler):
+        with profiler.phase("load_project"):
+            with profiler.phase("load_context"):
+                pass
+        with profiler.phase("add_pipelines"):
+            pass
+
+        phases = profiler.report()["phases"]
+        assert [(phase["name"], phase["parent"]) for phase in phases] == [
+            ("load_project", None),
+            ("load_context", "load_project"),
+            ("add_pipelines", None),
+        ]
+        for phase in phases:
+            assert phase["wall_time"] >= 0
+            assert phase["cpu_time"] >= 0
+            assert phase["peak_memory"] > 0
+            assert phase["peak_memory_increase"] >= 0
+
+    def test_failed_phase_is_profiled(self, profiler):
+        with pytest.raises(ValueError):
+            with profiler.phase("load_project"):
+                raise ValueError("Invalid project")
+        assert [phase.name for phase in profiler.phases] == ["load_project"]
+
+    def test_slowest_items(self, profiler, mocker):
+        mocker.patch(
+            "kedro_viz.services.profiler.time.perf_counter",
+            side_effect=[0.0, 1.0, 0.0, 3.0, 0.0, 2.0, 0.0, 0.5],
+        )
+        for name in ("data_science", "data_processing", "__default__"):
+            with profiler.item("pipelines", name):
+                pass
+        # the times of the same item are added up
+        with profiler.item("pipelines", "data_science"):
+            pass
+
+        assert profiler.report()["slowest_pipelines"] == [
+            {"name": "data_processing", "wall_time": 3.0},
+            {"name": "__default__", "wall_time": 2.0},
+        ]
+
+    def test_enable_discards_previous_profiles(self, profiler):
+        with profiler.phase("load_project"), profiler.item("datasets", "cars"):
+            pass
+        profiler.enable()
+        report = profiler.report()
+        assert report["phases"] == []
+        assert report["slowest_datasets"] == []
+
+    def test_write_report(self, profiler, tmp_path):
+        with profiler.phase("load_project"):
+            pass
+        profiler.disable()
+        with profiler.phase("add_pipelines"):
+            pass
+
+        report_path = tmp_path / "startup.json"
+        profiler.write_report(report_path)
+        report = json.loads(report_path.read_text())
+        assert [phase["name"] for phase in report["phases"]] == ["load_project"]
+        assert set(report) == {
+            "kedro_viz_version",
+            "python_version",
+            "phases",
+            "overlaps",
+            "slowest_pipelines",
+            "slowest_datasets",
+        }
+
+    def test_concurrent_phases(self, profiler):
+        catalog_started = threading.Event()
+
+        def get_pipelines():
+            with profiler.phase("get_pipelines"):
+                assert catalog_started.wait(5)
+
+        with profiler.phase("load_project"), ThreadPoolExecutor(1) as executor:
+            future = executor.submit(profiler.bind(get_pipelines))
+            with profiler.phase("create_catalog"):
+                catalog_started.set()
+                future.result()
+
+        report = profiler.report()
+        parents = {phase["name"]: phase["parent"] for phase in report["phases"]}
+        assert parents["get_pipelines"] == "load_project"
+        assert len({phase["thread"] for phase in report["phases"]}) == 2
+
+        # only the phases of the same parent in different threads overlap
+        [overlap] = report["overlaps"]
+        assert sorted(overlap["phases"]) == ["create_catalog", "get_pipelines"]
+        assert overlap["wall_time"] > 0
+
+    def test_startup_status_phases_are_profiled(self, mocker, profiler):
+        mocker.patch("kedro_viz.services.startup.startup_profiler", new=profiler)
+        startup_status = StartupStatus()
+        with startup_status.phase("load_project"):
+            pass
+        assert [phase.name for phase in profiler.phases] == ["load_project"]
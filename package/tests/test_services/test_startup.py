@@ -0,0 +1,85 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from kedro_viz.services.startup import StartupStatus
+
+
+class TestStartupStatus:
+    def test_phases_are_pending(self):
+        startup_status = StartupStatus(["load_project", "add_catalog"])
+        assert startup_status.as_dict() == {
+            "status": "loading",
+            "phases": [
+                {"name": "load_project", "status": "pending", "duration": None},
+                {"name": "add_catalog", "status": "pending", "duration": None},
+            ],
+            "error": None,
+        }
+
+    def test_phase_progress(self):
+        startup_status = StartupStatus(["load_project", "add_catalog"])
+        with startup_status.phase("load_project"):
+            running_phase = startup_status.as_dict()["phases"][0]
+            assert running_phase["status"] == "running"
+            assert running_phase["duration"] >= 0
+        phases = startup_status.as_dict()["phases"]
+        assert phases[0]["status"] == "done"
+        assert phases[0]["duration"] >= 0
+        assert phases[1]["status"] == "pending"
+        assert not startup_status.is_ready
+
+        startup_status.set_ready()
+        assert startup_status.is_ready
+        assert startup_status.wait(timeout=0)
+        assert startup_status.as_dict()["status"] == "ready"
+
+    def test_untracked_phase_is_added(self):
+        startup_status = StartupStatus()
+        with startup_status.phase("add_pipelines"):
+            pass
+        assert [phase.name for phase in startup_status.phases] == ["add_pipelines"]
+
+    def test_failed_phase(self):
+        startup_status = StartupStatus(["load_project"])
+        with pytest.raises(KeyError):
+            with startup_status.phase("load_project"):
+                raise KeyError("data_science")
+        assert startup_status.has_failed
+        assert not startup_status.wait(timeout=0)
+        assert startup_status.as_dict() == {
+            "status": "failed",
+            "phases": [
+                {
+                    "name": "load_project",
+                    "status": "failed",
+                    "duration": startup_status.phases[0].duration,
+                }
+            ],
+            "error": "KeyError: 'data_science'",
+        }
@@ -0,0 +1,77 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import threading
+
+from kedro_viz.services.updates import GraphUpdates
+
+
+class TestGraphUpdates:
+    def test_publish_from_another_thread(self):
+        graph_updates = GraphUpdates()
+
+        async def receive():
+            queue = graph_updates.subscribe()
+            assert graph_updates.subscribers_count == 1
+            thread = threading.Thread(
+                target=graph_updates.publish, args=({"type": "graph-updated"},)
+            )
+            thread.start()
+            event = await asyncio.wait_for(queue.get(), timeout=5)
+            thread.join()
+            graph_updates.unsubscribe(queue)
+            return event
+
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            assert loop.run_until_complete(receive()) == {"type": "graph-updated"}
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+        assert graph_updates.subscribers_count == 0
+
+    def test_publish_to_closed_loop(self):
+        graph_updates = GraphUpdates()
+        closed_loop = asyncio.new_event_loop()
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(closed_loop)
+            graph_updates.subscribe()
+            closed_loop.close()
+            asyncio.set_event_loop(loop)
+            queue = graph_updates.subscribe()
+
+            # the other subscribers still receive the event
+            graph_updates.publish({"type": "graph-updated"})
+            event = loop.run_until_complete(asyncio.wait_for(queue.get(), timeout=5))
+            assert event == {"type": "graph-updated"}
+            assert graph_updates.subscribers_count == 1
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,94 @@
+# Copyright 2021 QuantumBlack Visual Analytics Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+# NONINFRINGEMENT. IN NO EVENT WILL THE LICENSOR OR OTHER CONTRIBUTORS
+# BE LIABLE FOR ANY CLAIM, DAMAGES, OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF, OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+# The QuantumBlack Visual Analytics Limited ("QuantumBlack") name and logo
+# (either separately or in combination, "QuantumBlack Trademarks") are
+# trademarks of QuantumBlack. The License does not grant you any right or
+# license to the QuantumBlack Trademarks. You may not use the QuantumBlack
+# Trademarks or any confusingly similar mark as a trademark for your product,
+# or use the QuantumBlack Trademarks in any other manner that might cause
+# confusion in the marketplace, including but not limited to in advertising,
+# on websites, or on software.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+
+from kedro_viz.services.watcher import ProjectWatcher
+
+
+class TestProjectWatcher:
+    def test_scan_and_diff(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "__pycache__").mkdir()
+        (tmp_path / "src" / "__pycache__" / "nodes.pyc").write_text("")
+        (tmp_path / "src" / ".hidden").write_text("")
+        nodes = tmp_path / "src" / "nodes.py"
+        nodes.write_text("a = 1")
+        watcher = ProjectWatcher([tmp_path / "src", tmp_path / "conf"], print)
+
+        before = watcher.scan()
+        assert list(before) == [nodes]
+
+        nodes.write_text("a = 10")
+        catalog = tmp_path / "src" / "catalog.yml"
+        catalog.write_text("")
+        assert watcher.diff(before, watcher.scan()) == {nodes, catalog}
+
+    def test_changes_are_debounced(self, tmp_path):
+        nodes = tmp_path / "nodes.py"
+        nodes.write_text("a = 1")
+        calls = []
+        called = threading.Event()
+
+        def callback(changed_paths):
+            calls.append(changed_paths)
+            called.set()
+
+        watcher = ProjectWatcher([tmp_path], callback, interval=0.01, debounce=0.2)
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        try:
+            time.sleep(0.05)
+            nodes.write_text("a = 10")
+            time.sleep(0.05)
+            pipeline = tmp_path / "pipeline.py"
+            pipeline.write_text("")
+            assert called.wait(timeout=5)
+        finally:
+            watcher.stop()
+            thread.join()
+        assert calls == [{nodes, pipeline}]
+
+    def test_callback_errors_are_logged(self, tmp_path, caplog):
+        called = threading.Event()
+
+        def callback(changed_paths):
+            called.set()
+            raise ValueError("Invalid project")
+
+        watcher = ProjectWatcher([tmp_path], callback, interval=0.01, debounce=0.01)
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        try:
+            time.sleep(0.05)
+            (tmp_path / "nodes.py").write_text("")
+            assert called.wait(timeout=5)
+        finally:
+            watcher.stop()
+            thread.join()
+        assert "Failed to handle the changes of the project." in caplog.text
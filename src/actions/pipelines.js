@@ -77,6 +77,26 @@ export const requiresSecondRequest = (pipeline) => {
   return pipeline.active !== pipeline.main;
 };
 
+/**
+ * Load the pipeline state of the active pipeline (from localStorage)
+ * @return {function} A promise that resolves to the new pipeline state
+ */
+const loadActivePipelineState = async () => {
+  // Load 'main' data file. This is always loaded first, because it's needed
+  // in order to obtain the list of pipelines, which is required for determining
+  // whether the active pipeline (from localStorage) exists in the data.
+  const url = getUrl('main');
+  let newState = await loadJsonData(url).then((data) =>
+    preparePipelineState(data, true)
+  );
+  // If the active pipeline isn't 'main' then request data from new URL
+  if (requiresSecondRequest(newState.pipeline)) {
+    const url = getPipelineUrl(newState.pipeline);
+    newState = await loadJsonData(url).then(preparePipelineState);
+  }
+  return newState;
+};
+
 /**
  * Load pipeline data on initial page-load
  * @return {function} A promise that resolves when the data is loaded
@@ -90,23 +110,27 @@ export function loadInitialPipelineData() {
       return;
     }
     dispatch(toggleLoading(true));
-    // Load 'main' data file. This is always loaded first, because it's needed
-    // in order to obtain the list of pipelines, which is required for determining
-    // whether the active pipeline (from localStorage) exists in the data.
-    const url = getUrl('main');
-    let newState = await loadJsonData(url).then((data) =>
-      preparePipelineState(data, true)
-    );
-    // If the active pipeline isn't 'main' then request data from new URL
-    if (requiresSecondRequest(newState.pipeline)) {
-      const url = getPipelineUrl(newState.pipeline);
-      newState = await loadJsonData(url).then(preparePipelineState);
-    }
+    const newState = await loadActivePipelineState();
     dispatch(resetData(newState));
     dispatch(toggleLoading(false));
   };
 }
 
+/**
+ * Reload the data of the active pipeline after the server reloaded the Kedro project,
+ * keeping the current graph on screen until the new data replaces it
+ * @return {function} A promise that resolves when the data is reloaded
+ */
+export function reloadPipelineData() {
+  return async function (dispatch, getState) {
+    if (getState().dataSource !== 'json') {
+      return;
+    }
+    const newState = await loadActivePipelineState();
+    dispatch(resetData(newState));
+  };
+}
+
 /**
  * Change pipeline on selection, loading new data if necessary
  * @param {string} pipelineID Unique ID for new pipeline
@@ -11,6 +11,7 @@ import {
   requiresSecondRequest,
   loadInitialPipelineData,
   loadPipelineData,
+  reloadPipelineData,
 } from './pipelines';
 
 jest.mock('../store/load-data.js');
@@ -147,6 +148,30 @@ describe('pipeline actions', () => {
     });
   });
 
+  describe('reloadPipelineData', () => {
+    afterEach(() => {
+      window.localStorage.clear();
+    });
+
+    it('should return immediately if loading data synchronously', async () => {
+      const store = createStore(reducer, mockState.animals);
+      await reloadPipelineData()(store.dispatch, store.getState);
+      expect(store.getState().node).toEqual(mockState.animals.node);
+    });
+
+    it('should reload the data of the active pipeline without the loading spinner', async () => {
+      const { pipeline } = mockState.animals;
+      const active = pipeline.ids.find((id) => id !== pipeline.main);
+      saveState({ pipeline: { active } });
+      const store = createStore(reducer, mockState.json);
+      const reloading = reloadPipelineData()(store.dispatch, store.getState);
+      expect(store.getState().loading.pipeline).toBe(false);
+      await reloading;
+      expect(store.getState().pipeline.active).toBe(active);
+      expect(store.getState().node).toEqual(mockState.demo.node);
+    });
+  });
+
   describe('loadPipelineData', () => {
     it('should do nothing if the pipelineID is already active', () => {
       const store = createStore(reducer, mockState.animals);
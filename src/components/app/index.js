@@ -6,12 +6,16 @@ import '@quantumblack/kedro-ui/lib/styles/app-no-webfont.css';
 import LoadWebFont from '@quantumblack/kedro-ui/lib/utils/webfont.js';
 import configureStore from '../../store';
 import { resetData, updateFontLoaded } from '../../actions';
-import { loadInitialPipelineData } from '../../actions/pipelines';
+import {
+  loadInitialPipelineData,
+  reloadPipelineData,
+} from '../../actions/pipelines';
 import Wrapper from '../wrapper';
 import getInitialState, {
   preparePipelineState,
 } from '../../store/initial-state';
 import { getFlagsMessage } from '../../utils/flags';
+import { getUrl } from '../../utils';
 import './app.css';
 
 /**
@@ -32,6 +36,7 @@ class App extends React.Component {
   componentDidMount() {
     if (this.props.data === 'json') {
       this.store.dispatch(loadInitialPipelineData());
+      this.subscribeToUpdates();
     }
     this.loadWebFonts();
     this.announceFlags(this.store.getState().flags);
@@ -43,6 +48,12 @@ class App extends React.Component {
     }
   }
 
+  componentWillUnmount() {
+    if (this.updates) {
+      this.updates.close();
+    }
+  }
+
   /**
    * Shows a console message regarding the given flags
    */
@@ -68,6 +79,22 @@ class App extends React.Component {
     });
   }
 
+  /**
+   * Reload the pipeline data whenever the server pushes a graph update,
+   * i.e. when it reloaded the Kedro project in watch mode.
+   * The server responds with a 404 when it isn't watching the project,
+   * in which case the browser doesn't try to reconnect.
+   */
+  subscribeToUpdates() {
+    if (typeof window.EventSource === 'undefined') {
+      return;
+    }
+    this.updates = new window.EventSource(getUrl('events'));
+    this.updates.addEventListener('graph-updated', () => {
+      this.store.dispatch(reloadPipelineData());
+    });
+  }
+
   /**
    * Dispatch an action to update the store with new pipeline data
    */
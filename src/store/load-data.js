@@ -1,6 +1,24 @@
 import { json } from 'd3-fetch';
 import { getUrl } from '../utils';
 
+/**
+ * Fetch and parse JSON, retrying while the server responds with
+ * 503 Service Unavailable, i.e. while it is still loading the Kedro project.
+ * @param {string} path JSON file location
+ * @param {number} retryDelay Milliseconds to wait before retrying
+ * @return {function} A promise that will return when the file is loaded and parsed
+ */
+const fetchJsonWhenReady = (path, retryDelay = 1000) =>
+  json(path).catch((error) => {
+    // d3-fetch errors start with the response status, e.g. "503 Service Unavailable"
+    if (error.message.startsWith('503')) {
+      return new Promise((resolve) => setTimeout(resolve, retryDelay)).then(
+        () => fetchJsonWhenReady(path, retryDelay)
+      );
+    }
+    throw error;
+  });
+
 /**
  * Asynchronously load and parse data from json file using d3-fetch.
  * Throws an error if the request for `main` fails.
@@ -10,7 +28,7 @@ import { getUrl } from '../utils';
  * @return {function} A promise that will return when the file is loaded and parsed
  */
 const loadJsonData = (path = getUrl('main'), fallback = {}) =>
-  json(path).catch(() => {
+  fetchJsonWhenReady(path).catch(() => {
     const fullPath = `/public${path.substr(1)}`;
 
     // For main route throw a user error
@@ -24,6 +24,8 @@ export const getUrl = (type, id) => {
   switch (type) {
     case 'main':
       return [pathRoot, 'main'].join('/');
+    case 'events':
+      return [pathRoot, 'events'].join('/');
     case 'pipeline':
       if (!id) {
         throw new Error('No pipeline ID provided');
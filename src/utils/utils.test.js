@@ -23,6 +23,10 @@ describe('utils', () => {
       expect(getUrl('main')).toEqual('./api/main');
     });
 
+    it('should return the "events" stream', () => {
+      expect(getUrl('events')).toEqual('./api/events');
+    });
+
     it('should return a "pipeline" json file', () => {
       const id = '123456';
       expect(getUrl('pipeline', id)).toEqual(`./api/pipelines/${id}`);
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Measure the memory footprint of the graph nodes of a synthetic Kedro project.
+
+The project is made of 100,000 graph nodes, i.e. 40,000 task nodes, 50,000 data nodes
+and 10,000 parameters nodes, in chains spread across nested modular pipelines,
+tags and registered pipelines. Run it from the root of the repository with:
+
+    PYTHONPATH=package python tools/benchmark_graph_memory.py
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+
+from kedro_viz.data_access.managers import DataAccessManager
+
+# the number of tasks in each chain, each one with its own output dataset,
+# so that every chain makes (2 * CHAIN_LENGTH + 2) graph nodes
+CHAIN_LENGTH = 4
+REGISTERED_PIPELINES = 10
+
+
+def identity(value, *_):
+    return value
+
+
+def make_project(chains):
+    """Make the registered pipelines and the catalog of the synthetic project."""
+    pipelines = {}
+    feed_dict = {}
+    for pipeline_index in range(REGISTERED_PIPELINES):
+        nodes = []
+        for chain in range(pipeline_index, chains, REGISTERED_PIPELINES):
+            namespace = f"domain_{chain % 20}.stage_{chain % 5}.step_{chain % 3}"
+            parameter = f"params:{namespace}.parameter_{chain}"
+            feed_dict[parameter] = chain
+            dataset = f"{namespace}.raw_{chain}"
+            feed_dict[dataset] = MemoryDataSet()
+            for step in range(CHAIN_LENGTH):
+                output = f"{namespace}.dataset_{chain}_{step}"
+                inputs = [dataset, parameter] if step == 0 else [dataset]
+                nodes.append(
+                    node(
+                        identity,
+                        inputs,
+                        output,
+                        name=f"task_{chain}_{step}",
+                        tags=["synthetic", f"tag_{chain % 7}"],
+                        namespace=namespace,
+                    )
+                )
+                feed_dict[output] = MemoryDataSet()
+                dataset = output
+        pipelines[f"pipeline_{pipeline_index}"] = Pipeline(nodes)
+    pipelines["__default__"] = sum(pipelines.values(), Pipeline([]))
+    catalog = DataCatalog()
+    catalog.add_feed_dict(feed_dict)
+    return pipelines, catalog
+
+
+def deep_size(manager):
+    """The size in bytes of the graph nodes and of everything they hold,
+    apart from the underlying Kedro objects. Objects shared between nodes,
+    e.g. interned strings or tuples, are only counted once.
+    """
+    seen = set()
+    size = 0
+    stack = list(manager.nodes.as_list())
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, int, float, bool, type(None))):
+            attributes = dict(getattr(obj, "__dict__", {}))
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        attributes[slot] = getattr(obj, slot)
+            for name, value in attributes.items():
+                if name != "_kedro_obj":
+                    stack.append(value)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--nodes", type=int, default=100_000, help="The number of graph nodes."
+    )
+    args = parser.parse_args()
+
+    pipelines, catalog = make_project(args.nodes // (2 * CHAIN_LENGTH + 2))
+    manager = DataAccessManager()
+    manager.add_catalog(catalog)
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    manager.add_pipelines(pipelines)
+    elapsed = time.perf_counter() - start
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = len(manager.nodes.as_list())
+    size = deep_size(manager)
+    print(f"graph nodes: {nodes}")
+    print(f"populated in: {elapsed:.2f}s")
+    print(f"allocated by the repositories: {traced / 2 ** 20:.1f} MiB")
+    print(f"held by the graph nodes: {size / 2 ** 20:.1f} MiB")
+    print(f"held per graph node: {size / nodes:.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()